@@ -1,21 +1,58 @@
-from fastapi import HTTPException, status, Header
+from fastapi import HTTPException, status, Header, Depends, Request
 from jose import JWTError
-from app.core.security import decode_token
-from app.reposytory.user_repository import UserRepositoryImpl
+from sqlalchemy.ext.asyncio import AsyncSession
 
-async def get_current_user(authorization: str | None = Header(None)):
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.db.session import get_db
+from app.reposytory.catalog_repository import CatalogRepository
+from app.registry import Registry
+from app.services.auth_service import AuthService
+
+async def get_session():
+    """
+    One session and transaction per request, committed when the endpoint returns
+    and rolled back if it raises. Every dependency in the request shares it.
+    """
+    async with get_db() as session:
+        yield session
+
+async def get_current_user(
+    authorization: str | None = Header(None),
+    session: AsyncSession = Depends(get_session),
+):
     if not authorization:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing authorization")
     scheme, _, token = authorization.partition(" ")
     if scheme.lower() != "bearer" or not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authorization header")
+    auth_service = Registry.get(AuthService)
     try:
-        payload = decode_token(token)
-        user_id = payload.get("sub")
+        user = await auth_service.authenticate(session, token)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    repo = UserRepositoryImpl()
-    user = await repo.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
+    return user
+
+async def get_admin_user(user=Depends(get_current_user)):
+    """
+    The current user, if listed in ADMIN_USERNAMES; registration is open, so this guards
+    endpoints that can slow down everyone else.
+    """
+    admins = {name.strip() for name in settings.ADMIN_USERNAMES.split(",") if name.strip()}
+    if user.username not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
     return user
+
+async def get_catalog_version(session: AsyncSession = Depends(get_session)) -> int:
+    return await Registry.get(CatalogRepository).get_version(session)
+
+async def get_catalog_etag(request: Request, version: int = Depends(get_catalog_version)) -> str:
+    """
+    ETag of a catalog read. The version is read before the data, so a write racing with
+    the request can only make the tag older than the body (one extra download), never newer.
+    """
+    return make_etag(version, request.url.path, request.query_params.multi_items())
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_admin_user, get_session
+from app.core.cache import get_cache_stats
+from app.core.security import password_executor
+from app.db.session import slow_query_log
+from app.registry import Registry
+from app.reposytory.catalog_repository import CatalogRepository
+from app.schemas.catalog import CatalogStats
+from app.schemas.slow_query import SlowQuery
+
+router = APIRouter()
+
+@router.get("/admin/cache-stats")
+async def cache_stats(
+    user=Depends(get_admin_user),
+):
+    """
+    Hit, miss and eviction counters of the in-process caches, for sizing them.
+    Restricted to ADMIN_USERNAMES.
+    """
+    return get_cache_stats()
+
+
+@router.get("/admin/password-hashing-stats")
+async def password_hashing_stats(
+    user=Depends(get_admin_user),
+):
+    """
+    Load of the bcrypt executor: busy workers, queue depth and rejected calls.
+    Restricted to ADMIN_USERNAMES.
+    """
+    return password_executor.stats()
+
+
+@router.get("/admin/slow-queries", response_model=list[SlowQuery])
+async def slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Number of entries to return, newest first"),
+    user=Depends(get_admin_user),
+):
+    """
+    Recent statements over SLOW_QUERY_THRESHOLD_MS, with redacted parameters and, when sampled, their plan.
+    Restricted to ADMIN_USERNAMES.
+    """
+    return slow_query_log.entries(limit)
+
+
+@router.post("/admin/catalog-stats/recompute", response_model=CatalogStats)
+async def recompute_catalog_stats(
+    user=Depends(get_admin_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Rebuild the catalog statistics from the books table, for repair; blocks book writes while it runs.
+    Restricted to ADMIN_USERNAMES.
+    """
+    catalog_repo = Registry.get(CatalogRepository)
+    await catalog_repo.recompute_stats(session)
+    return await catalog_repo.get_stats(session, 10)
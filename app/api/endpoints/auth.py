@@ -1,5 +1,7 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, status, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_current_user, get_session
 from app.registry import Registry
 from app.schemas.auth import UserCreate, UserResponse, Token
 from app.services.auth_service import AuthService
@@ -7,25 +9,31 @@ from app.services.auth_service import AuthService
 router = APIRouter()
 
 @router.post("/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_in: UserCreate):
+async def register(user_in: UserCreate, session: AsyncSession = Depends(get_session)):
     auth_service = Registry.get(AuthService)
-    created = await auth_service.register(user_in)
+    created = await auth_service.register(session, user_in)
     return created
 
 @router.post("/auth/login", response_model=Token)
-async def login(user_in: UserCreate):
+async def login(user_in: UserCreate, session: AsyncSession = Depends(get_session)):
     auth_service = Registry.get(AuthService)
-    token = await auth_service.login(user_in)
+    token = await auth_service.login(session, user_in)
     return token
 
 @router.post("/auth/refresh", response_model=Token)
-async def refresh(refresh_token: str):
+async def refresh(refresh_token: str, session: AsyncSession = Depends(get_session)):
     auth_service = Registry.get(AuthService)
-    token = await   auth_service.refresh(refresh_token)
+    token = await auth_service.refresh(session, refresh_token)
     return token
 
 @router.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(refresh_token: str):
+async def logout(refresh_token: str, session: AsyncSession = Depends(get_session)):
     auth_service = Registry.get(AuthService)
-    await auth_service.logout(refresh_token)
+    await auth_service.logout(session, refresh_token)
     return None
+
+@router.post("/auth/deactivate", response_model=UserResponse)
+async def deactivate(user=Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    auth_service = Registry.get(AuthService)
+    deactivated = await auth_service.deactivate(session, user.id)
+    return deactivated
@@ -1,32 +1,55 @@
 from uuid import UUID
 
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_session, get_catalog_etag
+from app.core.etag import etag_matches
 from app.registry import Registry
 from app.reposytory.author_repository import AuthorRepository
-from app.schemas.author import AuthorResponse
+from app.schemas.author import AuthorResponse, AuthorPage
 
 router = APIRouter()
 
-@router.get("/authors/", response_model=List[AuthorResponse])
-async def get_authors() -> List[AuthorResponse]:
+@router.get("/authors/", response_model=AuthorPage)
+async def get_authors(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Number of authors to return"),
+    name_prefix: str | None = Query(None, min_length=1, description="Only authors whose name starts with this (case-sensitive)"),
+    sort_order: str = Query("asc", description="Sort order by name (asc or desc)"),
+    cursor: str | None = Query(None, description="Opaque next_cursor from the previous page"),
+    include_book_count: bool = Query(False, description="Include each author's number of books"),
+    if_none_match: str | None = Header(None),
+    etag: str = Depends(get_catalog_etag),
+    session: AsyncSession = Depends(get_session),
+) -> AuthorPage:
     """
-    Retrieve all authors.
+    Retrieve authors ordered by name, a page at a time; follow next_cursor for the next page.
+    Send the returned ETag as If-None-Match to get 304 while the catalog is unchanged.
     """
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     author_repo = Registry.get(AuthorRepository)
-    authors = await author_repo.get_all_authors()
-    return authors
+    return await author_repo.get_authors(
+        session,
+        limit=limit,
+        name_prefix=name_prefix,
+        sort_order=sort_order,
+        cursor=cursor,
+        include_book_count=include_book_count,
+    )
 
 
 @router.get("/authors/{author_id}", response_model=AuthorResponse)
 async def get_author(
     author_id: UUID,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Retrieve a specific author by its ID.
     """
     author_repo = Registry.get(AuthorRepository)
-    author = await author_repo.get_author(author_id)
+    author = await author_repo.get_author(session, author_id)
     return author
 
@@ -1,12 +1,19 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Query, status, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, Query, status, Depends, UploadFile, File, HTTPException, Body, Header, Request
 from typing import List
 from datetime import datetime
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_session, get_catalog_version, get_catalog_etag
+from app.core.config import settings
+from app.core.etag import etag_matches, make_etag
 from app.registry import Registry
-from app.schemas.book import BookCreate, BookUpdate, BookResponse
+from app.reposytory.catalog_repository import CatalogRepository
+from app.schemas.book import BookCreate, BookUpdate, BookResponse, BookPage, BookBatchResult
+from app.schemas.catalog import CatalogStats
+from app.services.book_list_cache import BookListCache
 from app.services.book_service import BookService
 
 router = APIRouter()
@@ -15,67 +22,182 @@ router = APIRouter()
 async def create_book(
     data: BookCreate,
     user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Create a new book. If the author does not exist, it will be created.
     """
     book_service = Registry.get(BookService)
-    created_book = await book_service.create_book(data)
+    created_book = await book_service.create_book(session, data)
     return created_book
 
 
-@router.get("/books/", response_model=List[BookResponse])
+@router.post("/books/batch", response_model=BookBatchResult, status_code=status.HTTP_201_CREATED)
+async def create_books_batch(
+    items: List[dict] = Body(..., description="Books to create, each shaped like the POST /books/ body"),
+    user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Create up to BOOK_BATCH_MAX books in one transaction.
+    Each item is validated on its own and reported with its created book or its error.
+    """
+    if len(items) > settings.BOOK_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BOOK_BATCH_MAX} books per batch")
+
+    book_service = Registry.get(BookService)
+    result = await book_service.create_books(session, items)
+    return result
+
+
+@router.get("/books/batch", response_model=List[BookResponse])
+async def get_books_batch(
+    ids: List[UUID] = Query(..., description="Book IDs; repeat the parameter for several books"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Retrieve several books by ID in one query, in the order requested. Unknown IDs are omitted.
+    """
+    if len(ids) > settings.BOOK_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BOOK_BATCH_MAX} ids per request")
+
+    book_service = Registry.get(BookService)
+    books = await book_service.find_books(session, ids)
+    return books
+
+
+@router.get("/books/", response_model=BookPage)
 async def get_books(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    request: Request,
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored when a cursor is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     title: str | None = Query(None, description="Filter by title (case-insensitive)"),
     author: str | None = Query(None, description="Filter by author name"),
-    genre: str | None = Query(None, description="Filter by genre"),
+    genre: List[str] | None = Query(None, description="Filter by genre; repeat for several genres"),
+    genre_match: str = Query("any", pattern="^(any|all)$", description="Match books having any or all of the given genres"),
     year_from: int | None = Query(None, ge=1800, le=datetime.now().year, description="Filter by minimum published year"),
     year_to: int | None = Query(None, ge=1800, le=datetime.now().year, description="Filter by maximum published year"),
     sort_by: str = Query("title", description="Field to sort by (title, author, published_year)"),
     sort_order: str = Query("asc", description="Sort order (asc or desc)"),
+    cursor: str | None = Query(None, description="Opaque next_cursor from the previous page"),
+    facets: bool = Query(False, description="Include per-genre and per-decade counts for the filter"),
+    if_none_match: str | None = Header(None),
+    catalog_version: int = Depends(get_catalog_version),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Retrieve books with optional filtering, pagination, and sorting.
+    Follow next_cursor for pages whose cost does not grow with depth.
+    The body is rendered straight from the rows; response_model only documents it.
+    Send the returned ETag as If-None-Match to get 304 while the catalog is unchanged.
     """
-    book_service = Registry.get(BookService)
-    books = await book_service.get_all_books(
+    query_items = request.query_params.multi_items()
+    etag = make_etag(catalog_version, request.url.path, query_items)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    book_list_cache = Registry.get(BookListCache)
+    body, body_version = await book_list_cache.get_page(
+        session,
+        catalog_version,
         skip=skip,
         limit=limit,
         title=title,
         author=author,
-        genre=genre,
+        genres=genre,
         year_from=year_from,
         year_to=year_to,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        genre_match=genre_match,
+        facets=facets,
     )
-    return books
+    if body_version != catalog_version:
+        # A stale page being refreshed: tag it with its own version so clients re-fetch later.
+        etag = make_etag(body_version, request.url.path, query_items)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/books/export")
+async def export_books(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    title: str | None = Query(None, description="Filter by title (case-insensitive)"),
+    author: str | None = Query(None, description="Filter by author name"),
+    genre: List[str] | None = Query(None, description="Filter by genre; repeat for several genres"),
+    genre_match: str = Query("any", pattern="^(any|all)$", description="Match books having any or all of the given genres"),
+    year_from: int | None = Query(None, ge=1800, le=datetime.now().year, description="Filter by minimum published year"),
+    year_to: int | None = Query(None, ge=1800, le=datetime.now().year, description="Filter by maximum published year"),
+    user=Depends(get_current_user),
+):
+    """
+    Stream every book matching the filters as NDJSON or as CSV in the /import-csv format.
+    """
+    book_service = Registry.get(BookService)
+    body = book_service.export_books(
+        export_format,
+        title=title,
+        author=author,
+        genres=genre,
+        genre_match=genre_match,
+        year_from=year_from,
+        year_to=year_to,
+    )
+    if export_format == "csv":
+        return StreamingResponse(
+            body,
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="books.csv"'},
+        )
+    return StreamingResponse(body, media_type="application/x-ndjson")
+
+
+@router.get("/books/stats", response_model=CatalogStats)
+async def get_book_stats(
+    response: Response,
+    top_authors: int = Query(10, ge=0, le=100, description="Number of authors with the most books to include"),
+    if_none_match: str | None = Header(None),
+    etag: str = Depends(get_catalog_etag),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Book counts for the whole catalog: total, per genre, per decade and for the top authors.
+    Served from counters maintained on every write, so the cost does not grow with the catalog.
+    Send the returned ETag as If-None-Match to get 304 while the catalog is unchanged.
+    """
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    catalog_repo = Registry.get(CatalogRepository)
+    return await catalog_repo.get_stats(session, top_authors)
 
 
 @router.get("/books/{book_id}", response_model=BookResponse)
 async def get_book(
     book_id: UUID,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Retrieve a specific book by its ID.
     """
     book_service = Registry.get(BookService)
-    book = await book_service.find_book(book_id)
+    book = await book_service.find_book(session, book_id)
     return book
 
 
 @router.put("/books/{book_id}", response_model=BookResponse)
+@router.patch("/books/{book_id}", response_model=BookResponse)
 async def update_book(
     data: BookUpdate,
     user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
-    Update a book's details. If the author does not exist, it will be created.
+    Update a book's details; only the fields present in the body are changed.
+    If the author does not exist, it will be created.
     """
     book_service = Registry.get(BookService)
-    updated_book = await book_service.update_book(data)
+    updated_book = await book_service.update_book(session, data)
     return updated_book
 
 
@@ -83,19 +205,22 @@ async def update_book(
 async def delete_book(
     book_id: UUID,
     user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Delete a book. If it was the last book of an author, the author will also be deleted.
     """
     book_service = Registry.get(BookService)
-    await book_service.delete_book(book_id)
+    await book_service.delete_book(session, book_id)
     return None
 
 
 @router.post("/import-csv")
 async def import_books_csv(
     file: UploadFile = File(...),
+    stream: bool = Query(False, description="Import in bounded-memory chunks and return only summary counts"),
     user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Import books from a CSV file.
@@ -104,5 +229,8 @@ async def import_books_csv(
         raise HTTPException(status_code=400, detail="File must be CSV")
 
     book_service = Registry.get(BookService)
-    imported_books = await book_service.import_books_from_csv(file)
+    if stream:
+        return await book_service.import_books_from_csv_stream(session, file)
+
+    imported_books = await book_service.import_books_from_csv(session, file)
     return {"imported": len(imported_books), "books": imported_books}
\ No newline at end of file
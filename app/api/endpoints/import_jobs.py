@@ -0,0 +1,55 @@
+from uuid import UUID
+
+from fastapi import APIRouter, status, Depends, UploadFile, File, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_session
+from app.registry import Registry
+from app.schemas.import_job import ImportJobResponse
+from app.services.import_job_service import ImportJobService
+
+router = APIRouter()
+
+@router.post("/import-jobs", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_import_job(
+    file: UploadFile = File(...),
+    user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Queue a CSV import to run in the background and return the job at once.
+    """
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=400, detail="File must be CSV")
+
+    job_service = Registry.get(ImportJobService)
+    job = await job_service.submit(session, file)
+    return job
+
+
+@router.get("/import-jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: UUID,
+    user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Retrieve the status and progress of an import job.
+    """
+    job_service = Registry.get(ImportJobService)
+    job = await job_service.get_job(session, job_id)
+    return job
+
+
+@router.post("/import-jobs/{job_id}/cancel", response_model=ImportJobResponse)
+async def cancel_import_job(
+    job_id: UUID,
+    user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Cancel an import job. A running job stops after the chunk it is currently writing.
+    """
+    job_service = Registry.get(ImportJobService)
+    job = await job_service.cancel_job(session, job_id)
+    return job
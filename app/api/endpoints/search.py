@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_session
+from app.registry import Registry
+from app.schemas.search import SearchResults
+from app.services.book_service import BookService
+
+router = APIRouter()
+
+@router.get("/search", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for in titles and author names"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of books and of authors to return"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Search books and authors by relevance, tolerating typos.
+    """
+    book_service = Registry.get(BookService)
+    results = await book_service.search(session, q, limit)
+    return results
@@ -0,0 +1,192 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.metrics import MetricFamily, register_collector
+
+_MISSING = object()
+
+_caches: dict[str, "LRUCache | ResultCache"] = {}
+
+
+class LRUCache:
+    """
+    Bounded in-process map with LRU eviction and a per-entry TTL.
+
+    Invalidation bumps `generation`; a reader that captured the generation before
+    loading from the database passes it to `set`, so a value loaded before a
+    concurrent write is dropped instead of being cached stale.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        _caches[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.evictions += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, generation: int | None = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ResultCache:
+    """
+    Versioned cache of rendered results, bounded by total size in bytes rather than entry count.
+
+    An entry is fresh while its version equals the caller's current version and it is younger
+    than `ttl`. Once outdated it may still be served for `stale_ttl` seconds (stale-while-revalidate),
+    during which the caller refreshes it in the background; after that it is a miss.
+    """
+
+    def __init__(self, name: str, max_bytes: int, ttl: float, stale_ttl: float):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.size_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> [version, value, expires_at, stale_since]
+        self._data: OrderedDict[Hashable, list] = OrderedDict()
+        _caches[name] = self
+
+    def get(self, key: Hashable, version: int) -> tuple[bytes, int, bool] | None:
+        """
+        Return (value, value_version, is_stale), or None on a miss.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        entry_version, value, expires_at, stale_since = entry
+        now = time.monotonic()
+        if entry_version >= version and now < expires_at:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value, entry_version, False
+        if stale_since is None:
+            stale_since = entry[3] = now
+        if now - stale_since <= self.stale_ttl:
+            self._data.move_to_end(key)
+            self.stale_hits += 1
+            return value, entry_version, True
+        self._remove(key)
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, version: int, value: bytes) -> None:
+        current = self._data.get(key)
+        if current is not None and current[0] > version:
+            return
+        if len(value) > self.max_bytes // 8:
+            # A few huge pages would otherwise flush every popular one.
+            return
+        if current is not None:
+            self._remove(key)
+        self._data[key] = [version, value, time.monotonic() + self.ttl, None]
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self.size_bytes -= len(entry[1])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def get_cache_stats() -> dict[str, dict]:
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+
+# (stats field, metric type, help) exported for every cache that reports the field.
+_CACHE_METRICS = [
+    ("hits", "counter", "Lookups answered from the cache."),
+    ("stale_hits", "counter", "Lookups answered with a stale entry while it is revalidated."),
+    ("misses", "counter", "Lookups that had to load the value."),
+    ("evictions", "counter", "Entries dropped for size or expiry."),
+    ("size", "gauge", "Entries currently cached."),
+    ("size_bytes", "gauge", "Bytes currently cached."),
+]
+
+
+def _collect_cache_metrics() -> list[MetricFamily]:
+    all_stats = get_cache_stats()
+    families = []
+    for field, kind, help in _CACHE_METRICS:
+        name = f"cache_{field}_total" if kind == "counter" else f"cache_{field}"
+        samples = [("", {"cache": cache}, stats[field]) for cache, stats in all_stats.items() if field in stats]
+        families.append(MetricFamily(name, kind, help, samples))
+    return families
+
+
+register_collector(_collect_cache_metrics)
@@ -14,6 +14,20 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "10"))
+    # Accept the username claim of a valid access token without loading the user.
+    # A user deactivated by another process keeps access until the token expires.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "False").lower() == "true"
+    # Comma-separated usernames allowed to run maintenance endpoints; none by default.
+    ADMIN_USERNAMES: str = os.getenv("ADMIN_USERNAMES", "")
+
     BACKEND_CORS_ORIGINS: List[str] = Field(
         default=["http://localhost", "http://localhost:3000", "http://localhost:8000"]
     )
@@ -43,6 +57,40 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
     DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
 
+    CSV_IMPORT_BATCH_SIZE: int = int(os.getenv("CSV_IMPORT_BATCH_SIZE", "5000"))
+    CSV_IMPORT_CHUNK_SIZE: int = int(os.getenv("CSV_IMPORT_CHUNK_SIZE", "10000"))
+    CSV_IMPORT_ERROR_SAMPLE: int = int(os.getenv("CSV_IMPORT_ERROR_SAMPLE", "100"))
+    BOOK_BATCH_MAX: int = int(os.getenv("BOOK_BATCH_MAX", "1000"))
+    EXPORT_FETCH_SIZE: int = int(os.getenv("EXPORT_FETCH_SIZE", "2000"))
+
+    # Uploads wait here for a worker; with several app instances it must be shared storage.
+    IMPORT_JOBS_DIR: str = os.getenv("IMPORT_JOBS_DIR", "/tmp/book_import_jobs")
+    IMPORT_WORKERS: int = int(os.getenv("IMPORT_WORKERS", "2"))
+    IMPORT_JOB_POLL_SECONDS: float = float(os.getenv("IMPORT_JOB_POLL_SECONDS", "5"))
+    IMPORT_JOB_STALE_SECONDS: int = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "60"))
+
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+    BOOK_CACHE_SIZE: int = int(os.getenv("BOOK_CACHE_SIZE", "10000"))
+    AUTHOR_CACHE_SIZE: int = int(os.getenv("AUTHOR_CACHE_SIZE", "10000"))
+    AUTHOR_NAME_CACHE_SIZE: int = int(os.getenv("AUTHOR_NAME_CACHE_SIZE", "50000"))
+    AUTHOR_NAME_CACHE_TTL_SECONDS: float = float(os.getenv("AUTHOR_NAME_CACHE_TTL_SECONDS", "600"))
+    BOOK_LIST_CACHE_MAX_BYTES: int = int(os.getenv("BOOK_LIST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    BOOK_LIST_CACHE_TTL_SECONDS: float = float(os.getenv("BOOK_LIST_CACHE_TTL_SECONDS", "300"))
+    BOOK_LIST_CACHE_STALE_SECONDS: float = float(os.getenv("BOOK_LIST_CACHE_STALE_SECONDS", "5"))
+    # Answer list queries from an in-process columnar copy of the catalog (ColumnarBookRepository).
+    COLUMNAR_CATALOG: bool = os.getenv("COLUMNAR_CATALOG", "False").lower() == "true"
+    COLUMNAR_TAIL_MAX: int = int(os.getenv("COLUMNAR_TAIL_MAX", "1024"))
+    COLUMNAR_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("COLUMNAR_RELOAD_INTERVAL_SECONDS", "5"))
+
+    # Serve /metrics and record per-request metrics (MetricsMiddleware).
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+    # Statements slower than this are kept in the slow-query log (/admin/slow-queries).
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+
     TESTING: bool = os.getenv("TESTING", "False").lower() == "true"
 
     @property
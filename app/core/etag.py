@@ -0,0 +1,26 @@
+import hashlib
+from typing import Iterable
+
+
+def make_etag(version: int, path: str, query_items: Iterable[tuple[str, str]]) -> str:
+    """
+    Weak ETag for a catalog read: the catalog version plus a digest of the path and the
+    query parameters, sorted so that parameter order does not change the tag.
+    """
+    normalized = path + "?" + "&".join(f"{key}={value}" for key, value in sorted(query_items))
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Match comparison (weak, as RFC 9110 requires for this header).
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
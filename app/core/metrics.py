@@ -0,0 +1,143 @@
+import bisect
+import math
+from typing import Callable, Iterable, NamedTuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow imports.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricFamily(NamedTuple):
+    """
+    One metric as exposed: samples are (name suffix, labels, value).
+    """
+    name: str
+    kind: str
+    help: str
+    samples: list[tuple[str, dict[str, str], float]]
+
+
+_metrics: dict[str, "Counter | Gauge | Histogram"] = {}
+_collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        _metrics[name] = self
+
+    def collect(self) -> MetricFamily:
+        samples = [("", dict(zip(self.labelnames, labels)), value) for labels, value in self._values.items()]
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+class Counter(_Metric):
+    """
+    Monotonic count per label tuple. Updated from the event loop only, so no locking.
+    """
+    kind = "counter"
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        self._values[labels] = value
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+
+class Histogram(_Metric):
+    """
+    Bucketed distribution per label tuple. Each observation increments a single bucket;
+    the cumulative counts Prometheus expects are computed when rendering.
+    """
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> MetricFamily:
+        samples = []
+        for labels, series in self._series.items():
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                samples.append(("_bucket", {**base, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", base, series[-1]))
+            samples.append(("_count", base, cumulative))
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+def register_collector(collector: Callable[[], Iterable[MetricFamily]]) -> None:
+    """
+    Add a callback that reports values read at scrape time, e.g. the stats of an existing component.
+    """
+    _collectors.append(collector)
+
+
+def _format_value(value: float) -> str:
+    if type(value) is int:
+        return str(value)
+    if value != value:
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    if "\\" not in value and "\n" not in value and '"' not in value:
+        return value
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render() -> str:
+    """
+    All metrics and collector output in the Prometheus text exposition format (0.0.4).
+    """
+    families = [metric.collect() for metric in _metrics.values()]
+    for collector in _collectors:
+        families.extend(collector())
+
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape(family.help)}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for suffix, labels, value in family.samples:
+            if labels:
+                rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                lines.append(f"{family.name}{suffix}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{family.name}{suffix} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
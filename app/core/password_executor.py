@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.core.metrics import MetricFamily
+from app.exceptions.password_hashing_overloaded import PasswordHashingOverloaded
+
+
+class PasswordExecutor:
+    """
+    Dedicated thread pool for bcrypt so hashing never runs on the event loop.
+
+    At most `max_pending` calls may be queued or running; beyond that callers are
+    rejected at once instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingOverloaded()
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        future = self._executor.submit(fn, *args)
+        # Released when the job itself ends, not when the caller stops waiting: a cancelled
+        # caller leaves the hash running on its thread.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self.pending -= 1
+        self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def collect(self) -> list[MetricFamily]:
+        stats = self.stats()
+        return [
+            MetricFamily("password_hash_workers", "gauge", "Threads hashing passwords.", [("", {}, stats["workers"])]),
+            MetricFamily("password_hash_in_flight", "gauge", "Hashes running now.", [("", {}, stats["in_flight"])]),
+            MetricFamily(
+                "password_hash_queue_depth", "gauge", "Hashes waiting for a thread.", [("", {}, stats["queue_depth"])]
+            ),
+            MetricFamily(
+                "password_hash_completed_total", "counter", "Hashes finished.", [("", {}, stats["completed"])]
+            ),
+            MetricFamily(
+                "password_hash_rejected_total", "counter", "Hashes refused because the queue was full.",
+                [("", {}, stats["rejected"])]
+            ),
+        ]
@@ -1,10 +1,27 @@
+import time
+
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core.metrics import register_collector
+from app.core.password_executor import PasswordExecutor
+
+# min == max == default rounds, so any hash made with another cost is reported as needing an update.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+password_executor = PasswordExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+register_collector(password_executor.collect)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Verified access-token payloads; an entry never outlives the token's own exp.
+_verified_tokens = LRUCache("verified_tokens", settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL_SECONDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -12,9 +29,19 @@ def hash_password(password: str) -> str:
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+async def hash_password_async(password: str) -> str:
+    return await password_executor.run(pwd_context.hash, password)
+
+async def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    Verify off the event loop. The second item is a new hash when the stored one
+    was made with a different bcrypt cost than BCRYPT_ROUNDS.
+    """
+    return await password_executor.run(pwd_context.verify_and_update, plain, hashed)
+
+def create_access_token(subject: str, expires_delta: timedelta | None = None, claims: dict | None = None) -> str:
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode = {"sub": str(subject), "exp": int(expire.timestamp())}
+    to_encode = {**(claims or {}), "sub": str(subject), "exp": int(expire.timestamp())}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 def create_refresh_token(subject: str, expires_delta: timedelta | None = None) -> str:
@@ -24,3 +51,13 @@ def create_refresh_token(subject: str, expires_delta: timedelta | None = None) -
 
 def decode_token(token: str) -> dict:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+def decode_token_cached(token: str) -> dict:
+    payload = _verified_tokens.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_token(token)
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        _verified_tokens.set(token, payload, ttl=min(remaining, settings.TOKEN_CACHE_TTL_SECONDS))
+    return payload
@@ -1,21 +1,103 @@
+import time
 from contextlib import asynccontextmanager
+from typing import Callable
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.core.config import settings
+from app.core.metrics import Counter, Histogram, MetricFamily, register_collector
+from app.db.slow_query_log import SlowQueryLog
 
 Base = declarative_base()
 
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Statement execution time by leading SQL keyword.", ("operation",)
+)
+QUERY_ERRORS = Counter("db_query_errors_total", "Statements that raised, by leading SQL keyword.", ("operation",))
+POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time to get a connection from the pool, including waiting for one to free up."
+)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "BEGIN", "COMMIT", "ROLLBACK", "EXPLAIN"}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default asyncio pool, timing each checkout into db_pool_checkout_seconds.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - start)
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
     future=True,
-    poolclass=NullPool if settings.TESTING else None,  # Better for testing
+    poolclass=NullPool if settings.TESTING else InstrumentedQueuePool,  # Better for testing
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
 )
 
+
+slow_query_log = SlowQueryLog(
+    engine,
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    settings.SLOW_QUERY_LOG_SIZE,
+    settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+)
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip()[:10].split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in _OPERATIONS else "OTHER"
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    QUERY_DURATION.observe(elapsed, (_operation(statement),))
+    if context.execution_options.get("slow_query_log", True):
+        slow_query_log.observe(statement, parameters, elapsed, executemany)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _record_query_error(context) -> None:
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+    QUERY_ERRORS.inc((_operation(context.statement or ""),))
+
+
+def _collect_pool_metrics() -> list[MetricFamily]:
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return []
+    return [
+        MetricFamily("db_pool_size", "gauge", "Configured number of pooled connections.", [("", {}, pool.size())]),
+        MetricFamily("db_pool_checked_out", "gauge", "Connections currently in use.", [("", {}, pool.checkedout())]),
+        MetricFamily(
+            "db_pool_overflow", "gauge", "Connections open beyond the pool size (negative: not yet opened).",
+            [("", {}, pool.overflow())]
+        ),
+    ]
+
+
+register_collector(_collect_pool_metrics)
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -35,3 +117,22 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run callback once the session's current transaction commits; dropped on rollback.
+    Used to keep in-process caches from ever holding uncommitted state.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop("after_commit", None)
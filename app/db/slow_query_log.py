@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import random
+import re
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import Counter
+from app.schemas.enums import PlanStatus
+from app.schemas.slow_query import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_THRESHOLD_MS.")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])\d+(?:\.\d+)?\b")
+_READ_ONLY = re.compile(r"^\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE|FOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE))\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    One line, with inline literals replaced by ?, so the same query always reads the same.
+    Bound parameters are already placeholders.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _redact(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any) -> list[str] | dict[str, str] | None:
+    """
+    Parameter types and lengths only: values can be passwords, tokens or personal data.
+    """
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(value) for value in parameters]
+    return None
+
+
+def is_read_only(statement: str) -> bool:
+    return bool(_READ_ONLY.match(statement)) and not _WRITES.search(statement)
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of statements that took longer than `threshold` seconds.
+
+    A sampled share of the read-only ones is re-run under EXPLAIN (ANALYZE, BUFFERS) on a separate
+    connection, in a background task, inside a READ ONLY transaction with a statement timeout.
+    At most `max_explains` run at once, so a burst of slow queries cannot double the database load.
+    The original parameter values are kept only until their EXPLAIN finishes.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        threshold_ms: float,
+        size: int,
+        explain_sample_rate: float,
+        explain_timeout_ms: int,
+        max_explains: int = 1,
+    ):
+        self.engine = engine
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.max_explains = max_explains
+        self._entries: deque[SlowQuery] = deque(maxlen=size)
+        self._next_id = 1
+        self._explains: set[asyncio.Task] = set()
+
+    def observe(self, statement: str, parameters: Any, duration: float, executemany: bool) -> None:
+        """
+        Called with every statement's execution time; records it if slow.
+        """
+        if duration < self.threshold or self._entries.maxlen == 0:
+            return
+        SLOW_QUERIES.inc()
+        entry = SlowQuery(
+            id=self._next_id,
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=round(duration * 1000, 3),
+            sql=normalize_sql(statement),
+            parameters=None if executemany else redact_parameters(parameters),
+            plan_status=PlanStatus.NOT_SAMPLED,
+        )
+        self._next_id += 1
+        self._entries.append(entry)
+
+        if executemany or not is_read_only(statement):
+            entry.plan_status = PlanStatus.NOT_READ_ONLY
+            return
+        if len(self._explains) >= self.max_explains or random.random() >= self.explain_sample_rate:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        entry.plan_status = PlanStatus.PENDING
+        task = loop.create_task(self._explain(entry, statement, parameters))
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                # The EXPLAIN is as slow as the query; keep it out of the log.
+                await conn.execution_options(slow_query_log=False)
+                await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                result = await conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+                entry.plan = "\n".join(row[0] for row in result)
+                entry.plan_status = PlanStatus.CAPTURED
+                await conn.rollback()
+        except Exception as e:
+            logger.warning("EXPLAIN of slow query %s failed: %s", entry.id, e)
+            entry.plan = str(e)
+            entry.plan_status = PlanStatus.FAILED
+
+    def entries(self, limit: int | None = None) -> list[SlowQuery]:
+        """
+        Newest first.
+        """
+        newest = list(reversed(self._entries))
+        return newest[:limit] if limit is not None else newest
+
+    def clear(self) -> None:
+        self._entries.clear()
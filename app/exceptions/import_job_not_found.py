@@ -0,0 +1,3 @@
+class ImportJobNotFound(Exception):
+    def __init__(self, job_id):
+        super().__init__("Import job {} not found".format(job_id))
@@ -0,0 +1,3 @@
+class InvalidCursor(Exception):
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
@@ -0,0 +1,3 @@
+class PasswordHashingOverloaded(Exception):
+    def __init__(self):
+        super().__init__("Too many concurrent password operations, retry later")
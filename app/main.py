@@ -2,22 +2,40 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.core.config import settings
 from app.middlewares.error_handler import error_handling_middleware
-from app.registry import init_registry
+from app.middlewares.metrics import MetricsMiddleware
+from app.registry import init_registry, Registry
+from app.services.import_job_service import ImportJobService
 
 
 from app.api.endpoints.books import router as books_router
 from app.api.endpoints.auth import router as auth_router
 from app.api.endpoints.authors import router as authors_router
+from app.api.endpoints.import_jobs import router as import_jobs_router
+from app.api.endpoints.search import router as search_router
+from app.api.endpoints.admin import router as admin_router
+from app.api.endpoints.metrics import router as metrics_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_registry()
+    import_jobs = Registry.get(ImportJobService)
+    await import_jobs.start()
     yield
+    await import_jobs.stop()
 
 app = FastAPI(title="Books API", lifespan=lifespan)
 
 app.middleware("http")(error_handling_middleware)
+if settings.METRICS_ENABLED:
+    # Added last so it is outermost and also sees the responses the error handler produces.
+    app.add_middleware(MetricsMiddleware)
 app.include_router(books_router, prefix="/api/v1", tags=["books"])
 app.include_router(auth_router, prefix="/api/v1", tags=["auth"])
-app.include_router(authors_router, prefix="/api/v1", tags=["authors"])
\ No newline at end of file
+app.include_router(authors_router, prefix="/api/v1", tags=["authors"])
+app.include_router(import_jobs_router, prefix="/api/v1", tags=["import-jobs"])
+app.include_router(search_router, prefix="/api/v1", tags=["search"])
+app.include_router(admin_router, prefix="/api/v1", tags=["admin"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, tags=["metrics"])
@@ -4,6 +4,9 @@ from jose import JWTError
 from sqlalchemy.exc import IntegrityError
 
 from app.exceptions.book_not_found import BookNotFound
+from app.exceptions.import_job_not_found import ImportJobNotFound
+from app.exceptions.invalid_cursor import InvalidCursor
+from app.exceptions.password_hashing_overloaded import PasswordHashingOverloaded
 
 
 async def error_handling_middleware(request: Request, call_next):
@@ -23,7 +26,20 @@ async def error_handling_middleware(request: Request, call_next):
             content={"success": False, "error": "Database integrity error"}
         )
 
-    except BookNotFound as e:
+    except InvalidCursor as e:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": str(e)}
+        )
+
+    except PasswordHashingOverloaded as e:
+        return JSONResponse(
+            status_code=503,
+            content={"success": False, "error": str(e)},
+            headers={"Retry-After": "1"}
+        )
+
+    except (BookNotFound, ImportJobNotFound) as e:
         return JSONResponse(
             status_code=404,
             content={"success": False, "error": str(e)}
@@ -0,0 +1,51 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status")
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time until the response body is fully sent.", ("method", "route")
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency and concurrency. A plain ASGI middleware rather than
+    BaseHTTPMiddleware, so it adds no task or body buffering per request and times
+    streamed responses to their last chunk.
+
+    Requests are labelled with the matched route template (/api/v1/books/{book_id}), which
+    FastAPI leaves in the scope, so label cardinality stays bounded by the routes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.observe(elapsed, (scope["method"], route))
+            REQUESTS.inc((scope["method"], route, str(status)))
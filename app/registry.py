@@ -1,11 +1,17 @@
 from __future__ import annotations
 from typing import TypeVar, Type
 
-from app.reposytory.author_repository import AuthorRepository, AuthorRepositoryImpl
-from app.reposytory.book_repository import BookRepository, BookRepositoryImpl
-from app.reposytory.user_repository import UserRepository, UserRepositoryImpl
+from app.core.config import settings
+from app.reposytory.author_repository import AuthorRepository, AuthorRepositoryImpl, CachedAuthorRepository
+from app.reposytory.book_repository import BookRepository, BookRepositoryImpl, CachedBookRepository
+from app.reposytory.catalog_repository import CatalogRepository, CatalogRepositoryImpl
+from app.reposytory.columnar_book_repository import ColumnarBookRepository
+from app.reposytory.import_job_repository import ImportJobRepository, ImportJobRepositoryImpl
+from app.reposytory.user_repository import UserRepository, UserRepositoryImpl, CachedUserRepository
 from app.services.auth_service import AuthService, AuthServiceImpl
+from app.services.book_list_cache import BookListCache, BookListCacheImpl
 from app.services.book_service import BookServiceImpl, BookService
+from app.services.import_job_service import ImportJobService, ImportJobServiceImpl
 
 T = TypeVar("T")
 
@@ -26,9 +32,17 @@ class Registry:
 
 
 def init_registry() -> None:
-    Registry.register(AuthorRepository, AuthorRepositoryImpl())
-    Registry.register(BookRepository, BookRepositoryImpl(Registry.get(AuthorRepository)))
+    Registry.register(AuthorRepository, CachedAuthorRepository(AuthorRepositoryImpl()))
+    Registry.register(CatalogRepository, CatalogRepositoryImpl())
+    book_repo = CachedBookRepository(BookRepositoryImpl(Registry.get(AuthorRepository)))
+    if settings.COLUMNAR_CATALOG:
+        book_repo = ColumnarBookRepository(book_repo, Registry.get(CatalogRepository))
+    Registry.register(BookRepository, book_repo)
     Registry.register(BookService, BookServiceImpl(Registry.get(BookRepository), Registry.get(AuthorRepository)))
+    Registry.register(BookListCache, BookListCacheImpl(Registry.get(BookService), Registry.get(CatalogRepository)))
 
-    Registry.register(UserRepository, UserRepositoryImpl())
-    Registry.register(AuthService, AuthServiceImpl(Registry.get(UserRepository)))
\ No newline at end of file
+    Registry.register(UserRepository, CachedUserRepository(UserRepositoryImpl()))
+    Registry.register(AuthService, AuthServiceImpl(Registry.get(UserRepository)))
+
+    Registry.register(ImportJobRepository, ImportJobRepositoryImpl())
+    Registry.register(ImportJobService, ImportJobServiceImpl(Registry.get(ImportJobRepository), Registry.get(BookService)))
\ No newline at end of file
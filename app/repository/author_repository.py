@@ -3,85 +3,381 @@ from abc import ABC
 from typing import List
 
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.schemas.author import AuthorCreate, AuthorResponse
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.session import after_commit
+from app.exceptions.invalid_cursor import InvalidCursor
+from app.schemas.author import AuthorCreate, AuthorResponse, AuthorListItem, AuthorPage
+from app.schemas.search import AuthorSearchHit
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Smallest string above every string starting with prefix, in code point (UTF-8 byte) order.
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def build_author_list_query(
+    limit: int,
+    name_prefix: str | None,
+    sort_order: str,
+    cursor: str | None,
+    include_book_count: bool,
+) -> tuple[str, dict, str]:
+    """
+    SQL and parameters for one page of authors by name (limit + 1 rows), plus the normalized sort_order.
+    """
+    sort_order = sort_order.lower()
+    if sort_order not in {"asc", "desc"}:
+        sort_order = "asc"
+    direction = sort_order.upper()
+
+    filters = []
+    params = {"limit": limit + 1}
+    if name_prefix:
+        # A byte-wise range rather than LIKE, so ix_authors_name_pattern (text_pattern_ops) is
+        # used even by a generic prepared-statement plan, where the pattern is not known.
+        filters.append("a.name ~>=~ :name_from")
+        params["name_from"] = name_prefix
+        name_to = _prefix_upper_bound(name_prefix)
+        if name_to is not None:
+            filters.append("a.name ~<~ :name_to")
+            params["name_to"] = name_to
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("sort_order") != sort_order:
+            raise InvalidCursor()
+        try:
+            params["cursor_name"] = position["name"]
+            params["cursor_id"] = uuid.UUID(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidCursor()
+        if not isinstance(params["cursor_name"], str):
+            raise InvalidCursor()
+        # The plain bound lets Postgres range-scan ix_authors_name; the row comparison breaks ties by id.
+        op, bound = (">", ">=") if sort_order == "asc" else ("<", "<=")
+        filters.append(f"a.name {bound} :cursor_name AND (a.name, a.id) {op} (:cursor_name, :cursor_id)")
+
+    query_text = "SELECT a.id, a.name FROM authors a"
+    if filters:
+        query_text += " WHERE " + " AND ".join(filters)
+    query_text += f" ORDER BY a.name {direction}, a.id {direction} LIMIT :limit"
+
+    if include_book_count:
+        # One grouped pass over the page, counted from ix_books_author_id_id; no query per author.
+        query_text = f"""
+            WITH page AS ({query_text})
+            SELECT p.id, p.name, count(b.id) AS book_count
+            FROM page p
+            LEFT JOIN books b ON b.author_id = p.id
+            GROUP BY p.id, p.name
+            ORDER BY p.name {direction}, p.id {direction}
+        """
+
+    return query_text, params, sort_order
 
 
 class AuthorRepository(ABC):
-    async def get_author(self, author_id: uuid.UUID) -> AuthorResponse | None:
+    async def get_author(self, session: AsyncSession, author_id: uuid.UUID) -> AuthorResponse | None:
+        raise NotImplementedError()
+
+    async def create_author(self, session: AsyncSession, author: AuthorCreate) -> AuthorResponse:
+        raise NotImplementedError()
+
+    async def delete_author(self, session: AsyncSession, author_id: uuid.UUID) -> AuthorResponse | None:
+        raise NotImplementedError()
+
+    async def get_authors(
+        self,
+        session: AsyncSession,
+        limit: int = 100,
+        name_prefix: str | None = None,
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        include_book_count: bool = False,
+    ) -> AuthorPage:
+        raise NotImplementedError()
+
+    async def get_author_by_name(self, session: AsyncSession, name: str) -> AuthorResponse | None:
         raise NotImplementedError()
 
-    async def create_author(self, author: AuthorCreate) -> AuthorResponse:
+    async def resolve_author_ids(
+        self, session: AsyncSession, names: list[str], refresh: bool = False
+    ) -> dict[str, uuid.UUID]:
         raise NotImplementedError()
 
-    async def delete_author(self, author_id: uuid.UUID) -> AuthorResponse | None:
+    async def get_or_create_author_id(self, session: AsyncSession, name: str, refresh: bool = False) -> uuid.UUID:
         raise NotImplementedError()
 
-    async def get_all_authors(self) -> List[AuthorResponse]:
+    async def search_authors(self, session: AsyncSession, query: str, limit: int) -> List[AuthorSearchHit]:
         raise NotImplementedError()
 
-    async def get_author_by_name(self, name: str) -> AuthorResponse | None:
+    async def evict_author(self, session: AsyncSession, author_id: uuid.UUID, name: str) -> None:
         raise NotImplementedError()
 
 
 class AuthorRepositoryImpl(AuthorRepository):
-    async def create_author(self, author: AuthorCreate) -> AuthorResponse:
+    def __init__(self) -> None:
+        # name -> id for the write path. Ids only go stale when an author is deleted, which evicts
+        # the name here; deletions by other processes are caught by callers via refresh=True.
+        self._author_ids = LRUCache("author_ids", settings.AUTHOR_NAME_CACHE_SIZE, settings.AUTHOR_NAME_CACHE_TTL_SECONDS)
+
+    def _remember_ids(self, session: AsyncSession, ids: dict[str, uuid.UUID]) -> None:
+        # Ids of authors created in this transaction only become valid once it commits.
+        generation = self._author_ids.generation
+
+        def remember() -> None:
+            for name, author_id in ids.items():
+                self._author_ids.set(name, author_id, generation=generation)
+
+        after_commit(session, remember)
+
+    async def create_author(self, session: AsyncSession, author: AuthorCreate) -> AuthorResponse:
         author_id = uuid.uuid4()
-        async with get_db() as session:
-            query = text("""
+        query = text("""
+            INSERT INTO authors (id, name)
+            VALUES (:id, :name)
+            RETURNING id, name
+        """)
+        result = await session.execute(query, {"name": author.name, "id": author_id})
+        row = result.first()
+        return AuthorResponse(id=row.id, name=row.name)
+
+    async def get_author(self, session: AsyncSession, author_id: uuid.UUID) -> AuthorResponse | None:
+        query = text("""
+            SELECT id, name
+            FROM authors
+            WHERE id = :author_id
+        """)
+        result = await session.execute(query, {"author_id": author_id})
+        row = result.first()
+        if row:
+            return AuthorResponse(id=row.id, name=row.name)
+        return None
+
+    async def delete_author(self, session: AsyncSession, author_id: uuid.UUID) -> AuthorResponse | None:
+        query = text("""
+            DELETE FROM authors
+            WHERE id = :author_id
+            RETURNING id, name
+        """)
+        result = await session.execute(query, {"author_id": author_id})
+        row = result.first()
+        if row:
+            await self.evict_author(session, row.id, row.name)
+            return AuthorResponse(id=row.id, name=row.name)
+        return None
+
+    async def evict_author(self, session: AsyncSession, author_id: uuid.UUID, name: str) -> None:
+        """
+        Forget an author deleted in this transaction, e.g. by the orphan cleanup of a book delete.
+        """
+        self._author_ids.invalidate(name)
+        after_commit(session, lambda: self._author_ids.invalidate(name))
+
+    async def get_authors(
+        self,
+        session: AsyncSession,
+        limit: int = 100,
+        name_prefix: str | None = None,
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        include_book_count: bool = False,
+    ) -> AuthorPage:
+        """
+        One page of authors ordered by name, continued with next_cursor (keyset on name, id).
+        """
+        query_text, params, sort_order = build_author_list_query(
+            limit, name_prefix, sort_order, cursor, include_book_count
+        )
+        result = await session.execute(text(query_text), params)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({"sort_order": sort_order, "name": last.name, "id": str(last.id)})
+
+        items = [
+            AuthorListItem(id=row.id, name=row.name, book_count=row.book_count if include_book_count else None)
+            for row in rows
+        ]
+        return AuthorPage(items=items, next_cursor=next_cursor)
+
+    async def get_author_by_name(self, session: AsyncSession, name: str) -> AuthorResponse | None:
+        query = text("""
+            SELECT id, name
+            FROM authors
+            WHERE name = :name
+        """)
+        result = await session.execute(query, {"name": name})
+        row = result.first()
+        if row:
+            return AuthorResponse(id=row.id, name=row.name)
+        return None
+
+    async def get_or_create_author_id(self, session: AsyncSession, name: str, refresh: bool = False) -> uuid.UUID:
+        """
+        Resolve an author name to its id, creating the author if needed.
+        Known names are answered from memory; misses take one atomic upsert, so concurrent
+        writers never race on ix_authors_name.
+        """
+        if not refresh:
+            author_id = self._author_ids.get(name)
+            if author_id is not None:
+                return author_id
+
+        query = text("""
+            WITH inserted AS (
                 INSERT INTO authors (id, name)
                 VALUES (:id, :name)
-                RETURNING id, name
-            """)
-            result = await session.execute(query, {"name": author.name, "id": author_id})
-            await session.commit()
-            row = result.first()
-            return AuthorResponse(id=row.id, name=row.name)
+                ON CONFLICT (name) DO NOTHING
+                RETURNING id
+            )
+            SELECT id FROM inserted
+            UNION ALL
+            SELECT id FROM authors WHERE name = :name
+            LIMIT 1
+        """)
+        result = await session.execute(query, {"id": uuid.uuid4(), "name": name})
+        author_id = result.scalar_one_or_none()
+        if author_id is None:
+            # Committed by a concurrent writer after this statement's snapshot was taken.
+            result = await session.execute(text("SELECT id FROM authors WHERE name = :name"), {"name": name})
+            author_id = result.scalar_one()
+
+        self._remember_ids(session, {name: author_id})
+        return author_id
+
+    async def resolve_author_ids(
+        self, session: AsyncSession, names: list[str], refresh: bool = False
+    ) -> dict[str, uuid.UUID]:
+        """
+        Map every distinct name to an author id, creating missing authors in the same round trip.
+        """
+        names = list(dict.fromkeys(names))
+        resolved = {}
+        if not refresh:
+            for name in names:
+                author_id = self._author_ids.get(name)
+                if author_id is not None:
+                    resolved[name] = author_id
+            names = [name for name in names if name not in resolved]
+        if not names:
+            return resolved
 
-    async def get_author(self, author_id: uuid.UUID) -> AuthorResponse | None:
-        async with get_db() as session:
-            query = text("""
-                SELECT id, name
-                FROM authors
-                WHERE id = :author_id
-            """)
-            result = await session.execute(query, {"author_id": author_id})
-            row = result.first()
-            if row:
-                return AuthorResponse(id=row.id, name=row.name)
-            return None
-
-    async def delete_author(self, author_id: uuid.UUID) -> AuthorResponse | None:
-        async with get_db() as session:
-            query = text("""
-                DELETE FROM authors
-                WHERE id = :author_id
+        query = text("""
+            WITH input AS (
+                SELECT DISTINCT unnest(CAST(:names AS varchar[])) AS name
+            ),
+            inserted AS (
+                INSERT INTO authors (id, name)
+                SELECT gen_random_uuid(), name FROM input
+                ON CONFLICT (name) DO NOTHING
                 RETURNING id, name
-            """)
-            result = await session.execute(query, {"author_id": author_id})
-            await session.commit()
-            row = result.first()
-            if row:
-                return AuthorResponse(id=row.id, name=row.name)
-            return None
-
-    async def get_all_authors(self) -> List[AuthorResponse]:
-        async with get_db() as session:
-            query = text("SELECT id, name FROM authors")
-            result = await session.execute(query)
-            rows = result.all()
-            return [AuthorResponse(id=row.id, name=row.name) for row in rows]
-
-    async def get_author_by_name(self, name: str) -> AuthorResponse | None:
-        async with get_db() as session:
-            query = text("""
-                SELECT id, name
-                FROM authors
-                WHERE name = :name
-            """)
-            result = await session.execute(query, {"name": name})
-            row = result.first()
-            if row:
-                return AuthorResponse(id=row.id, name=row.name)
-            return None
+            )
+            SELECT id, name FROM inserted
+            UNION ALL
+            SELECT a.id, a.name FROM authors a JOIN input i ON a.name = i.name
+        """)
+        result = await session.execute(query, {"names": names})
+        fetched = {row.name: row.id for row in result.all()}
+
+        # Authors committed by a concurrent writer after this statement's snapshot
+        # are skipped by ON CONFLICT but not yet visible above, so look them up again.
+        missing = [name for name in names if name not in fetched]
+        if missing:
+            query = text("SELECT id, name FROM authors WHERE name = ANY(:names)")
+            result = await session.execute(query, {"names": missing})
+            fetched.update({row.name: row.id for row in result.all()})
+
+        self._remember_ids(session, fetched)
+        resolved.update(fetched)
+        return resolved
+
+    async def search_authors(self, session: AsyncSession, query: str, limit: int) -> List[AuthorSearchHit]:
+        sql = text("""
+            WITH q AS (
+                SELECT websearch_to_tsquery('simple', :q) AS tsq
+            )
+            SELECT a.id, a.name, ts_rank(a.search_vector, q.tsq) + similarity(a.name, :q) AS score
+            FROM authors a, q
+            WHERE a.search_vector @@ q.tsq OR a.name % :q
+            ORDER BY score DESC, a.id
+            LIMIT :limit
+        """)
+        result = await session.execute(sql, {"q": query, "limit": limit})
+        return [AuthorSearchHit(id=row.id, name=row.name, score=row.score) for row in result.all()]
+
+
+class CachedAuthorRepository(AuthorRepository):
+    """
+    Read-through cache for get_author in front of another AuthorRepository.
+    Entries live at most CACHE_TTL_SECONDS, which bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, inner: AuthorRepository) -> None:
+        self._inner = inner
+        self._cache = LRUCache("authors", settings.AUTHOR_CACHE_SIZE, settings.CACHE_TTL_SECONDS)
+
+    async def get_author(self, session: AsyncSession, author_id: uuid.UUID) -> AuthorResponse | None:
+        author = self._cache.get(author_id)
+        if author is not None:
+            return author
+        generation = self._cache.generation
+        author = await self._inner.get_author(session, author_id)
+        if author is not None:
+            # The row may have been written by this request's own transaction; cache it only once that commits.
+            after_commit(session, lambda: self._cache.set(author_id, author, generation=generation))
+        return author
+
+    async def create_author(self, session: AsyncSession, author: AuthorCreate) -> AuthorResponse:
+        return await self._inner.create_author(session, author)
+
+    async def delete_author(self, session: AsyncSession, author_id: uuid.UUID) -> AuthorResponse | None:
+        # Invalidate now and again at commit so a read racing with the transaction cannot re-cache the old row.
+        self._cache.invalidate(author_id)
+        after_commit(session, lambda: self._cache.invalidate(author_id))
+        return await self._inner.delete_author(session, author_id)
+
+    async def get_authors(
+        self,
+        session: AsyncSession,
+        limit: int = 100,
+        name_prefix: str | None = None,
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        include_book_count: bool = False,
+    ) -> AuthorPage:
+        return await self._inner.get_authors(session, limit, name_prefix, sort_order, cursor, include_book_count)
+
+    async def get_author_by_name(self, session: AsyncSession, name: str) -> AuthorResponse | None:
+        return await self._inner.get_author_by_name(session, name)
+
+    async def resolve_author_ids(
+        self, session: AsyncSession, names: list[str], refresh: bool = False
+    ) -> dict[str, uuid.UUID]:
+        return await self._inner.resolve_author_ids(session, names, refresh)
+
+    async def get_or_create_author_id(self, session: AsyncSession, name: str, refresh: bool = False) -> uuid.UUID:
+        return await self._inner.get_or_create_author_id(session, name, refresh)
+
+    async def search_authors(self, session: AsyncSession, query: str, limit: int) -> List[AuthorSearchHit]:
+        return await self._inner.search_authors(session, query, limit)
+
+    async def evict_author(self, session: AsyncSession, author_id: uuid.UUID, name: str) -> None:
+        self._cache.invalidate(author_id)
+        after_commit(session, lambda: self._cache.invalidate(author_id))
+        await self._inner.evict_author(session, author_id, name)
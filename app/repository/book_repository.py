@@ -1,44 +1,230 @@
 import uuid
 from abc import ABC
+from typing import AsyncIterator, NamedTuple
 from uuid import UUID
 
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.session import after_commit
 from app.exceptions.book_not_found import BookNotFound
+from app.exceptions.invalid_cursor import InvalidCursor
 from app.reposytory.author_repository import AuthorRepository
-from app.schemas.book import BookCreate, BookResponse, BookUpdate
+from app.schemas.book import BookCreate, BookResponse, BookUpdate, BookPage, BookFacets, GenreFacet, DecadeFacet
 from app.schemas.enums import GenreEnum
+from app.schemas.search import BookSearchHit
+
+# Text sorts use code point order (COLLATE "C"), the order ColumnarBookRepository's snapshot sorts in,
+# so pages and cursors agree whichever path answers; ix_books_title_id and ix_authors_name_c match it.
+SORT_COLUMNS = {"title": 'b.title COLLATE "C"', "author": 'a.name COLLATE "C"', "published_year": "b.published_year"}
+SORT_ROW_FIELDS = {"title": "title", "author": "author_name", "published_year": "published_year"}
+
+
+class BookRows(NamedTuple):
+    """
+    A list page as raw rows (id, title, published_year, author_id, author_name, genres),
+    for callers that serialize without building BookResponse models.
+    """
+    rows: list
+    next_cursor: str | None
+    facets: BookFacets | None
+
+
+def build_book_filters(
+    title: str | None,
+    author: str | None,
+    genres: list[str] | None,
+    genre_match: str,
+    year_from: int | None,
+    year_to: int | None,
+) -> tuple[list[str], dict]:
+    """
+    WHERE conditions over books b / authors a shared by the list and facet queries.
+    """
+    filters = []
+    params = {}
+
+    if title:
+        filters.append("b.title ILIKE :title")
+        params["title"] = f"%{title}%"
+    if author:
+        filters.append("a.name ILIKE :author")
+        params["author"] = f"%{author}%"
+    if genres:
+        valid_genres = {g.value for g in GenreEnum}
+        for genre in genres:
+            if genre not in valid_genres:
+                raise ValueError(f"Invalid genre: {genre}")
+        if genre_match not in {"any", "all"}:
+            raise ValueError(f"Invalid genre_match: {genre_match}")
+        # Array overlap/containment operators are served by the GIN index on b.genres.
+        operator = "@>" if genre_match == "all" else "&&"
+        filters.append(f"b.genres {operator} CAST(:genres AS genreenum[])")
+        params["genres"] = list(dict.fromkeys(genres))
+    if year_from:
+        filters.append("b.published_year >= :year_from")
+        params["year_from"] = year_from
+    if year_to:
+        filters.append("b.published_year <= :year_to")
+        params["year_to"] = year_to
+
+    return filters, params
+
+
+def normalize_book_sort(sort_by: str, sort_order: str) -> tuple[str, str]:
+    """
+    The sort_by and sort_order a list query actually uses: unknown values fall back to title and asc.
+    """
+    if sort_by not in SORT_COLUMNS:
+        sort_by = "title"
+    sort_order = sort_order.lower()
+    if sort_order not in {"asc", "desc"}:
+        sort_order = "asc"
+    return sort_by, sort_order
+
+
+def build_book_list_query(
+    skip: int,
+    limit: int,
+    title: str | None,
+    author: str | None,
+    genres: list[str] | None,
+    genre_match: str,
+    year_from: int | None,
+    year_to: int | None,
+    sort_by: str,
+    sort_order: str,
+    cursor: str | None,
+) -> tuple[str, dict, str, str]:
+    """
+    SQL and parameters for one list page (limit + 1 rows), plus the normalized sort_by and sort_order.
+    """
+    query_text = """
+        SELECT b.id, b.title, b.published_year, a.id AS author_id, a.name AS author_name, b.genres
+        FROM books b
+        JOIN authors a ON b.author_id = a.id
+    """
+
+    filters, params = build_book_filters(title, author, genres, genre_match, year_from, year_to)
+
+    sort_by, sort_order = normalize_book_sort(sort_by, sort_order)
+    sort_column = SORT_COLUMNS[sort_by]
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("sort_by") != sort_by or position.get("sort_order") != sort_order:
+            raise InvalidCursor()
+        try:
+            params["cursor_value"] = position["value"]
+            params["cursor_id"] = UUID(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidCursor()
+        if not isinstance(params["cursor_value"], int if sort_by == "published_year" else str):
+            raise InvalidCursor()
+        # The plain bound lets Postgres range-scan the sort index; the row comparison breaks ties by id.
+        op, bound = (">", ">=") if sort_order == "asc" else ("<", "<=")
+        filters.append(
+            f"{sort_column} {bound} :cursor_value AND ({sort_column}, b.id) {op} (:cursor_value, :cursor_id)"
+        )
+
+    if filters:
+        query_text += " WHERE " + " AND ".join(filters)
+
+    query_text += f" ORDER BY {sort_column} {sort_order.upper()}, b.id {sort_order.upper()}"
+
+    # One extra row tells whether another page exists.
+    if cursor:
+        query_text += " LIMIT :limit"
+    else:
+        query_text += " OFFSET :skip LIMIT :limit"
+        params["skip"] = skip
+    params["limit"] = limit + 1
+
+    return query_text, params, sort_by, sort_order
 
 
 class BookRepository(ABC):
-    async def get_book(self, book_id: UUID) -> BookResponse | None:
+    async def get_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
         raise NotImplementedError()
 
-    async def create_book(self, book: BookCreate) -> BookResponse:
+    async def create_book(self, session: AsyncSession, book: BookCreate) -> BookResponse:
         raise NotImplementedError()
 
-    async def update_book(self, book: BookUpdate) -> BookResponse | None:
+    async def update_book(self, session: AsyncSession, book: BookUpdate) -> BookResponse | None:
         raise NotImplementedError()
 
-    async def delete_book(self, book_id: UUID) -> BookResponse | None:
+    async def delete_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
         raise NotImplementedError()
 
     async def get_all_books(
         self,
+        session: AsyncSession,
+        skip: int,
+        limit: int,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        year_from: int | None,
+        year_to: int | None,
+        sort_by: str,
+        sort_order: str,
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookPage:
+        raise NotImplementedError()
+
+    async def get_book_rows(
+        self,
+        session: AsyncSession,
         skip: int,
         limit: int,
         title: str | None,
         author: str | None,
-        genre: str | None,
+        genres: list[str] | None,
         year_from: int | None,
         year_to: int | None,
         sort_by: str,
         sort_order: str,
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookRows:
+        raise NotImplementedError()
+
+    async def get_books(self, session: AsyncSession, book_ids: list[UUID]) -> list[BookResponse]:
+        raise NotImplementedError()
+
+    async def get_books_by_author(self, session: AsyncSession, author_id: UUID) -> list[BookResponse]:
+        raise NotImplementedError()
+
+    def stream_books(
+        self,
+        session: AsyncSession,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> AsyncIterator[list]:
+        raise NotImplementedError()
+
+    async def bulk_create_books(
+        self,
+        session: AsyncSession,
+        titles: list[str],
+        published_years: list[int],
+        author_names: list[str],
+        genres: list[list[str]],
+        book_ids: list[UUID] | None = None,
     ) -> list[BookResponse]:
         raise NotImplementedError()
 
-    async def get_books_by_author(self, author_id: UUID) -> list[BookResponse]:
+    async def search_books(self, session: AsyncSession, query: str, limit: int) -> list[BookSearchHit]:
         raise NotImplementedError()
 
 
@@ -46,27 +232,54 @@ class BookRepositoryImpl(BookRepository):
     def __init__(self, author_repo: AuthorRepository) -> None:
         self._author_repo = author_repo
 
-    async def create_book(self, book_data: BookCreate) -> BookResponse:
-        async with get_db() as session:  # AsyncSession
-            author = await self._author_repo.get_author_by_name(book_data.author.name)
-            if author is None:
-                author = await self._author_repo.create_author(book_data.author)
+    async def create_book(self, session: AsyncSession, book_data: BookCreate) -> BookResponse:
+        author_id = await self._author_repo.get_or_create_author_id(session, book_data.author.name)
+        book = await self._insert_book(session, book_data, author_id)
+        if book is None:
+            # The remembered author was deleted meanwhile (e.g. by another process); resolve it again.
+            author_id = await self._author_repo.get_or_create_author_id(session, book_data.author.name, refresh=True)
+            book = await self._insert_book(session, book_data, author_id)
+        return book
 
-            book_id = uuid.uuid4()
-            query = text("""
-                INSERT INTO books (id, title, published_year, author_id, genres)
-                VALUES (:id, :title, :year, :author_id, :genres)
-                RETURNING id, title, published_year, author_id, genres
-            """)
-            result = await session.execute(query, {
-                "id": book_id,
-                "title": book_data.title,
-                "year": book_data.published_year,
-                "author_id": author.id,
-                "genres": [g.value for g in book_data.genres]
-            })
-            await session.commit()
-            row = result.first()
+    async def _insert_book(self, session: AsyncSession, book_data: BookCreate, author_id: UUID) -> BookResponse | None:
+        """
+        Insert the book only if its author still exists. A foreign key violation would abort the
+        whole request transaction, so a missing author yields None instead and the caller retries.
+        """
+        book_id = uuid.uuid4()
+        query = text("""
+            INSERT INTO books (id, title, published_year, author_id, genres)
+            SELECT CAST(:id AS uuid), CAST(:title AS varchar), CAST(:year AS int), a.id, CAST(:genres AS genreenum[])
+            FROM authors a
+            WHERE a.id = :author_id
+            RETURNING id, title, published_year, author_id, genres
+        """)
+        result = await session.execute(query, {
+            "id": book_id,
+            "title": book_data.title,
+            "year": book_data.published_year,
+            "author_id": author_id,
+            "genres": [g.value for g in book_data.genres]
+        })
+        row = result.first()
+        if row is None:
+            return None
+        return BookResponse(
+            id=row.id,
+            title=row.title,
+            published_year=row.published_year,
+            author_id=row.author_id,
+            genres=row.genres
+        )
+
+    async def get_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
+        query = text("""
+            SELECT id, title, published_year, author_id, genres
+            FROM books WHERE id = :book_id
+        """)
+        result = await session.execute(query, {"book_id": book_id})
+        row = result.first()
+        if row:
             return BookResponse(
                 id=row.id,
                 title=row.title,
@@ -74,163 +287,380 @@ class BookRepositoryImpl(BookRepository):
                 author_id=row.author_id,
                 genres=row.genres
             )
+        return None
 
-    async def get_book(self, book_id: UUID) -> BookResponse | None:
-        async with get_db() as session:
-            query = text("""
-                SELECT id, title, published_year, author_id, genres
-                FROM books WHERE id = :book_id
-            """)
-            result = await session.execute(query, {"book_id": book_id})
-            row = result.first()
-            if row:
-                return BookResponse(
-                    id=row.id,
-                    title=row.title,
-                    published_year=row.published_year,
-                    author_id=row.author_id,
-                    genres=row.genres
+    async def update_book(self, session: AsyncSession, book_data: BookUpdate) -> BookResponse | None:
+        """
+        Apply a partial update in one statement: only the supplied fields are set, and a new
+        author is upserted inline. ON CONFLICT DO UPDATE (not DO NOTHING) makes the upsert return
+        the existing author's id and locks it against a concurrent orphan cleanup.
+        """
+        fields = book_data.model_dump(mode="json", exclude_unset=True, exclude_none=True, exclude={"id", "author"})
+        assignments = []
+        params = {"book_id": book_data.id}
+        if "title" in fields:
+            assignments.append("title = :title")
+            params["title"] = fields["title"]
+        if "published_year" in fields:
+            assignments.append("published_year = :published_year")
+            params["published_year"] = fields["published_year"]
+        if "genres" in fields:
+            assignments.append("genres = CAST(:genres AS genreenum[])")
+            params["genres"] = fields["genres"]
+
+        author_cte = ""
+        if book_data.author is not None:
+            author_cte = """
+                WITH author AS (
+                    INSERT INTO authors (id, name)
+                    VALUES (:author_id, :author_name)
+                    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+                    RETURNING id
                 )
-            return None
+            """
+            assignments.append("author_id = (SELECT id FROM author)")
+            params["author_id"] = uuid.uuid4()
+            params["author_name"] = book_data.author.name
 
-    async def update_book(self, book_data: BookUpdate) -> BookResponse | None:
-        old_book = await self.get_book(book_data.id)
-        if not old_book:
-            raise BookNotFound(book_id=book_data.id)
+        if not assignments:
+            book = await self.get_book(session, book_data.id)
+            if book is None:
+                raise BookNotFound(book_id=book_data.id)
+            return book
 
-        async with get_db() as session:
-            if book_data.author:
-                author = await self._author_repo.create_author(book_data.author)
-                author_id = author.id
-            else:
-                author_id = old_book.author_id
+        query = text(f"""
+            {author_cte}
+            UPDATE books
+            SET {", ".join(assignments)}
+            WHERE id = :book_id
+            RETURNING id, title, published_year, author_id, genres
+        """)
+        result = await session.execute(query, params)
+        row = result.first()
+        if row is None:
+            raise BookNotFound(book_id=book_data.id)
+        return BookResponse(
+            id=row.id,
+            title=row.title,
+            published_year=row.published_year,
+            author_id=row.author_id,
+            genres=row.genres
+        )
 
-            query = text("""
-                UPDATE books
-                SET title = :title, published_year = :year, author_id = :author_id, genres = :genres
+    async def delete_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
+        """
+        Delete the book and, if it was its author's last one, the author, in one statement.
+        All parts of the statement share one snapshot, so the deleted book is still visible
+        to the NOT EXISTS check and has to be excluded explicitly.
+        """
+        query = text("""
+            WITH deleted AS (
+                DELETE FROM books
                 WHERE id = :book_id
                 RETURNING id, title, published_year, author_id, genres
-            """)
-            result = await session.execute(query, {
-                "title": book_data.title or old_book.title,
-                "year": book_data.published_year or old_book.published_year,
-                "author_id": author_id,
-                "genres": book_data.genres or old_book.genres,
-                "book_id": book_data.id
-            })
-            await session.commit()
-            row = result.first()
-            if row:
-                return BookResponse(
-                    id=row.id,
-                    title=row.title,
-                    published_year=row.published_year,
-                    author_id=row.author_id,
-                    genres=row.genres
-                )
-            return None
-
-    async def delete_book(self, book_id: UUID) -> BookResponse | None:
-        book = await self.get_book(book_id)
-        if book is None:
+            ),
+            orphan AS (
+                DELETE FROM authors a
+                USING deleted d
+                WHERE a.id = d.author_id
+                    AND NOT EXISTS (
+                        SELECT 1 FROM books b WHERE b.author_id = d.author_id AND b.id <> d.id
+                    )
+                RETURNING a.id, a.name
+            )
+            SELECT d.id, d.title, d.published_year, d.author_id, d.genres, o.name AS deleted_author_name
+            FROM deleted d
+            LEFT JOIN orphan o ON o.id = d.author_id
+        """)
+        result = await session.execute(query, {"book_id": book_id})
+        row = result.first()
+        if row is None:
             raise BookNotFound(book_id)
+        if row.deleted_author_name is not None:
+            await self._author_repo.evict_author(session, row.author_id, row.deleted_author_name)
+        return BookResponse(
+            id=row.id,
+            title=row.title,
+            published_year=row.published_year,
+            author_id=row.author_id,
+            genres=row.genres
+        )
 
-        async with get_db() as session:
-            query = text("""
-                DELETE FROM books
-                WHERE id = :book_id
-                RETURNING id, title, published_year, author_id, genres
-            """)
-            result = await session.execute(query, {"book_id": book_id})
-            await session.commit()
-            row = result.first()
-            if row:
-                return BookResponse(
+    async def get_all_books(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        title: str | None = None,
+        author: str | None = None,
+        genres: list[str] | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookPage:
+        page = await self.get_book_rows(
+            session,
+            skip=skip,
+            limit=limit,
+            title=title,
+            author=author,
+            genres=genres,
+            year_from=year_from,
+            year_to=year_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
+        )
+        return BookPage(
+            items=[
+                BookResponse(
                     id=row.id,
                     title=row.title,
-                    published_year=row.published_year,
                     author_id=row.author_id,
+                    published_year=row.published_year,
                     genres=row.genres
                 )
-            return None
+                for row in page.rows
+            ],
+            next_cursor=page.next_cursor,
+            facets=page.facets,
+        )
 
-    async def get_all_books(
+    async def get_book_rows(
         self,
+        session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         title: str | None = None,
         author: str | None = None,
-        genre: str | None = None,
+        genres: list[str] | None = None,
         year_from: int | None = None,
         year_to: int | None = None,
         sort_by: str = "title",
-        sort_order: str = "asc"
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookRows:
+        query_text, params, sort_by, sort_order = build_book_list_query(
+            skip, limit, title, author, genres, genre_match, year_from, year_to, sort_by, sort_order, cursor
+        )
+
+        query = text(query_text)
+        result = await session.execute(query, params)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({
+                "sort_by": sort_by,
+                "sort_order": sort_order,
+                "value": getattr(last, SORT_ROW_FIELDS[sort_by]),
+                "id": str(last.id),
+            })
+
+        book_facets = None
+        if facets:
+            book_facets = await self._get_facets(session, title, author, genres, genre_match, year_from, year_to)
+
+        return BookRows(rows, next_cursor, book_facets)
+
+    async def _get_facets(
+        self,
+        session: AsyncSession,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> BookFacets:
+        """
+        Per-genre and per-decade counts for the whole filter (not just the page), in one statement.
+        """
+        filters, params = build_book_filters(title, author, genres, genre_match, year_from, year_to)
+        filtered_text = "SELECT b.genres, b.published_year FROM books b"
+        if author:
+            filtered_text += " JOIN authors a ON b.author_id = a.id"
+        if filters:
+            filtered_text += " WHERE " + " AND ".join(filters)
+
+        query = text(f"""
+            WITH filtered AS MATERIALIZED ({filtered_text})
+            SELECT 'genre' AS facet, CAST(g.genre AS text) AS value, count(*) AS count
+            FROM filtered f, unnest(f.genres) AS g(genre)
+            GROUP BY g.genre
+            UNION ALL
+            SELECT 'decade' AS facet, CAST(published_year / 10 * 10 AS text) AS value, count(*) AS count
+            FROM filtered
+            GROUP BY published_year / 10
+        """)
+        result = await session.execute(query, params)
+        rows = result.all()
+
+        genre_counts = [GenreFacet(genre=row.value, count=row.count) for row in rows if row.facet == "genre"]
+        decade_counts = [DecadeFacet(decade=int(row.value), count=row.count) for row in rows if row.facet == "decade"]
+        genre_counts.sort(key=lambda f: (-f.count, f.genre.value))
+        decade_counts.sort(key=lambda f: f.decade)
+        return BookFacets(genres=genre_counts, decades=decade_counts)
+
+    async def get_books(self, session: AsyncSession, book_ids: list[UUID]) -> list[BookResponse]:
+        """
+        Fetch several books in one query; unknown ids are skipped and order is not preserved.
+        """
+        if not book_ids:
+            return []
+        query = text("""
+            SELECT id, title, published_year, author_id, genres
+            FROM books
+            WHERE id = ANY(:book_ids)
+        """)
+        result = await session.execute(query, {"book_ids": list(book_ids)})
+        return [
+            BookResponse(
+                id=row.id,
+                title=row.title,
+                published_year=row.published_year,
+                author_id=row.author_id,
+                genres=row.genres
+            )
+            for row in result.all()
+        ]
+
+    async def get_books_by_author(self, session: AsyncSession, author_id: UUID) -> list[BookResponse]:
+        query = text("""
+            SELECT id, title, published_year, author_id, genres
+            FROM books
+            WHERE author_id = :author_id
+        """)
+        result = await session.execute(query, {"author_id": author_id})
+        rows = result.all()
+        return [
+            BookResponse(
+                id=row.id,
+                title=row.title,
+                published_year=row.published_year,
+                author_id=row.author_id,
+                genres=row.genres
+            )
+            for row in rows
+        ]
+
+    async def stream_books(
+        self,
+        session: AsyncSession,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> AsyncIterator[list]:
+        """
+        Yield the filtered books in batches of up to EXPORT_FETCH_SIZE rows read from a
+        server-side cursor, so memory does not grow with the size of the catalog.
+        Rows carry id, title, published_year, author_id, author_name and genres.
+        """
+        filters, params = build_book_filters(title, author, genres, genre_match, year_from, year_to)
+        query_text = """
+            SELECT b.id, b.title, b.published_year, a.id AS author_id, a.name AS author_name, b.genres
+            FROM books b
+            JOIN authors a ON b.author_id = a.id
+        """
+        if filters:
+            query_text += " WHERE " + " AND ".join(filters)
+        # Walks ix_books_title_id, so rows come out without a sort step.
+        query_text += ' ORDER BY b.title COLLATE "C", b.id'
+
+        result = await session.stream(
+            text(query_text), params, execution_options={"yield_per": settings.EXPORT_FETCH_SIZE}
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def bulk_create_books(
+        self,
+        session: AsyncSession,
+        titles: list[str],
+        published_years: list[int],
+        author_names: list[str],
+        genres: list[list[str]],
+        book_ids: list[UUID] | None = None,
     ) -> list[BookResponse]:
-        async with get_db() as session:
-            query_text = """
-                SELECT b.id, b.title, b.published_year, a.id AS author_id, a.name AS author_name, b.genres
-                FROM books b
-                JOIN authors a ON b.author_id = a.id
-            """
+        if book_ids is None:
+            book_ids = [uuid.uuid4() for _ in titles]
+        author_ids = await self._author_repo.resolve_author_ids(session, author_names)
+        created, skipped = await self._insert_books(
+            session, book_ids, titles, published_years, author_names, genres, author_ids
+        )
+        if skipped:
+            # Rows whose remembered author was deleted meanwhile; resolve those authors again.
+            retry_names = [author_names[i] for i in skipped]
+            author_ids = await self._author_repo.resolve_author_ids(session, retry_names, refresh=True)
+            retried, _ = await self._insert_books(
+                session,
+                [book_ids[i] for i in skipped],
+                [titles[i] for i in skipped],
+                [published_years[i] for i in skipped],
+                retry_names,
+                [genres[i] for i in skipped],
+                author_ids,
+            )
+            created.extend(retried)
+        return created
 
-            filters = []
-            params = {}
-
-            if title:
-                filters.append("b.title ILIKE :title")
-                params["title"] = f"%{title}%"
-            if author:
-                filters.append("a.name ILIKE :author")
-                params["author"] = f"%{author}%"
-            if genre:
-                if genre not in [g.value for g in GenreEnum]:
-                    raise ValueError(f"Invalid genre: {genre}")
-                filters.append(":genre = ANY(b.genres)")
-                params["genre"] = genre
-            if year_from:
-                filters.append("b.published_year >= :year_from")
-                params["year_from"] = year_from
-            if year_to:
-                filters.append("b.published_year <= :year_to")
-                params["year_to"] = year_to
-
-            if filters:
-                query_text += " WHERE " + " AND ".join(filters)
-
-            if sort_by not in {"title", "author", "published_year"}:
-                sort_by = "title"
-            if sort_order.lower() not in {"asc", "desc"}:
-                sort_order = "asc"
-            query_text += f" ORDER BY {sort_by} {sort_order.upper()}"
-
-            query_text += " OFFSET :skip LIMIT :limit"
-            params.update({"skip": skip, "limit": limit})
-
-            query = text(query_text)
-            result = await session.execute(query, params)
-            rows = result.all()
+    async def _insert_books(
+        self,
+        session: AsyncSession,
+        book_ids: list[UUID],
+        titles: list[str],
+        published_years: list[int],
+        author_names: list[str],
+        genres: list[list[str]],
+        author_ids: dict[str, UUID],
+    ) -> tuple[list[BookResponse], list[int]]:
+        """
+        Insert in batches, joining authors so rows whose author no longer exists are skipped
+        rather than aborting the transaction. Returns the created books and the skipped positions.
+        """
+        query = text("""
+            INSERT INTO books (id, title, published_year, author_id, genres)
+            SELECT t.id, t.title, t.published_year, a.id, CAST(t.genres AS genreenum[])
+            FROM unnest(
+                CAST(:ids AS uuid[]),
+                CAST(:titles AS varchar[]),
+                CAST(:years AS int[]),
+                CAST(:author_ids AS uuid[]),
+                CAST(:genres AS text[])
+            ) AS t(id, title, published_year, author_id, genres)
+            JOIN authors a ON a.id = t.author_id
+            RETURNING id, title, published_year, author_id, genres
+        """)
 
-            return [
-                BookResponse(
-                    id=row.id,
-                    title=row.title,
-                    author_id=row.author_id,
-                    published_year=row.published_year,
-                    genres=row.genres
-                )
-                for row in rows
-            ]
-
-    async def get_books_by_author(self, author_id: UUID) -> list[BookResponse]:
-        async with get_db() as session:
-            query = text("""
-                SELECT id, title, published_year, author_id, genres
-                FROM books
-                WHERE author_id = :author_id
-            """)
-            result = await session.execute(query, {"author_id": author_id})
+        created = []
+        skipped = []
+        batch_size = settings.CSV_IMPORT_BATCH_SIZE
+        for start in range(0, len(titles), batch_size):
+            end = start + batch_size
+            ids = book_ids[start:end]
+            result = await session.execute(query, {
+                "ids": ids,
+                "titles": titles[start:end],
+                "years": published_years[start:end],
+                "author_ids": [author_ids[name] for name in author_names[start:end]],
+                # genreenum[] literals, e.g. {"Fiction","Science Fiction"}; enum values contain no quotes.
+                "genres": ["{" + ",".join(f'"{g}"' for g in book_genres) + "}" for book_genres in genres[start:end]],
+            })
             rows = result.all()
-            return [
+            created.extend(
                 BookResponse(
                     id=row.id,
                     title=row.title,
@@ -239,4 +669,202 @@ class BookRepositoryImpl(BookRepository):
                     genres=row.genres
                 )
                 for row in rows
-            ]
+            )
+            if len(rows) < len(ids):
+                inserted = {row.id for row in rows}
+                skipped.extend(start + i for i, book_id in enumerate(ids) if book_id not in inserted)
+        return created, skipped
+
+    async def search_books(self, session: AsyncSession, query: str, limit: int) -> list[BookSearchHit]:
+        """
+        Rank books whose title or author matches the full-text query or is similar to it.
+        Each branch of the candidate UNION is served by the GIN indexes of a single table.
+        """
+        sql = text("""
+            WITH q AS (
+                SELECT websearch_to_tsquery('simple', :q) AS tsq
+            ),
+            candidates AS (
+                SELECT b.id
+                FROM books b, q
+                WHERE b.search_vector @@ q.tsq OR b.title % :q
+                UNION
+                SELECT b.id
+                FROM authors a
+                JOIN books b ON b.author_id = a.id, q
+                WHERE a.search_vector @@ q.tsq OR a.name % :q
+            )
+            SELECT b.id, b.title, b.published_year, b.author_id, b.genres,
+                   ts_rank(b.search_vector, q.tsq) + ts_rank(a.search_vector, q.tsq)
+                   + GREATEST(similarity(b.title, :q), similarity(a.name, :q)) AS score
+            FROM candidates c
+            JOIN books b ON b.id = c.id
+            JOIN authors a ON a.id = b.author_id, q
+            ORDER BY score DESC, b.id
+            LIMIT :limit
+        """)
+        result = await session.execute(sql, {"q": query, "limit": limit})
+        return [
+            BookSearchHit(
+                id=row.id,
+                title=row.title,
+                published_year=row.published_year,
+                author_id=row.author_id,
+                genres=row.genres,
+                score=row.score,
+            )
+            for row in result.all()
+        ]
+
+
+class CachedBookRepository(BookRepository):
+    """
+    Read-through cache for get_book in front of another BookRepository.
+    Writes through this repository invalidate the affected entry; entries live at most
+    CACHE_TTL_SECONDS, which bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, inner: BookRepository) -> None:
+        self._inner = inner
+        self._cache = LRUCache("books", settings.BOOK_CACHE_SIZE, settings.CACHE_TTL_SECONDS)
+
+    async def get_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
+        book = self._cache.get(book_id)
+        if book is not None:
+            return book
+        generation = self._cache.generation
+        book = await self._inner.get_book(session, book_id)
+        if book is not None:
+            # The row may have been written by this request's own transaction; cache it only once that commits.
+            after_commit(session, lambda: self._cache.set(book_id, book, generation=generation))
+        return book
+
+    async def create_book(self, session: AsyncSession, book: BookCreate) -> BookResponse:
+        return await self._inner.create_book(session, book)
+
+    async def update_book(self, session: AsyncSession, book: BookUpdate) -> BookResponse | None:
+        # Invalidate now and again at commit so a read racing with the transaction cannot re-cache the old row.
+        self._cache.invalidate(book.id)
+        after_commit(session, lambda: self._cache.invalidate(book.id))
+        return await self._inner.update_book(session, book)
+
+    async def delete_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
+        self._cache.invalidate(book_id)
+        after_commit(session, lambda: self._cache.invalidate(book_id))
+        return await self._inner.delete_book(session, book_id)
+
+    async def get_all_books(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        title: str | None = None,
+        author: str | None = None,
+        genres: list[str] | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookPage:
+        return await self._inner.get_all_books(
+            session,
+            skip=skip,
+            limit=limit,
+            title=title,
+            author=author,
+            genres=genres,
+            year_from=year_from,
+            year_to=year_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
+        )
+
+    async def get_book_rows(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        title: str | None = None,
+        author: str | None = None,
+        genres: list[str] | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookRows:
+        return await self._inner.get_book_rows(
+            session,
+            skip=skip,
+            limit=limit,
+            title=title,
+            author=author,
+            genres=genres,
+            year_from=year_from,
+            year_to=year_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
+        )
+
+    async def get_books(self, session: AsyncSession, book_ids: list[UUID]) -> list[BookResponse]:
+        found = {}
+        missing = []
+        for book_id in dict.fromkeys(book_ids):
+            book = self._cache.get(book_id)
+            if book is not None:
+                found[book_id] = book
+            else:
+                missing.append(book_id)
+        if missing:
+            generation = self._cache.generation
+            loaded = await self._inner.get_books(session, missing)
+
+            def remember() -> None:
+                for book in loaded:
+                    self._cache.set(book.id, book, generation=generation)
+
+            after_commit(session, remember)
+            found.update((book.id, book) for book in loaded)
+        return list(found.values())
+
+    async def get_books_by_author(self, session: AsyncSession, author_id: UUID) -> list[BookResponse]:
+        return await self._inner.get_books_by_author(session, author_id)
+
+    def stream_books(
+        self,
+        session: AsyncSession,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> AsyncIterator[list]:
+        return self._inner.stream_books(session, title, author, genres, genre_match, year_from, year_to)
+
+    async def bulk_create_books(
+        self,
+        session: AsyncSession,
+        titles: list[str],
+        published_years: list[int],
+        author_names: list[str],
+        genres: list[list[str]],
+        book_ids: list[UUID] | None = None,
+    ) -> list[BookResponse]:
+        return await self._inner.bulk_create_books(
+            session, titles, published_years, author_names, genres, book_ids
+        )
+
+    async def search_books(self, session: AsyncSession, query: str, limit: int) -> list[BookSearchHit]:
+        return await self._inner.search_books(session, query, limit)
@@ -0,0 +1,110 @@
+from abc import ABC
+from typing import Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import after_commit
+from app.schemas.book import DecadeFacet, GenreFacet
+from app.schemas.catalog import AuthorCount, CatalogStats
+
+
+class CatalogRepository(ABC):
+    async def get_version(self, session: AsyncSession) -> int:
+        raise NotImplementedError()
+
+    def on_commit(self, session: AsyncSession, callback: Callable[[int, int], None]) -> None:
+        raise NotImplementedError()
+
+    async def get_stats(self, session: AsyncSession, top_authors: int) -> CatalogStats:
+        raise NotImplementedError()
+
+    async def recompute_stats(self, session: AsyncSession) -> None:
+        raise NotImplementedError()
+
+
+class CatalogRepositoryImpl(CatalogRepository):
+    async def get_version(self, session: AsyncSession) -> int:
+        """
+        Current catalog version; bumped by triggers on every committed write to books or authors.
+        """
+        result = await session.execute(text("SELECT version FROM catalog_version"))
+        return result.scalar_one()
+
+    def on_commit(self, session: AsyncSession, callback: Callable[[int, int], None]) -> None:
+        """
+        Call callback(before, after) once the session's catalog write commits, with the versions
+        just before and after its own bump. The transaction's catalog changes are then applied
+        right before it commits (see _apply_catalog_changes) instead of by the deferred triggers,
+        which would not report the version.
+        """
+        pending = session.info.setdefault("catalog_commit", {})
+        after_commit(session, lambda: callback(pending["version"] - 1, pending["version"]))
+
+    async def get_stats(self, session: AsyncSession, top_authors: int) -> CatalogStats:
+        """
+        Catalog-wide counts from catalog_stats, which triggers keep current. Reads a bounded number
+        of rows (ten genres, a few dozen decades, top_authors via the book_count index) whatever
+        the size of the catalog.
+        """
+        result = await session.execute(text("""
+            SELECT dimension, key, book_count
+            FROM catalog_stats
+            WHERE dimension IN ('total', 'genre', 'decade') AND book_count > 0
+        """))
+        total = 0
+        genres = []
+        decades = []
+        for row in result:
+            if row.dimension == "total":
+                total = row.book_count
+            elif row.dimension == "genre":
+                genres.append(GenreFacet(genre=row.key, count=row.book_count))
+            else:
+                decades.append(DecadeFacet(decade=int(row.key), count=row.book_count))
+        genres.sort(key=lambda f: -f.count)
+        decades.sort(key=lambda f: f.decade)
+
+        result = await session.execute(text("""
+            SELECT a.id, a.name, s.book_count
+            FROM catalog_stats s
+            JOIN authors a ON a.id = CAST(s.key AS uuid)
+            WHERE s.dimension = 'author' AND s.book_count > 0
+            ORDER BY s.book_count DESC, s.key
+            LIMIT :limit
+        """), {"limit": top_authors})
+        authors = [AuthorCount(author_id=row.id, name=row.name, count=row.book_count) for row in result]
+
+        return CatalogStats(total_books=total, genres=genres, decades=decades, top_authors=authors)
+
+    async def recompute_stats(self, session: AsyncSession) -> None:
+        """
+        Rebuild catalog_stats from books, for repair. Book writes wait until the transaction ends;
+        reads do not. Bumps the catalog version so ETags of the unrepaired counts stop matching.
+        """
+        # Books first: writers only lock catalog_version at commit, after their own book row locks.
+        await session.execute(text("LOCK TABLE books IN SHARE MODE"))
+        await session.execute(text("DELETE FROM catalog_stats"))
+        await session.execute(text("""
+            INSERT INTO catalog_stats (dimension, key, book_count)
+            SELECT 'total', '', count(*) FROM books
+            UNION ALL
+            SELECT k.dimension, k.key, count(*)
+            FROM books AS b, book_stats_keys(b.published_year, b.author_id, b.genres) AS k
+            WHERE k.dimension <> 'total'
+            GROUP BY k.dimension, k.key
+        """))
+        await session.execute(text("UPDATE catalog_version SET version = version + 1"))
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_catalog_changes(session: Session) -> None:
+    pending = session.info.pop("catalog_commit", None)
+    if pending is not None:
+        pending["version"] = session.execute(text("SELECT apply_catalog_changes()")).scalar_one()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session: Session) -> None:
+    session.info.pop("catalog_commit", None)
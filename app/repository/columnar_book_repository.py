@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.db.session import get_db
+from app.reposytory.book_repository import BookRepository, BookRows, SORT_ROW_FIELDS, build_book_list_query
+from app.reposytory.catalog_repository import CatalogRepository
+from app.reposytory.columnar_catalog import CatalogRow, CatalogSnapshot
+from app.schemas.book import BookCreate, BookResponse, BookUpdate, BookPage
+from app.schemas.search import BookSearchHit
+
+logger = logging.getLogger(__name__)
+
+# (version before, version after, upserted rows, deleted ids) of one committed write.
+Change = tuple[int, int, list[CatalogRow], list[UUID]]
+
+
+def _row(book: BookResponse, author_name: str | None) -> CatalogRow:
+    return CatalogRow(
+        book.id, book.title, book.published_year, book.author_id, author_name, [g.value for g in book.genres]
+    )
+
+
+def _apply(snapshot: CatalogSnapshot, change: Change) -> None:
+    before, after, upserts, deletes = change
+    for book_id in deletes:
+        snapshot.delete(book_id)
+    known = [snapshot.upsert(row) for row in upserts]
+    if not all(known):
+        # An author the snapshot has never seen; reload rather than guess its name.
+        snapshot.version = -1
+    elif snapshot.version == before:
+        snapshot.version = after
+
+
+class ColumnarBookRepository(BookRepository):
+    """
+    Answers list queries from an in-process CatalogSnapshot in front of another BookRepository,
+    which stays the system of record and serves everything else.
+
+    Writes go through the inner repository and are applied to the snapshot once they commit.
+    The commit reports the catalog versions just before and after its own bump (CatalogRepository.on_commit),
+    which tell whether the snapshot is still exactly one write behind; if so its version moves
+    forward with the write. A list query that sees a newer catalog version than the snapshot's
+    (a write by another process) is answered by the inner repository while the snapshot is
+    reloaded in the background, at most once per COLUMNAR_RELOAD_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, inner: BookRepository, catalog_repo: CatalogRepository):
+        self._inner = inner
+        self._catalog_repo = catalog_repo
+        self._snapshot: CatalogSnapshot | None = None
+        # Changes committed while a rebuild runs, replayed onto its result.
+        self._journal: list[Change] | None = None
+        self._rebuild: asyncio.Task | None = None
+        self._last_reload = float("-inf")
+
+    async def get_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
+        return await self._inner.get_book(session, book_id)
+
+    async def create_book(self, session: AsyncSession, book: BookCreate) -> BookResponse:
+        upserts, _ = self._apply_on_commit(session)
+        created = await self._inner.create_book(session, book)
+        upserts.append(_row(created, book.author.name))
+        return created
+
+    async def update_book(self, session: AsyncSession, book: BookUpdate) -> BookResponse | None:
+        upserts, _ = self._apply_on_commit(session)
+        updated = await self._inner.update_book(session, book)
+        author_name = book.author.name if book.author is not None else None
+        upserts.append(_row(updated, author_name))
+        return updated
+
+    async def delete_book(self, session: AsyncSession, book_id: UUID) -> BookResponse | None:
+        _, deletes = self._apply_on_commit(session)
+        deleted = await self._inner.delete_book(session, book_id)
+        deletes.append(book_id)
+        return deleted
+
+    async def bulk_create_books(
+        self,
+        session: AsyncSession,
+        titles: list[str],
+        published_years: list[int],
+        author_names: list[str],
+        genres: list[list[str]],
+        book_ids: list[UUID] | None = None,
+    ) -> list[BookResponse]:
+        if book_ids is None:
+            book_ids = [uuid.uuid4() for _ in titles]
+        upserts, _ = self._apply_on_commit(session)
+        created = await self._inner.bulk_create_books(
+            session, titles, published_years, author_names, genres, book_ids
+        )
+        names = dict(zip(book_ids, author_names))
+        upserts.extend(_row(book, names[book.id]) for book in created)
+        return created
+
+    def _apply_on_commit(self, session: AsyncSession) -> tuple[list[CatalogRow], list[UUID]]:
+        """
+        Lists for the write about to run to fill with its upserted rows and deleted ids;
+        applied to the snapshot once the transaction commits.
+        """
+        upserts: list[CatalogRow] = []
+        deletes: list[UUID] = []
+        self._catalog_repo.on_commit(
+            session, lambda before, after: self._apply((before, after, upserts, deletes))
+        )
+        return upserts, deletes
+
+    def _apply(self, change: Change) -> None:
+        if self._journal is not None:
+            self._journal.append(change)
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        _apply(snapshot, change)
+        if snapshot.needs_compaction(settings.COLUMNAR_TAIL_MAX):
+            self._start_rebuild(self._compact)
+
+    async def get_all_books(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        title: str | None = None,
+        author: str | None = None,
+        genres: list[str] | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookPage:
+        page = await self.get_book_rows(
+            session,
+            skip=skip,
+            limit=limit,
+            title=title,
+            author=author,
+            genres=genres,
+            year_from=year_from,
+            year_to=year_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
+        )
+        return BookPage(
+            items=[
+                BookResponse(
+                    id=row.id,
+                    title=row.title,
+                    author_id=row.author_id,
+                    published_year=row.published_year,
+                    genres=row.genres
+                )
+                for row in page.rows
+            ],
+            next_cursor=page.next_cursor,
+            facets=page.facets,
+        )
+
+    async def get_book_rows(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        title: str | None = None,
+        author: str | None = None,
+        genres: list[str] | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookRows:
+        # Validates and normalizes the parameters exactly as the SQL path does; the query itself is unused.
+        _, params, sort_by, sort_order = build_book_list_query(
+            skip, limit, title, author, genres, genre_match, year_from, year_to, sort_by, sort_order, cursor
+        )
+        snapshot = self._snapshot
+        version = await self._catalog_repo.get_version(session)
+        if snapshot is None or snapshot.version < version:
+            self._reload_if_due()
+            return await self._inner.get_book_rows(
+                session,
+                skip=skip,
+                limit=limit,
+                title=title,
+                author=author,
+                genres=genres,
+                year_from=year_from,
+                year_to=year_to,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                cursor=cursor,
+                genre_match=genre_match,
+                facets=facets,
+            )
+
+        position = (params["cursor_value"], params["cursor_id"]) if cursor else None
+        rows = snapshot.page(
+            skip, limit, title, author, genres, genre_match, year_from, year_to, sort_by, sort_order, position
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({
+                "sort_by": sort_by,
+                "sort_order": sort_order,
+                "value": getattr(last, SORT_ROW_FIELDS[sort_by]),
+                "id": str(last.id),
+            })
+
+        book_facets = None
+        if facets:
+            book_facets = snapshot.facets(title, author, genres, genre_match, year_from, year_to)
+
+        return BookRows(rows, next_cursor, book_facets)
+
+    def _reload_if_due(self) -> None:
+        now = time.monotonic()
+        if self._rebuild is None and now - self._last_reload >= settings.COLUMNAR_RELOAD_INTERVAL_SECONDS:
+            self._last_reload = now
+            self._start_rebuild(self._load)
+
+    def _start_rebuild(self, source: Callable[[], Awaitable[tuple[int, list]]]) -> None:
+        if self._rebuild is None:
+            self._journal = []
+            self._rebuild = asyncio.create_task(self._run_rebuild(source))
+
+    async def _run_rebuild(self, source: Callable[[], Awaitable[tuple[int, list]]]) -> None:
+        try:
+            version, rows = await source()
+            snapshot = await asyncio.to_thread(CatalogSnapshot, rows, version)
+            for change in self._journal:
+                _apply(snapshot, change)
+            self._snapshot = snapshot
+        except Exception:
+            logger.exception("Rebuilding the columnar catalog failed")
+        finally:
+            self._journal = None
+            self._rebuild = None
+
+    async def _load(self) -> tuple[int, list]:
+        # The version is read first: rows newer than it only make the snapshot look older than it is.
+        async with get_db() as session:
+            version = await self._catalog_repo.get_version(session)
+            rows = []
+            async for batch in self._inner.stream_books(session, None, None, None, "any", None, None):
+                rows.extend(batch)
+        return version, rows
+
+    async def _compact(self) -> tuple[int, list]:
+        snapshot = self._snapshot
+        return snapshot.version, snapshot.rows()
+
+    async def get_books(self, session: AsyncSession, book_ids: list[UUID]) -> list[BookResponse]:
+        return await self._inner.get_books(session, book_ids)
+
+    async def get_books_by_author(self, session: AsyncSession, author_id: UUID) -> list[BookResponse]:
+        return await self._inner.get_books_by_author(session, author_id)
+
+    def stream_books(
+        self,
+        session: AsyncSession,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> AsyncIterator[list]:
+        return self._inner.stream_books(session, title, author, genres, genre_match, year_from, year_to)
+
+    async def search_books(self, session: AsyncSession, query: str, limit: int) -> list[BookSearchHit]:
+        return await self._inner.search_books(session, query, limit)
@@ -0,0 +1,388 @@
+import heapq
+import itertools
+import re
+from typing import Iterable, NamedTuple
+from uuid import UUID
+
+import numpy as np
+
+from app.schemas.book import BookFacets, GenreFacet, DecadeFacet
+from app.schemas.enums import GenreEnum
+
+GENRE_BITS = {g.value: 1 << i for i, g in enumerate(GenreEnum)}
+assert len(GENRE_BITS) <= 16, "genre bitmasks are stored as uint16"
+
+SORT_FIELDS = {"title": "title", "author": "author_name", "published_year": "published_year"}
+
+
+class CatalogRow(NamedTuple):
+    id: UUID
+    title: str
+    published_year: int
+    author_id: UUID
+    author_name: str | None
+    genres: list[str]
+
+
+# Row i says which genres the bitmask i contains.
+_GENRE_SET_TABLE = ((np.arange(1 << len(GENRE_BITS))[:, None] >> np.arange(len(GENRE_BITS))) & 1).astype(np.int64)
+
+
+def _first_hits(candidates: np.ndarray, mask: np.ndarray, count: int) -> np.ndarray:
+    """
+    The first `count` candidates whose mask is set, scanning in growing chunks so a page near
+    the start of the order does not pay for gathering the whole mask.
+    """
+    found = []
+    total = 0
+    start = 0
+    chunk = 1024
+    while start < len(candidates) and total < count:
+        part = candidates[start:start + chunk]
+        part = part[mask[part]]
+        found.append(part)
+        total += len(part)
+        start += chunk
+        chunk *= 4
+    return np.concatenate(found) if found else candidates[:0]
+
+
+def _object_array(values: list) -> np.ndarray:
+    # Filled element by element so lists (genres) stay single objects instead of becoming a 2-D array.
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+def genre_mask(genres: Iterable[str]) -> int:
+    mask = 0
+    for genre in genres:
+        mask |= GENRE_BITS[getattr(genre, "value", genre)]
+    return mask
+
+
+def like_pattern(fragment: str) -> re.Pattern | None:
+    """
+    Regex equivalent of ILIKE '%fragment%' over lower-cased text, honouring the % and _ wildcards
+    and backslash escapes. Never crosses the NUL that separates rows. None means "matches everything".
+    """
+    parts = []
+    escaped = False
+    for char in fragment.lower():
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "%":
+            parts.append("[^\x00]*")
+        elif char == "_":
+            parts.append("[^\x00]")
+        else:
+            parts.append(re.escape(char))
+    if all(part == "[^\x00]*" for part in parts):
+        return None
+    return re.compile("".join(parts))
+
+
+class _TextIndex:
+    """
+    All values joined into one NUL-separated string, so a substring search is one regex scan
+    instead of a Python loop over rows. The values never change, so recent results are kept:
+    paging through a filtered list scans only once.
+    """
+
+    CACHED_PATTERNS = 64
+
+    def __init__(self, texts: list[str]):
+        lowered = [text.lower() for text in texts]
+        self._blob = "\x00".join(lowered)
+        lengths = np.fromiter((len(text) + 1 for text in lowered), dtype=np.int64, count=len(lowered))
+        self._starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        self._size = len(lowered)
+        self._recent: dict[re.Pattern, np.ndarray] = {}
+
+    def matches(self, pattern: re.Pattern) -> np.ndarray:
+        """
+        Read-only mask of the values the pattern matches.
+        """
+        mask = self._recent.get(pattern)
+        if mask is not None:
+            return mask
+        mask = np.zeros(self._size, dtype=bool)
+        positions = np.fromiter((m.start() for m in pattern.finditer(self._blob)), dtype=np.int64)
+        if len(positions):
+            mask[np.searchsorted(self._starts, positions, side="right") - 1] = True
+        mask.flags.writeable = False
+        if len(self._recent) >= self.CACHED_PATTERNS:
+            del self._recent[next(iter(self._recent))]
+        self._recent[pattern] = mask
+        return mask
+
+
+class CatalogSnapshot:
+    """
+    Column-wise copy of the catalog for answering list queries with vectorized filters.
+
+    Books are stored as parallel NumPy arrays (years, author codes, uint16 genre bitmasks) with one
+    presorted permutation per sort_by, ordered by (value, id) like the SQL ORDER BY. Strings compare
+    by code point, as under COLLATE "C". Changes after the build are applied incrementally: deletes
+    and sort-key changes tombstone the row, and new or moved rows go to a small unsorted tail that is
+    merged into each result; the owner rebuilds the snapshot once needs_compaction() says so.
+    """
+
+    def __init__(self, rows: Iterable, version: int):
+        rows = list(rows)
+        self.version = version
+        count = len(rows)
+
+        self._author_index: dict[UUID, int] = {}
+        author_ids, author_names, codes = [], [], []
+        for row in rows:
+            code = self._author_index.get(row[3])
+            if code is None:
+                code = self._author_index[row[3]] = len(author_ids)
+                author_ids.append(row[3])
+                author_names.append(row[4])
+            codes.append(code)
+        self.author_ids = _object_array(author_ids)
+        self.author_names = _object_array(author_names)
+        self._author_text = _TextIndex(author_names)
+
+        self.ids = _object_array([row[0] for row in rows])
+        self.titles = _object_array([row[1] for row in rows])
+        self.years = np.fromiter((row[2] for row in rows), dtype=np.int32, count=count)
+        self.author_codes = np.array(codes, dtype=np.int32)
+        self.genres = _object_array([list(row[5]) for row in rows])
+        self.genre_bits = np.fromiter((genre_mask(row[5]) for row in rows), dtype=np.uint16, count=count)
+        self._title_text = _TextIndex([row[1] for row in rows])
+
+        self.live = np.ones(count, dtype=bool)
+        self.dead = 0
+        self._index = {book_id: i for i, book_id in enumerate(self.ids)}
+        self._tail: dict[UUID, CatalogRow] = {}
+
+        # Sort by integer ranks rather than the objects themselves. Ids rank by their bytes, which
+        # order like Postgres uuids; the per-order id column is kept as bytes for cursor lookups.
+        id_keys = _object_array([row[0].bytes for row in rows])
+        id_rank = np.empty(count, dtype=np.int64)
+        id_rank[np.argsort(id_keys)] = np.arange(count)
+        # Strings rank in code point order, as the SQL path sorts them (COLLATE "C").
+        title_rank = np.unique(self.titles, return_inverse=True)[1].reshape(-1)
+        author_rank = np.unique(self.author_names, return_inverse=True)[1].reshape(-1)
+
+        self._orders = {}
+        for sort_by, rank, values in (
+            ("title", title_rank, self.titles),
+            ("author", author_rank[self.author_codes], self.author_names[self.author_codes]),
+            ("published_year", self.years, self.years),
+        ):
+            order = np.lexsort((id_rank, rank))
+            self._orders[sort_by] = (order, values[order], id_keys[order])
+
+    def __len__(self) -> int:
+        return len(self.ids) - self.dead + len(self._tail)
+
+    def needs_compaction(self, tail_max: int) -> bool:
+        return len(self._tail) > tail_max or self.dead > max(tail_max, len(self.ids) // 4)
+
+    def _row(self, i: int) -> CatalogRow:
+        code = self.author_codes[i]
+        return CatalogRow(
+            self.ids[i], self.titles[i], int(self.years[i]), self.author_ids[code], self.author_names[code], self.genres[i]
+        )
+
+    def rows(self) -> list[CatalogRow]:
+        return [self._row(i) for i in np.flatnonzero(self.live)] + list(self._tail.values())
+
+    def author_name(self, author_id: UUID) -> str | None:
+        code = self._author_index.get(author_id)
+        if code is not None:
+            return self.author_names[code]
+        for row in self._tail.values():
+            if row.author_id == author_id:
+                return row.author_name
+        return None
+
+    def upsert(self, row: CatalogRow) -> bool:
+        """
+        Insert or replace a book. Returns False if its author_name is None and not known here.
+        """
+        if row.author_name is None:
+            name = self.author_name(row.author_id)
+            if name is None:
+                return False
+            row = row._replace(author_name=name)
+
+        i = self._index.get(row.id)
+        if i is not None:
+            code = self.author_codes[i]
+            if (
+                self.titles[i] == row.title
+                and self.years[i] == row.published_year
+                and self.author_ids[code] == row.author_id
+            ):
+                # Sort keys unchanged: update in place and keep the row's position.
+                self.genres[i] = list(row.genres)
+                self.genre_bits[i] = genre_mask(row.genres)
+                return True
+            self._kill(i)
+        self._tail[row.id] = row._replace(genres=list(row.genres))
+        return True
+
+    def delete(self, book_id: UUID) -> None:
+        i = self._index.get(book_id)
+        if i is not None:
+            self._kill(i)
+        self._tail.pop(book_id, None)
+
+    def _kill(self, i: int) -> None:
+        self.live[i] = False
+        self.dead += 1
+        del self._index[self.ids[i]]
+
+    def _mask(self, title_pattern, author_pattern, genres, genre_match, year_from, year_to) -> np.ndarray | None:
+        """
+        Boolean mask of live base rows matching the filter, or None when every row matches.
+        """
+        mask = self.live if self.dead else None
+
+        def narrow(condition: np.ndarray) -> None:
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if title_pattern is not None:
+            narrow(self._title_text.matches(title_pattern))
+        if author_pattern is not None:
+            narrow(self._author_text.matches(author_pattern)[self.author_codes])
+        if genres:
+            wanted = np.uint16(genre_mask(genres))
+            hit = self.genre_bits & wanted
+            narrow(hit == wanted if genre_match == "all" else hit != 0)
+        if year_from:
+            narrow(self.years >= year_from)
+        if year_to:
+            narrow(self.years <= year_to)
+        return mask
+
+    @staticmethod
+    def _tail_matches(row: CatalogRow, title_pattern, author_pattern, genres, genre_match, year_from, year_to) -> bool:
+        if title_pattern is not None and not title_pattern.search(row.title.lower()):
+            return False
+        if author_pattern is not None and not author_pattern.search(row.author_name.lower()):
+            return False
+        if genres:
+            wanted = genre_mask(genres)
+            hit = genre_mask(row.genres) & wanted
+            if not (hit == wanted if genre_match == "all" else hit):
+                return False
+        if year_from and row.published_year < year_from:
+            return False
+        if year_to and row.published_year > year_to:
+            return False
+        return True
+
+    def page(
+        self,
+        skip: int,
+        limit: int,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+        sort_by: str,
+        sort_order: str,
+        cursor: tuple | None = None,
+    ) -> list[CatalogRow]:
+        """
+        Up to limit + 1 matching rows in sort order, after `skip` rows or after the (value, id) cursor.
+        sort_by, sort_order and the filters must already be validated.
+        """
+        filters = (
+            like_pattern(title) if title else None,
+            like_pattern(author) if author else None,
+            genres,
+            genre_match,
+            year_from,
+            year_to,
+        )
+        descending = sort_order == "desc"
+        order, values, ids = self._orders[sort_by]
+
+        if cursor is not None:
+            value, book_id = cursor
+            low = np.searchsorted(values, value, side="left")
+            high = np.searchsorted(values, value, side="right")
+            if descending:
+                end = low + np.searchsorted(ids[low:high], book_id.bytes, side="left")
+                candidates = order[:end][::-1]
+            else:
+                start = low + np.searchsorted(ids[low:high], book_id.bytes, side="right")
+                candidates = order[start:]
+            skip = 0
+        else:
+            candidates = order[::-1] if descending else order
+
+        mask = self._mask(*filters)
+        wanted = skip + limit + 1
+        hits = candidates if mask is None else _first_hits(candidates, mask, wanted)
+        if not self._tail:
+            return [self._row(i) for i in hits[skip:wanted]]
+
+        field = SORT_FIELDS[sort_by]
+
+        def key(row: CatalogRow) -> tuple:
+            return getattr(row, field), row.id
+
+        tail = [row for row in self._tail.values() if self._tail_matches(row, *filters)]
+        if cursor is not None:
+            tail = [row for row in tail if (key(row) < cursor if descending else key(row) > cursor)]
+        tail.sort(key=key, reverse=descending)
+        base = [self._row(i) for i in hits[:wanted]]
+        merged = heapq.merge(base, tail[:wanted], key=key, reverse=descending)
+        return list(itertools.islice(merged, skip, wanted))
+
+    def facets(
+        self,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> BookFacets:
+        filters = (
+            like_pattern(title) if title else None,
+            like_pattern(author) if author else None,
+            genres,
+            genre_match,
+            year_from,
+            year_to,
+        )
+        mask = self._mask(*filters)
+        bits = self.genre_bits if mask is None else self.genre_bits[mask]
+        years = self.years if mask is None else self.years[mask]
+
+        # Count each distinct genre set once, then add its count to every genre in it.
+        per_set = np.bincount(bits, minlength=len(_GENRE_SET_TABLE))
+        genre_counts = dict(zip(GENRE_BITS, (per_set @ _GENRE_SET_TABLE).tolist()))
+        per_decade = np.bincount(years // 10)
+        decade_counts = {int(d) * 10: int(per_decade[d]) for d in np.flatnonzero(per_decade)}
+        for row in self._tail.values():
+            if self._tail_matches(row, *filters):
+                for genre in set(row.genres):
+                    genre_counts[genre] += 1
+                decade = row.published_year // 10 * 10
+                decade_counts[decade] = decade_counts.get(decade, 0) + 1
+
+        return BookFacets(
+            genres=[
+                GenreFacet(genre=genre, count=count)
+                for genre, count in sorted(genre_counts.items(), key=lambda item: (-item[1], item[0]))
+                if count
+            ],
+            decades=[DecadeFacet(decade=decade, count=count) for decade, count in sorted(decade_counts.items())],
+        )
@@ -0,0 +1,199 @@
+import json
+import uuid
+from abc import ABC
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.enums import ImportJobStatus
+from app.schemas.import_job import ImportJobResponse
+
+JOB_COLUMNS = """
+    id, filename, file_path, status, rows_processed, imported_count, failed_count,
+    failed_rows, error, cancel_requested, created_at, started_at, finished_at,
+    rows_processed / NULLIF(EXTRACT(EPOCH FROM (COALESCE(finished_at, now()) - started_at)), 0) AS rows_per_second
+"""
+
+
+def _to_response(row) -> ImportJobResponse:
+    return ImportJobResponse(
+        id=row.id,
+        filename=row.filename,
+        status=row.status,
+        rows_processed=row.rows_processed,
+        imported_count=row.imported_count,
+        failed_count=row.failed_count,
+        failed_rows=row.failed_rows,
+        error=row.error,
+        cancel_requested=row.cancel_requested,
+        created_at=row.created_at,
+        started_at=row.started_at,
+        finished_at=row.finished_at,
+        rows_per_second=row.rows_per_second,
+    )
+
+
+class ImportJobRepository(ABC):
+    async def create_job(
+        self, session: AsyncSession, job_id: uuid.UUID, filename: str, file_path: str
+    ) -> ImportJobResponse:
+        raise NotImplementedError()
+
+    async def get_job(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse | None:
+        raise NotImplementedError()
+
+    async def get_file_path(self, session: AsyncSession, job_id: uuid.UUID) -> str | None:
+        raise NotImplementedError()
+
+    async def claim_next_job(self, session: AsyncSession, stale_after_seconds: int) -> ImportJobResponse | None:
+        raise NotImplementedError()
+
+    async def record_progress(
+        self,
+        session: AsyncSession,
+        job_id: uuid.UUID,
+        rows_processed: int,
+        imported_count: int,
+        failed_count: int,
+        failed_rows: list[dict],
+    ) -> bool:
+        raise NotImplementedError()
+
+    async def heartbeat(self, session: AsyncSession, job_id: uuid.UUID) -> None:
+        raise NotImplementedError()
+
+    async def finish_job(
+        self, session: AsyncSession, job_id: uuid.UUID, status: ImportJobStatus, error: str | None = None
+    ) -> None:
+        raise NotImplementedError()
+
+    async def request_cancel(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse | None:
+        raise NotImplementedError()
+
+
+class ImportJobRepositoryImpl(ImportJobRepository):
+    async def create_job(
+        self, session: AsyncSession, job_id: uuid.UUID, filename: str, file_path: str
+    ) -> ImportJobResponse:
+        query = text(f"""
+            INSERT INTO import_jobs (id, filename, file_path)
+            VALUES (:id, :filename, :file_path)
+            RETURNING {JOB_COLUMNS}
+        """)
+        result = await session.execute(query, {"id": job_id, "filename": filename, "file_path": file_path})
+        return _to_response(result.first())
+
+    async def get_job(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse | None:
+        query = text(f"SELECT {JOB_COLUMNS} FROM import_jobs WHERE id = :id")
+        result = await session.execute(query, {"id": job_id})
+        row = result.first()
+        if row:
+            return _to_response(row)
+        return None
+
+    async def get_file_path(self, session: AsyncSession, job_id: uuid.UUID) -> str | None:
+        query = text("SELECT file_path FROM import_jobs WHERE id = :id")
+        result = await session.execute(query, {"id": job_id})
+        return result.scalar_one_or_none()
+
+    async def claim_next_job(self, session: AsyncSession, stale_after_seconds: int) -> ImportJobResponse | None:
+        """
+        Take the oldest pending job, or a running job whose worker stopped sending heartbeats.
+        SKIP LOCKED lets several app processes poll the same table without double-claiming.
+        """
+        query = text(f"""
+            UPDATE import_jobs
+            SET status = :running, started_at = COALESCE(started_at, now()), heartbeat_at = now()
+            WHERE id = (
+                SELECT id FROM import_jobs
+                WHERE status = :pending
+                    OR (status = :running AND heartbeat_at < now() - make_interval(secs => :stale))
+                ORDER BY created_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {JOB_COLUMNS}
+        """)
+        result = await session.execute(query, {
+            "running": ImportJobStatus.RUNNING.value,
+            "pending": ImportJobStatus.PENDING.value,
+            "stale": float(stale_after_seconds),
+        })
+        row = result.first()
+        if row:
+            return _to_response(row)
+        return None
+
+    async def record_progress(
+        self,
+        session: AsyncSession,
+        job_id: uuid.UUID,
+        rows_processed: int,
+        imported_count: int,
+        failed_count: int,
+        failed_rows: list[dict],
+    ) -> bool:
+        """
+        Store the counters after a committed chunk and return whether cancellation was requested.
+        """
+        query = text("""
+            UPDATE import_jobs
+            SET rows_processed = :rows_processed, imported_count = :imported_count,
+                failed_count = :failed_count, failed_rows = CAST(:failed_rows AS jsonb),
+                heartbeat_at = now()
+            WHERE id = :id
+            RETURNING cancel_requested
+        """)
+        result = await session.execute(query, {
+            "id": job_id,
+            "rows_processed": rows_processed,
+            "imported_count": imported_count,
+            "failed_count": failed_count,
+            # A text() bind has no type, so the jsonb codec gets the value as is and needs a string.
+            "failed_rows": json.dumps(failed_rows, default=str),
+        })
+        return bool(result.scalar_one_or_none())
+
+    async def heartbeat(self, session: AsyncSession, job_id: uuid.UUID) -> None:
+        """
+        Mark a running job as alive between progress records, so it is not claimed as stale.
+        """
+        query = text("""
+            UPDATE import_jobs
+            SET heartbeat_at = now()
+            WHERE id = :id AND status = :running
+        """)
+        await session.execute(query, {"id": job_id, "running": ImportJobStatus.RUNNING.value})
+
+    async def finish_job(
+        self, session: AsyncSession, job_id: uuid.UUID, status: ImportJobStatus, error: str | None = None
+    ) -> None:
+        query = text("""
+            UPDATE import_jobs
+            SET status = :status, error = :error, finished_at = now()
+            WHERE id = :id
+        """)
+        await session.execute(query, {"id": job_id, "status": status.value, "error": error})
+
+    async def request_cancel(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse | None:
+        """
+        Flag the job for cancellation; pending jobs are cancelled immediately,
+        running ones stop after their current chunk.
+        """
+        query = text(f"""
+            UPDATE import_jobs
+            SET cancel_requested = TRUE,
+                status = CASE WHEN status = :pending THEN :cancelled ELSE status END,
+                finished_at = CASE WHEN status = :pending THEN now() ELSE finished_at END
+            WHERE id = :id
+            RETURNING {JOB_COLUMNS}
+        """)
+        result = await session.execute(query, {
+            "id": job_id,
+            "pending": ImportJobStatus.PENDING.value,
+            "cancelled": ImportJobStatus.CANCELLED.value,
+        })
+        row = result.first()
+        if row:
+            return _to_response(row)
+        return None
@@ -6,93 +6,152 @@ from typing import Optional
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.db.session import after_commit
 from app.schemas.auth import UserCreate, UserResponse
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 
 class UserRepository(ABC):
-    async def create_user(self, user: UserCreate) -> UserResponse:
+    async def create_user(self, session: AsyncSession, user: UserCreate) -> UserResponse:
         raise NotImplementedError()
 
-    async def get_by_username(self, username: str) -> dict | None:
+    async def get_by_username(self, session: AsyncSession, username: str) -> dict | None:
         raise NotImplementedError()
 
-    async def get_by_id(self, user_id: str) -> UserResponse | None:
+    async def get_by_id(self, session: AsyncSession, user_id: str) -> UserResponse | None:
         raise NotImplementedError()
 
-    async def add_refresh_token(self, user_id: str, token: str, expires_at: datetime):
+    async def add_refresh_token(self, session: AsyncSession, user_id: str, token: str, expires_at: datetime):
         raise NotImplementedError()
 
-    async def revoke_refresh_token(self, token: str):
+    async def revoke_refresh_token(self, session: AsyncSession, token: str):
         raise NotImplementedError()
 
-    async def get_refresh_token(self, token: str):
+    async def get_refresh_token(self, session: AsyncSession, token: str):
+        raise NotImplementedError()
+
+    async def set_active(self, session: AsyncSession, user_id: str, is_active: bool) -> UserResponse | None:
+        raise NotImplementedError()
+
+    async def update_password_hash(self, session: AsyncSession, user_id: str, password_hash: str):
         raise NotImplementedError()
 
 class UserRepositoryImpl(UserRepository):
-    async def create_user(self, user: UserCreate) -> UserResponse:
-        async with get_db() as session:  # AsyncSession
-            pwd = hash_password(user.password)
-            new_id = str(uuid.uuid4())
-            q = text("""
-                INSERT INTO users (id, username, password_hash)
-                VALUES (:id, :username, :pwd)
-                RETURNING id, username, is_active
-            """)
-            result = await session.execute(q, {"id": new_id, "username": user.username, "pwd": pwd})
-            await session.commit()
-            row = result.mappings().first()
-            return UserResponse(
-                id=str(row["id"]),
-                username=row["username"],
-                is_active=row["is_active"],
-            )
-
-    async def get_by_username(self, username: str) -> dict | None:
-        async with get_db() as session:
-            q = text("SELECT id, username, password_hash, is_active FROM users WHERE username = :username")
-            result = await session.execute(q, {"username": username})
-            row = result.mappings().first()
-            if not row:
-                return None
-            return {
-                "id": str(row["id"]),
-                "username": row["username"],
-                "password_hash": row["password_hash"],
-                "is_active": row["is_active"],
-            }
-
-    async def get_by_id(self, user_id: str) -> UserResponse | None:
-        async with get_db() as session:
-            q = text("SELECT id, username, is_active FROM users WHERE id = :id")
-            result = await session.execute(q, {"id": user_id})
-            row = result.mappings().first()
-            if not row:
-                return None
-            return UserResponse(
-                id=str(row["id"]),
-                username=row["username"],
-                is_active=row["is_active"],
-            )
-
-    async def add_refresh_token(self, user_id: str, token: str, expires_at: datetime):
-        async with get_db() as session:
-            q = text("""
-                INSERT INTO refresh_tokens (user_id, token, expires_at)
-                VALUES (:user_id, :token, :expires_at)
-                RETURNING id
-            """)
-            await session.execute(q, {"user_id": user_id, "token": token, "expires_at": expires_at})
-            await session.commit()
-
-    async def revoke_refresh_token(self, token: str):
-        async with get_db() as session:
-            q = text("DELETE FROM refresh_tokens WHERE token = :token")
-            await session.execute(q, {"token": token})
-            await session.commit()
-
-    async def get_refresh_token(self, token: str):
-        async with get_db() as session:
-            q = text("SELECT id, user_id, token, expires_at FROM refresh_tokens WHERE token = :token")
-            result = await session.execute(q, {"token": token})
-            return result.mappings().first()
+    async def create_user(self, session: AsyncSession, user: UserCreate) -> UserResponse:
+        pwd = await hash_password_async(user.password)
+        new_id = str(uuid.uuid4())
+        q = text("""
+            INSERT INTO users (id, username, password_hash)
+            VALUES (:id, :username, :pwd)
+            RETURNING id, username, is_active
+        """)
+        result = await session.execute(q, {"id": new_id, "username": user.username, "pwd": pwd})
+        row = result.mappings().first()
+        return UserResponse(
+            id=str(row["id"]),
+            username=row["username"],
+            is_active=row["is_active"],
+        )
+
+    async def get_by_username(self, session: AsyncSession, username: str) -> dict | None:
+        q = text("SELECT id, username, password_hash, is_active FROM users WHERE username = :username")
+        result = await session.execute(q, {"username": username})
+        row = result.mappings().first()
+        if not row:
+            return None
+        return {
+            "id": str(row["id"]),
+            "username": row["username"],
+            "password_hash": row["password_hash"],
+            "is_active": row["is_active"],
+        }
+
+    async def get_by_id(self, session: AsyncSession, user_id: str) -> UserResponse | None:
+        q = text("SELECT id, username, is_active FROM users WHERE id = :id")
+        result = await session.execute(q, {"id": user_id})
+        row = result.mappings().first()
+        if not row:
+            return None
+        return UserResponse(
+            id=str(row["id"]),
+            username=row["username"],
+            is_active=row["is_active"],
+        )
+
+    async def add_refresh_token(self, session: AsyncSession, user_id: str, token: str, expires_at: datetime):
+        q = text("""
+            INSERT INTO refresh_tokens (user_id, token, expires_at)
+            VALUES (:user_id, :token, :expires_at)
+            RETURNING id
+        """)
+        await session.execute(q, {"user_id": user_id, "token": token, "expires_at": expires_at})
+
+    async def revoke_refresh_token(self, session: AsyncSession, token: str):
+        q = text("DELETE FROM refresh_tokens WHERE token = :token")
+        await session.execute(q, {"token": token})
+
+    async def get_refresh_token(self, session: AsyncSession, token: str):
+        q = text("SELECT id, user_id, token, expires_at FROM refresh_tokens WHERE token = :token")
+        result = await session.execute(q, {"token": token})
+        return result.mappings().first()
+
+    async def set_active(self, session: AsyncSession, user_id: str, is_active: bool) -> UserResponse | None:
+        q = text("UPDATE users SET is_active = :is_active WHERE id = :id RETURNING id, username, is_active")
+        result = await session.execute(q, {"id": user_id, "is_active": is_active})
+        row = result.mappings().first()
+        if not row:
+            return None
+        return UserResponse(
+            id=str(row["id"]),
+            username=row["username"],
+            is_active=row["is_active"],
+        )
+
+    async def update_password_hash(self, session: AsyncSession, user_id: str, password_hash: str):
+        q = text("UPDATE users SET password_hash = :pwd WHERE id = :id")
+        await session.execute(q, {"id": user_id, "pwd": password_hash})
+
+
+class CachedUserRepository(UserRepository):
+    """
+    Short-TTL cache of active users for the per-request get_by_id lookup.
+    set_active evicts the user at once; the TTL bounds staleness from other processes.
+    """
+
+    def __init__(self, inner: UserRepository):
+        self._inner = inner
+        self._cache = LRUCache("users", settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+    async def create_user(self, session: AsyncSession, user: UserCreate) -> UserResponse:
+        return await self._inner.create_user(session, user)
+
+    async def get_by_username(self, session: AsyncSession, username: str) -> dict | None:
+        return await self._inner.get_by_username(session, username)
+
+    async def get_by_id(self, session: AsyncSession, user_id: str) -> UserResponse | None:
+        user = self._cache.get(user_id)
+        if user is not None:
+            return user
+        generation = self._cache.generation
+        user = await self._inner.get_by_id(session, user_id)
+        if user is not None and user.is_active:
+            after_commit(session, lambda: self._cache.set(user_id, user, generation=generation))
+        return user
+
+    async def add_refresh_token(self, session: AsyncSession, user_id: str, token: str, expires_at: datetime):
+        return await self._inner.add_refresh_token(session, user_id, token, expires_at)
+
+    async def revoke_refresh_token(self, session: AsyncSession, token: str):
+        return await self._inner.revoke_refresh_token(session, token)
+
+    async def get_refresh_token(self, session: AsyncSession, token: str):
+        return await self._inner.get_refresh_token(session, token)
+
+    async def set_active(self, session: AsyncSession, user_id: str, is_active: bool) -> UserResponse | None:
+        self._cache.invalidate(user_id)
+        after_commit(session, lambda: self._cache.invalidate(user_id))
+        return await self._inner.set_active(session, user_id, is_active)
+
+    async def update_password_hash(self, session: AsyncSession, user_id: str, password_hash: str):
+        return await self._inner.update_password_hash(session, user_id, password_hash)
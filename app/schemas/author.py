@@ -18,3 +18,12 @@ class AuthorResponse(AuthorBase):
 
     class Config:
         from_attributes = True
+
+
+class AuthorListItem(AuthorResponse):
+    book_count: int | None = None
+
+
+class AuthorPage(BaseModel):
+    items: list[AuthorListItem]
+    next_cursor: str | None = None
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator, ValidationError
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
 from app.schemas.author import AuthorCreate
@@ -15,7 +15,7 @@ class BookBase(BaseModel):
     @field_validator("genres", mode="before")
     def validate_genres(cls, v):
         if not v:
-            raise ValidationError("Genres cannot be empty")
+            raise ValueError("Genres cannot be empty")
         if isinstance(v, list):
             return [GenreEnum(item) if isinstance(item, str) else item for item in v]
         return v
@@ -28,14 +28,14 @@ class BookCreate(BookBase):
 class BookUpdate(BaseModel):
     id: UUID = Field(...)
     title: str | None = Field(None, min_length=1, max_length=255)
-    author: AuthorCreate | None = Field(None, min_length=1, max_length=255)
+    author: AuthorCreate | None = Field(None)
     published_year: int | None = Field(None, ge=1800, le=datetime.now().year)
     genres: list[GenreEnum] | None = Field(None)
 
     @field_validator("genres", mode="before")
     def validate_genres(cls, v):
         if v is not None and len(v) == 0:
-            raise ValidationError("Genres cannot be empty")
+            raise ValueError("Genres cannot be empty")
         if isinstance(v, list):
             return [GenreEnum(item) if isinstance(item, str) else item for item in v]
         return v
@@ -47,3 +47,36 @@ class BookResponse(BookBase):
 
     class Config:
         from_attributes = True
+
+
+class GenreFacet(BaseModel):
+    genre: GenreEnum
+    count: int
+
+
+class DecadeFacet(BaseModel):
+    decade: int
+    count: int
+
+
+class BookFacets(BaseModel):
+    genres: list[GenreFacet]
+    decades: list[DecadeFacet]
+
+
+class BookPage(BaseModel):
+    items: list[BookResponse]
+    next_cursor: str | None = None
+    facets: BookFacets | None = None
+
+
+class BookBatchItem(BaseModel):
+    index: int
+    book: BookResponse | None = None
+    error: str | None = None
+
+
+class BookBatchResult(BaseModel):
+    created_count: int
+    failed_count: int
+    items: list[BookBatchItem]
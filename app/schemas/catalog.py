@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.book import DecadeFacet, GenreFacet
+
+
+class AuthorCount(BaseModel):
+    author_id: UUID
+    name: str
+    count: int
+
+
+class CatalogStats(BaseModel):
+    total_books: int
+    genres: list[GenreFacet]
+    decades: list[DecadeFacet]
+    top_authors: list[AuthorCount]
+
+    class Config:
+        from_attributes = True
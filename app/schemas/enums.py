@@ -10,4 +10,18 @@ class GenreEnum(str, Enum):
     MYSTERY = "Mystery"
     THRILLER = "Thriller"
     ROMANCE = "Romance"
-    SCIENCE_FICTION = "Science Fiction"
\ No newline at end of file
+    SCIENCE_FICTION = "Science Fiction"
+
+class ImportJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class PlanStatus(str, Enum):
+    PENDING = "pending"
+    CAPTURED = "captured"
+    FAILED = "failed"
+    NOT_SAMPLED = "not_sampled"
+    NOT_READ_ONLY = "not_read_only"
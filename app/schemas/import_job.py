@@ -0,0 +1,25 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.enums import ImportJobStatus
+
+
+class ImportJobResponse(BaseModel):
+    id: UUID
+    filename: str
+    status: ImportJobStatus
+    rows_processed: int
+    imported_count: int
+    failed_count: int
+    failed_rows: list[dict]
+    error: str | None
+    cancel_requested: bool
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    rows_per_second: float | None
+
+    class Config:
+        from_attributes = True
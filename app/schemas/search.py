@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from app.schemas.author import AuthorResponse
+from app.schemas.book import BookResponse
+
+
+class BookSearchHit(BookResponse):
+    score: float
+
+
+class AuthorSearchHit(AuthorResponse):
+    score: float
+
+
+class SearchResults(BaseModel):
+    books: list[BookSearchHit]
+    authors: list[AuthorSearchHit]
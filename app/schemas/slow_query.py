@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.enums import PlanStatus
+
+
+class SlowQuery(BaseModel):
+    id: int
+    recorded_at: datetime
+    duration_ms: float
+    sql: str
+    parameters: list[str] | dict[str, str] | None
+    plan_status: PlanStatus
+    plan: str | None = None
+
+    class Config:
+        from_attributes = True
@@ -1,61 +1,117 @@
+import time
 from abc import ABC
 from datetime import datetime, timedelta
-from app.core.security import create_access_token, create_refresh_token, verify_password, decode_token
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token, create_refresh_token, verify_and_update_password, decode_token, decode_token_cached
 from app.reposytory.user_repository import UserRepository
-from app.schemas.auth import UserCreate, Token
+from app.schemas.auth import UserCreate, UserResponse, Token
 from app.core.config import settings
 
 
 class AuthService(ABC):
-    async def register(self, user_in: UserCreate):
+    async def register(self, session: AsyncSession, user_in: UserCreate):
+        raise NotImplementedError()
+
+    async def login(self, session: AsyncSession, user_in: UserCreate) -> Token:
         raise NotImplementedError()
 
-    async def login(self, user_in: UserCreate) -> Token:
+    async def refresh(self, session: AsyncSession, refresh_token: str) -> Token:
         raise NotImplementedError()
 
-    async def refresh(self, refresh_token: str) -> Token:
+    async def logout(self, session: AsyncSession, refresh_token: str):
         raise NotImplementedError()
 
-    async def logout(self, refresh_token: str):
+    async def authenticate(self, session: AsyncSession, access_token: str) -> UserResponse | None:
+        raise NotImplementedError()
+
+    async def deactivate(self, session: AsyncSession, user_id: str) -> UserResponse | None:
         raise NotImplementedError()
 
 
 class AuthServiceImpl(AuthService):
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
+        # Users deactivated through this process -> when the last access token issued to them expires
+        # (monotonic). Until then their tokens must not be trusted by claims. A plain dict rather than
+        # an evicting cache: forgetting an entry early would let that user back in.
+        self._deactivated: dict[str, float] = {}
 
-    async def register(self, user_in: UserCreate):
-        existing = await self.user_repo.get_by_username(user_in.username)
+    async def register(self, session: AsyncSession, user_in: UserCreate):
+        existing = await self.user_repo.get_by_username(session, user_in.username)
         if existing:
             raise ValueError("username already exists")
-        return await self.user_repo.create_user(user_in)
+        # Release the connection while bcrypt runs; the unique index still guards the insert.
+        await session.commit()
+        return await self.user_repo.create_user(session, user_in)
 
-    async def login(self, user_in: UserCreate) -> Token:
-        user_row = await self.user_repo.get_by_username(user_in.username)
+    async def login(self, session: AsyncSession, user_in: UserCreate) -> Token:
+        user_row = await self.user_repo.get_by_username(session, user_in.username)
         if not user_row:
             raise ValueError("invalid credentials")
-        if not verify_password(user_in.password, user_row["password_hash"]):
+        # End the read-only transaction so the pooled connection is not held while bcrypt runs.
+        await session.commit()
+        valid, new_hash = await verify_and_update_password(user_in.password, user_row["password_hash"])
+        if not valid:
+            raise ValueError("invalid credentials")
+        if not user_row["is_active"]:
             raise ValueError("invalid credentials")
 
         user_id = user_row["id"]
-        access = create_access_token(user_id, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+        if new_hash:
+            await self.user_repo.update_password_hash(session, user_id, new_hash)
+        access = create_access_token(
+            user_id,
+            timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            claims={"username": user_row["username"]},
+        )
         refresh = create_refresh_token(user_id, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
         expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        await self.user_repo.add_refresh_token(user_id, refresh, expires_at)
+        await self.user_repo.add_refresh_token(session, user_id, refresh, expires_at)
         return Token(access_token=access, refresh_token=refresh)
 
-    async def refresh(self, refresh_token: str) -> Token:
-        db_row = await self.user_repo.get_refresh_token(refresh_token)
+    async def refresh(self, session: AsyncSession, refresh_token: str) -> Token:
+        db_row = await self.user_repo.get_refresh_token(session, refresh_token)
         if not db_row:
             raise ValueError("invalid refresh token")
         payload = decode_token(refresh_token)
         user_id = payload.get("sub")
-        access = create_access_token(user_id, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+        user = await self.user_repo.get_by_id(session, user_id)
+        if not user or not user.is_active:
+            raise ValueError("invalid refresh token")
+        access = create_access_token(
+            user_id,
+            timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            claims={"username": user.username},
+        )
         new_refresh = create_refresh_token(user_id, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
         expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        await self.user_repo.revoke_refresh_token(refresh_token)
-        await self.user_repo.add_refresh_token(user_id, new_refresh, expires_at)
+        await self.user_repo.revoke_refresh_token(session, refresh_token)
+        await self.user_repo.add_refresh_token(session, user_id, new_refresh, expires_at)
         return Token(access_token=access, refresh_token=new_refresh)
 
-    async def logout(self, refresh_token: str):
-        await self.user_repo.revoke_refresh_token(refresh_token)
+    async def logout(self, session: AsyncSession, refresh_token: str):
+        await self.user_repo.revoke_refresh_token(session, refresh_token)
+
+    async def authenticate(self, session: AsyncSession, access_token: str) -> UserResponse | None:
+        payload = decode_token_cached(access_token)
+        user_id = payload.get("sub")
+        if not user_id:
+            raise JWTError("Token has no subject")
+
+        username = payload.get("username")
+        if settings.AUTH_TRUST_TOKEN_CLAIMS and username and not self._is_deactivated(user_id):
+            return UserResponse(id=user_id, username=username, is_active=True)
+        return await self.user_repo.get_by_id(session, user_id)
+
+    async def deactivate(self, session: AsyncSession, user_id: str) -> UserResponse | None:
+        now = time.monotonic()
+        # Drop the users whose tokens have all expired, so the dict only holds recent deactivations.
+        self._deactivated = {uid: until for uid, until in self._deactivated.items() if until > now}
+        self._deactivated[user_id] = now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        return await self.user_repo.set_active(session, user_id, False)
+
+    def _is_deactivated(self, user_id: str) -> bool:
+        until = self._deactivated.get(user_id)
+        return until is not None and until > time.monotonic()
@@ -0,0 +1,34 @@
+import csv
+import io
+import json
+
+# Same columns /import-csv requires, so an export can be imported again.
+CSV_COLUMNS = ["title", "published_year", "author_name", "genres"]
+
+
+def csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue()
+
+
+def rows_to_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # The importer splits genres on commas, so they share one quoted field.
+    writer.writerows((row.title, row.published_year, row.author_name, ",".join(row.genres)) for row in rows)
+    return buffer.getvalue()
+
+
+def rows_to_ndjson(rows) -> str:
+    return "".join(
+        json.dumps({
+            "id": str(row.id),
+            "title": row.title,
+            "published_year": row.published_year,
+            "author_id": str(row.author_id),
+            "author_name": row.author_name,
+            "genres": list(row.genres),
+        }, ensure_ascii=False) + "\n"
+        for row in rows
+    )
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.enums import GenreEnum
+
+REQUIRED_COLUMNS = {"title", "published_year", "author_name", "genres"}
+
+# Text columns are read as strings so values such as "1984" stay titles instead of numbers.
+CSV_DTYPES = {"title": str, "author_name": str, "genres": str}
+
+MIN_PUBLISHED_YEAR = 1800
+MAX_NAME_LENGTH = 255
+
+
+def _check_length(values: pd.Series, field: str) -> pd.Series:
+    lengths = values.str.len()
+    errors = pd.Series(None, index=values.index, dtype=object)
+    errors[values.isna()] = f"{field}: field required"
+    errors[values.notna() & ((lengths < 1) | (lengths > MAX_NAME_LENGTH))] = (
+        f"{field}: length must be between 1 and {MAX_NAME_LENGTH}"
+    )
+    return errors
+
+
+def _check_year(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    years = np.trunc(pd.to_numeric(values, errors="coerce"))
+    errors = pd.Series(None, index=values.index, dtype=object)
+    errors[years.isna()] = "published_year: must be an integer"
+    max_year = datetime.now().year
+    errors[years.notna() & ((years < MIN_PUBLISHED_YEAR) | (years > max_year))] = (
+        f"published_year: must be between {MIN_PUBLISHED_YEAR} and {max_year}"
+    )
+    return years, errors
+
+
+def _check_genres(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    # Feeds repeat a small set of genre combinations, so parse each distinct value once.
+    codes, uniques = pd.factorize(values.fillna(""))
+    known = {g.value for g in GenreEnum}
+    parsed = np.empty(len(uniques), dtype=object)
+    for i, value in enumerate(uniques):
+        parsed[i] = [g.strip() for g in value.split(",")]
+    all_valid = np.fromiter((all(g in known for g in p) for p in parsed), dtype=bool, count=len(parsed))
+
+    errors = pd.Series(None, index=values.index, dtype=object)
+    errors[~all_valid[codes]] = "genres: contains an invalid genre"
+    return pd.Series(parsed[codes], index=values.index), errors
+
+
+def validate_books_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Validate a CSV frame column by column with the same rules as BookCreate.
+    Returns the valid rows (title, published_year, author_name, genres) and a
+    failed_rows report numbered like the CSV data rows.
+    """
+    title_errors = _check_length(df["title"], "title")
+    author_errors = _check_length(df["author_name"], "author_name")
+    years, year_errors = _check_year(df["published_year"])
+    genres, genre_errors = _check_genres(df["genres"])
+
+    errors = pd.concat([title_errors, year_errors, genre_errors, author_errors], axis=1)
+    failed_mask = errors.notna().any(axis=1)
+
+    failed_rows = [
+        {"row": idx + 1, "error": "; ".join(e for e in row if isinstance(e, str))}
+        for idx, row in zip(errors.index[failed_mask], errors[failed_mask].itertuples(index=False))
+    ]
+
+    ok = ~failed_mask
+    valid = pd.DataFrame({
+        "title": df["title"][ok],
+        "published_year": years[ok].astype("int64"),
+        "author_name": df["author_name"][ok],
+        "genres": genres[ok],
+    })
+    return valid, failed_rows
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from abc import ABC
+from typing import Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import ResultCache
+from app.core.config import settings
+from app.db.session import get_db
+from app.reposytory.book_repository import normalize_book_sort
+from app.reposytory.catalog_repository import CatalogRepository
+from app.services.book_service import BookService
+
+logger = logging.getLogger(__name__)
+
+
+def book_list_key(
+    skip: int,
+    limit: int,
+    title: str | None,
+    author: str | None,
+    genres: list[str] | None,
+    year_from: int | None,
+    year_to: int | None,
+    sort_by: str,
+    sort_order: str,
+    cursor: str | None,
+    genre_match: str,
+    facets: bool,
+) -> Hashable:
+    """
+    Cache key for a list request; parameters that select the same rows map to the same key.
+    """
+    sort_by, sort_order = normalize_book_sort(sort_by, sort_order)
+    return (
+        None if cursor else skip,
+        limit,
+        title or None,
+        author or None,
+        tuple(sorted(set(genres))) if genres else None,
+        genre_match if genres else None,
+        year_from or None,
+        year_to or None,
+        sort_by,
+        sort_order,
+        cursor,
+        facets,
+    )
+
+
+class BookListCache(ABC):
+    async def get_page(
+            self,
+            session: AsyncSession,
+            catalog_version: int,
+            skip: int = 0,
+            limit: int = 100,
+            title: str | None = None,
+            author: str | None = None,
+            genres: list[str] | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+            sort_by: str = "title",
+            sort_order: str = "asc",
+            cursor: str | None = None,
+            genre_match: str = "any",
+            facets: bool = False,
+    ) -> tuple[bytes, int]:
+        raise NotImplementedError()
+
+
+class BookListCacheImpl(BookListCache):
+    """
+    Rendered GET /books/ pages keyed by normalized parameters and tagged with the catalog version
+    they were read at. A write anywhere bumps the version, which outdates every entry; outdated
+    pages are served for BOOK_LIST_CACHE_STALE_SECONDS while one background task per page reloads them.
+    """
+
+    def __init__(self, book_service: BookService, catalog_repo: CatalogRepository):
+        self._book_service = book_service
+        self._catalog_repo = catalog_repo
+        self._cache = ResultCache(
+            "book_list_pages",
+            settings.BOOK_LIST_CACHE_MAX_BYTES,
+            settings.BOOK_LIST_CACHE_TTL_SECONDS,
+            settings.BOOK_LIST_CACHE_STALE_SECONDS,
+        )
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+    async def get_page(
+            self,
+            session: AsyncSession,
+            catalog_version: int,
+            skip: int = 0,
+            limit: int = 100,
+            title: str | None = None,
+            author: str | None = None,
+            genres: list[str] | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+            sort_by: str = "title",
+            sort_order: str = "asc",
+            cursor: str | None = None,
+            genre_match: str = "any",
+            facets: bool = False,
+    ) -> tuple[bytes, int]:
+        """
+        Return the page body and the catalog version it corresponds to, which may be older
+        than catalog_version while a stale page is being refreshed.
+        """
+        params = dict(
+            skip=skip,
+            limit=limit,
+            title=title,
+            author=author,
+            genres=genres,
+            year_from=year_from,
+            year_to=year_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
+        )
+        key = book_list_key(**params)
+        cached = self._cache.get(key, catalog_version)
+        if cached is not None:
+            body, version, stale = cached
+            if stale and key not in self._refreshing:
+                self._refreshing[key] = asyncio.create_task(self._refresh(key, params))
+            return body, version
+
+        body = await self._book_service.get_all_books_json(session, **params)
+        self._cache.set(key, catalog_version, body)
+        return body, catalog_version
+
+    async def _refresh(self, key: Hashable, params: dict) -> None:
+        try:
+            # Runs after the request that triggered it has finished, so it needs its own session.
+            async with get_db() as session:
+                version = await self._catalog_repo.get_version(session)
+                body = await self._book_service.get_all_books_json(session, **params)
+            self._cache.set(key, version, body)
+        except Exception:
+            logger.exception("Refreshing a cached book list page failed")
+        finally:
+            self._refreshing.pop(key, None)
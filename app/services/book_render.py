@@ -0,0 +1,25 @@
+import json
+
+from app.reposytory.book_repository import BookRows
+
+
+def render_book_page(page: BookRows) -> bytes:
+    """
+    Serialize a list page straight from database rows to the bytes FastAPI would send
+    for the equivalent BookPage: same key order, ensure_ascii=False and compact separators.
+    """
+    content = {
+        "items": [
+            {
+                "title": row.title,
+                "published_year": row.published_year,
+                "genres": list(row.genres),
+                "id": str(row.id),
+                "author_id": str(row.author_id) if row.author_id is not None else None,
+            }
+            for row in page.rows
+        ],
+        "next_cursor": page.next_cursor,
+        "facets": page.facets.model_dump(mode="json") if page.facets is not None else None,
+    }
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
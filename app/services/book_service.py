@@ -1,42 +1,102 @@
+import asyncio
 from abc import ABC
-from uuid import UUID
+from typing import AsyncIterator
+from uuid import UUID, uuid4
 import pandas as pd
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.db.session import get_db
 from app.exceptions.book_not_found import BookNotFound
-from app.reposytory.book_repository import BookRepository
+from app.reposytory.book_repository import BookRepository, build_book_filters
 from app.reposytory.author_repository import AuthorRepository
-from app.schemas.author import AuthorCreate
-from app.schemas.book import BookCreate, BookResponse, BookUpdate
+from app.schemas.book import BookCreate, BookResponse, BookUpdate, BookPage, BookBatchItem, BookBatchResult
+from app.schemas.search import SearchResults
+from app.services.book_export import csv_header, rows_to_csv, rows_to_ndjson
+from app.services.book_render import render_book_page
+from app.services.book_import import CSV_DTYPES, REQUIRED_COLUMNS, validate_books_frame
 
 
 class BookService(ABC):
-    async def find_book(self, book_id: UUID) -> BookResponse:
+    async def find_book(self, session: AsyncSession, book_id: UUID) -> BookResponse:
         raise NotImplementedError()
 
-    async def create_book(self, book: BookCreate) -> BookResponse:
+    async def create_book(self, session: AsyncSession, book: BookCreate) -> BookResponse:
         raise NotImplementedError()
 
-    async def delete_book(self, book_id: UUID) -> BookResponse:
+    async def find_books(self, session: AsyncSession, book_ids: list[UUID]) -> list[BookResponse]:
         raise NotImplementedError()
 
-    async def update_book(self, book: BookUpdate) -> BookResponse:
+    async def create_books(self, session: AsyncSession, items: list[dict]) -> BookBatchResult:
+        raise NotImplementedError()
+
+    async def delete_book(self, session: AsyncSession, book_id: UUID) -> BookResponse:
+        raise NotImplementedError()
+
+    async def update_book(self, session: AsyncSession, book: BookUpdate) -> BookResponse:
         raise NotImplementedError()
 
     async def get_all_books(
             self,
+            session: AsyncSession,
             skip: int = 0,
             limit: int = 100,
             title: str | None = None,
             author: str | None = None,
-            genre: str | None = None,
+            genres: list[str] | None = None,
             year_from: int | None = None,
             year_to: int | None = None,
             sort_by: str = "title",
             sort_order: str = "asc",
-    ) -> list[BookResponse]:
+            cursor: str | None = None,
+            genre_match: str = "any",
+            facets: bool = False,
+    ) -> BookPage:
+        raise NotImplementedError()
+
+    async def get_all_books_json(
+            self,
+            session: AsyncSession,
+            skip: int = 0,
+            limit: int = 100,
+            title: str | None = None,
+            author: str | None = None,
+            genres: list[str] | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+            sort_by: str = "title",
+            sort_order: str = "asc",
+            cursor: str | None = None,
+            genre_match: str = "any",
+            facets: bool = False,
+    ) -> bytes:
+        raise NotImplementedError()
+
+    async def import_books_from_csv(self, session: AsyncSession, file) -> dict:
+        raise NotImplementedError()
+
+    async def import_books_from_csv_stream(self, session: AsyncSession, file) -> dict:
+        raise NotImplementedError()
+
+    async def import_books_frame(
+            self, session: AsyncSession, df: pd.DataFrame
+    ) -> tuple[list[BookResponse], list[dict]]:
         raise NotImplementedError()
 
-    async def import_books_from_csv(self, file) -> dict:
+    async def search(self, session: AsyncSession, query: str, limit: int = 20) -> SearchResults:
+        raise NotImplementedError()
+
+    def export_books(
+            self,
+            export_format: str,
+            title: str | None = None,
+            author: str | None = None,
+            genres: list[str] | None = None,
+            genre_match: str = "any",
+            year_from: int | None = None,
+            year_to: int | None = None,
+    ) -> AsyncIterator[str]:
         raise NotImplementedError()
 
 
@@ -45,83 +105,248 @@ class BookServiceImpl(BookService):
         self._book_repo = book_repo
         self._author_repo = author_repo
 
-    async def import_books_from_csv(self, file) -> dict:
+    async def import_books_from_csv(self, session: AsyncSession, file) -> dict:
         try:
-            df = pd.read_csv(file.file)
+            df = pd.read_csv(file.file, dtype=CSV_DTYPES)
         except Exception as e:
             raise ValueError(f"Error reading CSV: {e}")
 
-        required_columns = {"title", "published_year", "author_name", "genres"}
-        if not required_columns.issubset(df.columns):
-            raise ValueError(f"CSV must contain columns: {', '.join(required_columns)}")
+        imported_books, failed_rows = await self.import_books_frame(session, df)
 
-        imported_books = []
-        failed_rows = []
+        return {
+            "imported_count": len(imported_books),
+            "failed_count": len(failed_rows),
+            "failed_rows": failed_rows,
+            "books": imported_books
+        }
 
-        for idx, row in df.iterrows():
-            try:
-                genres_list = [g.strip() for g in str(row["genres"]).split(",")]
+    async def import_books_from_csv_stream(self, session: AsyncSession, file) -> dict:
+        """
+        Import the CSV chunk by chunk so memory depends on CSV_IMPORT_CHUNK_SIZE, not on the file.
+        Each chunk is committed on its own; only counts and the first CSV_IMPORT_ERROR_SAMPLE
+        failed rows are returned.
+        """
+        try:
+            reader = pd.read_csv(file.file, dtype=CSV_DTYPES, chunksize=settings.CSV_IMPORT_CHUNK_SIZE)
+        except Exception as e:
+            raise ValueError(f"Error reading CSV: {e}")
 
-                book_create = BookCreate(
-                    title=row["title"],
-                    published_year=int(row["published_year"]),
-                    genres=genres_list,
-                    author=AuthorCreate(name=row["author_name"]),
-                )
+        imported_count = 0
+        failed_count = 0
+        failed_rows = []
 
-                book = await self._book_repo.create_book(book_create)
-                imported_books.append(book)
-            except Exception as e:
-                failed_rows.append({"row": idx + 1, "error": str(e)})
+        with reader:
+            while True:
+                try:
+                    # Parsing is CPU bound; keep it off the event loop.
+                    df = await asyncio.to_thread(next, reader, None)
+                except Exception as e:
+                    raise ValueError(f"Error reading CSV: {e}")
+                if df is None:
+                    break
+
+                created, chunk_failed = await self.import_books_frame(session, df)
+                imported_count += len(created)
+                failed_count += len(chunk_failed)
+                failed_rows.extend(chunk_failed[:settings.CSV_IMPORT_ERROR_SAMPLE - len(failed_rows)])
+                # Commit per chunk so a large upload does not build one huge transaction.
+                await session.commit()
 
         return {
-            "imported_count": len(imported_books),
-            "failed_count": len(failed_rows),
+            "imported_count": imported_count,
+            "failed_count": failed_count,
             "failed_rows": failed_rows,
-            "books": imported_books
+            "failed_rows_truncated": failed_count > len(failed_rows),
         }
 
-    async def find_book(self, book_id: UUID) -> BookResponse:
-        book = await self._book_repo.get_book(book_id)
+    async def import_books_frame(
+            self, session: AsyncSession, df: pd.DataFrame
+    ) -> tuple[list[BookResponse], list[dict]]:
+        if not REQUIRED_COLUMNS.issubset(df.columns):
+            raise ValueError(f"CSV must contain columns: {', '.join(REQUIRED_COLUMNS)}")
+
+        valid, failed_rows = validate_books_frame(df)
+
+        imported_books = []
+        if len(valid):
+            imported_books = await self._book_repo.bulk_create_books(
+                session,
+                titles=valid["title"].tolist(),
+                published_years=valid["published_year"].tolist(),
+                author_names=valid["author_name"].tolist(),
+                genres=valid["genres"].tolist(),
+            )
+        return imported_books, failed_rows
+
+    async def find_book(self, session: AsyncSession, book_id: UUID) -> BookResponse:
+        book = await self._book_repo.get_book(session, book_id)
         if book is None:
             raise BookNotFound(book_id)
         return book
 
-    async def create_book(self, book_data: BookCreate) -> BookResponse:
-        return await self._book_repo.create_book(book_data)
+    async def create_book(self, session: AsyncSession, book_data: BookCreate) -> BookResponse:
+        return await self._book_repo.create_book(session, book_data)
 
-    async def update_book(self, book: BookUpdate) -> BookResponse:
-        return await self._book_repo.update_book(book)
+    async def find_books(self, session: AsyncSession, book_ids: list[UUID]) -> list[BookResponse]:
+        books = {book.id: book for book in await self._book_repo.get_books(session, book_ids)}
+        return [books[book_id] for book_id in dict.fromkeys(book_ids) if book_id in books]
 
-    async def delete_book(self, book_id: UUID) -> BookResponse:
-        deleted_book = await self._book_repo.delete_book(book_id)
+    async def create_books(self, session: AsyncSession, items: list[dict]) -> BookBatchResult:
+        """
+        Validate every item on its own and insert the valid ones with one bulk insert,
+        so the query count does not depend on the batch size.
+        """
+        results = [BookBatchItem(index=i) for i in range(len(items))]
+        valid = []
+        for i, item in enumerate(items):
+            try:
+                valid.append((i, BookCreate.model_validate(item)))
+            except ValidationError as e:
+                results[i].error = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
 
-        author_books = await self._book_repo.get_books_by_author(deleted_book.author_id)
-        if len(author_books) == 0:
-            await self._author_repo.delete_author(deleted_book.author_id)
+        if valid:
+            book_ids = [uuid4() for _ in valid]
+            created = await self._book_repo.bulk_create_books(
+                session,
+                titles=[book.title for _, book in valid],
+                published_years=[book.published_year for _, book in valid],
+                author_names=[book.author.name for _, book in valid],
+                genres=[[g.value for g in book.genres] for _, book in valid],
+                book_ids=book_ids,
+            )
+            created_by_id = {book.id: book for book in created}
+            for (i, _), book_id in zip(valid, book_ids):
+                book = created_by_id.get(book_id)
+                if book is None:
+                    # Skipped by the repository: its author was deleted concurrently on both attempts.
+                    results[i].error = "Author was deleted while the book was being created; retry the item"
+                else:
+                    results[i].book = book
 
-        return deleted_book
+        created_count = sum(1 for r in results if r.book is not None)
+        return BookBatchResult(
+            created_count=created_count,
+            failed_count=len(results) - created_count,
+            items=results,
+        )
+
+    async def update_book(self, session: AsyncSession, book: BookUpdate) -> BookResponse:
+        return await self._book_repo.update_book(session, book)
+
+    async def delete_book(self, session: AsyncSession, book_id: UUID) -> BookResponse:
+        return await self._book_repo.delete_book(session, book_id)
 
     async def get_all_books(
             self,
+            session: AsyncSession,
             skip: int = 0,
             limit: int = 100,
             title: str | None = None,
             author: str | None = None,
-            genre: str | None = None,
+            genres: list[str] | None = None,
             year_from: int | None = None,
             year_to: int | None = None,
             sort_by: str = "title",
             sort_order: str = "asc",
-    ) -> list[BookResponse]:
+            cursor: str | None = None,
+            genre_match: str = "any",
+            facets: bool = False,
+    ) -> BookPage:
         return await self._book_repo.get_all_books(
+            session,
             skip=skip,
             limit=limit,
             title=title,
             author=author,
-            genre=genre,
+            genres=genres,
             year_from=year_from,
             year_to=year_to,
             sort_by=sort_by,
             sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
         )
+
+    async def get_all_books_json(
+            self,
+            session: AsyncSession,
+            skip: int = 0,
+            limit: int = 100,
+            title: str | None = None,
+            author: str | None = None,
+            genres: list[str] | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+            sort_by: str = "title",
+            sort_order: str = "asc",
+            cursor: str | None = None,
+            genre_match: str = "any",
+            facets: bool = False,
+    ) -> bytes:
+        """
+        Same result as get_all_books, rendered to JSON bytes without building pydantic models.
+        """
+        page = await self._book_repo.get_book_rows(
+            session,
+            skip=skip,
+            limit=limit,
+            title=title,
+            author=author,
+            genres=genres,
+            year_from=year_from,
+            year_to=year_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            genre_match=genre_match,
+            facets=facets,
+        )
+        return render_book_page(page)
+
+    async def search(self, session: AsyncSession, query: str, limit: int = 20) -> SearchResults:
+        books = await self._book_repo.search_books(session, query, limit)
+        authors = await self._author_repo.search_authors(session, query, limit)
+        return SearchResults(books=books, authors=authors)
+
+    def export_books(
+            self,
+            export_format: str,
+            title: str | None = None,
+            author: str | None = None,
+            genres: list[str] | None = None,
+            genre_match: str = "any",
+            year_from: int | None = None,
+            year_to: int | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Return the export body as an async iterator of text chunks, one per cursor batch.
+        Filters are checked here so bad input fails before the response has started.
+        """
+        if export_format not in {"ndjson", "csv"}:
+            raise ValueError(f"Invalid export format: {export_format}")
+        build_book_filters(title, author, genres, genre_match, year_from, year_to)
+        return self._export_books(export_format, title, author, genres, genre_match, year_from, year_to)
+
+    async def _export_books(
+            self,
+            export_format: str,
+            title: str | None,
+            author: str | None,
+            genres: list[str] | None,
+            genre_match: str,
+            year_from: int | None,
+            year_to: int | None,
+    ) -> AsyncIterator[str]:
+        render = rows_to_ndjson
+        if export_format == "csv":
+            render = rows_to_csv
+            yield csv_header()
+        # The body is sent after the request's own session has been closed, so use a dedicated one.
+        async with get_db() as session:
+            async for rows in self._book_repo.stream_books(
+                session, title, author, genres, genre_match, year_from, year_to
+            ):
+                yield render(rows)
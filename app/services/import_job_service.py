@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import os
+import shutil
+import uuid
+from abc import ABC
+
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.exceptions.import_job_not_found import ImportJobNotFound
+from app.reposytory.import_job_repository import ImportJobRepository
+from app.schemas.enums import ImportJobStatus
+from app.schemas.import_job import ImportJobResponse
+from app.services.book_import import CSV_DTYPES
+from app.services.book_service import BookService
+
+logger = logging.getLogger(__name__)
+
+
+def _save_upload(source, path: str) -> None:
+    source.seek(0)
+    with open(path, "wb") as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+
+
+def _remove_file(path: str | None) -> None:
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+class ImportJobService(ABC):
+    async def submit(self, session: AsyncSession, file) -> ImportJobResponse:
+        raise NotImplementedError()
+
+    async def get_job(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse:
+        raise NotImplementedError()
+
+    async def cancel_job(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse:
+        raise NotImplementedError()
+
+    async def start(self) -> None:
+        raise NotImplementedError()
+
+    async def stop(self) -> None:
+        raise NotImplementedError()
+
+
+class ImportJobServiceImpl(ImportJobService):
+    """
+    Runs CSV imports on a pool of background workers.
+
+    Jobs are queued in the import_jobs table: workers claim them with SKIP LOCKED and
+    record progress after every chunk, so a job whose worker died (no heartbeat for
+    IMPORT_JOB_STALE_SECONDS) is picked up again and resumes after its last recorded chunk.
+    While a job runs its heartbeat is also refreshed on a timer, so a chunk that takes longer
+    than IMPORT_JOB_STALE_SECONDS (e.g. waiting for catalog write locks) is not claimed twice.
+
+    Uploads are saved under IMPORT_JOBS_DIR and read by whichever worker claims the job, so with
+    several app instances that directory must be on storage all of them can read.
+    """
+
+    def __init__(self, job_repo: ImportJobRepository, book_service: BookService):
+        self._job_repo = job_repo
+        self._book_service = book_service
+        self._workers: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def submit(self, session: AsyncSession, file) -> ImportJobResponse:
+        job_id = uuid.uuid4()
+        os.makedirs(settings.IMPORT_JOBS_DIR, exist_ok=True)
+        file_path = os.path.join(settings.IMPORT_JOBS_DIR, f"{job_id}.csv")
+        await asyncio.to_thread(_save_upload, file.file, file_path)
+
+        job = await self._job_repo.create_job(session, job_id, file.filename, file_path)
+        # Workers poll with their own sessions, so the job must be committed before waking them.
+        await session.commit()
+        self._wakeup.set()
+        return job
+
+    async def get_job(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse:
+        job = await self._job_repo.get_job(session, job_id)
+        if job is None:
+            raise ImportJobNotFound(job_id)
+        return job
+
+    async def cancel_job(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJobResponse:
+        job = await self._job_repo.request_cancel(session, job_id)
+        if job is None:
+            raise ImportJobNotFound(job_id)
+        return job
+
+    async def start(self) -> None:
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(settings.IMPORT_WORKERS)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                async with get_db() as session:
+                    job = await self._job_repo.claim_next_job(session, settings.IMPORT_JOB_STALE_SECONDS)
+                if job is not None:
+                    await self._run_job(job)
+                    continue
+            except Exception:
+                logger.exception("Import worker failed")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.IMPORT_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: ImportJobResponse) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            await self._import_job(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: uuid.UUID) -> None:
+        interval = max(settings.IMPORT_JOB_STALE_SECONDS / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with get_db() as session:
+                    await self._job_repo.heartbeat(session, job_id)
+            except Exception:
+                logger.exception("Heartbeat of import job %s failed", job_id)
+
+    async def _import_job(self, job: ImportJobResponse) -> None:
+        async with get_db() as session:
+            file_path = await self._job_repo.get_file_path(session, job.id)
+        if job.cancel_requested:
+            await self._finish(job.id, ImportJobStatus.CANCELLED)
+            _remove_file(file_path)
+            return
+
+        resume_from = job.rows_processed
+        rows_processed = job.rows_processed
+        imported_count = job.imported_count
+        failed_count = job.failed_count
+        failed_rows = list(job.failed_rows)
+
+        try:
+            reader = pd.read_csv(file_path, dtype=CSV_DTYPES, chunksize=settings.CSV_IMPORT_CHUNK_SIZE)
+            with reader:
+                while True:
+                    df = await asyncio.to_thread(next, reader, None)
+                    if df is None:
+                        break
+                    # Records (not lines, quoted fields may span lines) already handled before a restart.
+                    df = df[df.index >= resume_from]
+                    if df.empty:
+                        continue
+
+                    # The chunk's books and its progress record commit together, so a resumed
+                    # job neither skips nor re-imports rows.
+                    async with get_db() as session:
+                        created, chunk_failed = await self._book_service.import_books_frame(session, df)
+                        rows_processed += len(df)
+                        imported_count += len(created)
+                        failed_count += len(chunk_failed)
+                        failed_rows.extend(chunk_failed[:settings.CSV_IMPORT_ERROR_SAMPLE - len(failed_rows)])
+
+                        cancel_requested = await self._job_repo.record_progress(
+                            session, job.id, rows_processed, imported_count, failed_count, failed_rows
+                        )
+                    if cancel_requested:
+                        await self._finish(job.id, ImportJobStatus.CANCELLED)
+                        _remove_file(file_path)
+                        return
+        except Exception as e:
+            logger.exception("Import job %s failed", job.id)
+            await self._finish(job.id, ImportJobStatus.FAILED, str(e))
+            _remove_file(file_path)
+            return
+
+        await self._finish(job.id, ImportJobStatus.COMPLETED)
+        _remove_file(file_path)
+
+    async def _finish(self, job_id: uuid.UUID, status: ImportJobStatus, error: str | None = None) -> None:
+        async with get_db() as session:
+            await self._job_repo.finish_job(session, job_id, status, error)
@@ -0,0 +1,100 @@
+"""
+Compare the GET /books/ serialization paths on synthetic rows:
+
+- models: rows -> BookResponse/BookPage -> FastAPI response_model validation -> JSONResponse
+- fast: rows -> render_book_page bytes
+
+Checks that both produce identical bytes, then times them. Ids are asyncpg UUIDs,
+as returned by the driver.
+
+    PYTHONPATH=. python benchmarks/list_serialization.py
+"""
+import asyncio
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+from asyncpg.pgproto.pgproto import UUID as PgUUID
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.reposytory.book_repository import BookRows
+from app.schemas.book import BookPage, BookResponse, BookFacets, GenreFacet, DecadeFacet
+from app.schemas.enums import GenreEnum
+from app.services.book_render import render_book_page
+
+SIZES = [100, 1000]
+GENRES = [g.value for g in GenreEnum]
+RESPONSE_FIELD = create_model_field(name="Response_get_books", type_=BookPage, mode="serialization")
+FACETS = BookFacets(
+    genres=[GenreFacet(genre=genre, count=10) for genre in GENRES],
+    decades=[DecadeFacet(decade=decade, count=5) for decade in range(1800, 2030, 10)],
+)
+
+
+def make_rows(n: int) -> list:
+    rng = random.Random(n)
+    return [
+        SimpleNamespace(
+            id=PgUUID(uuid.uuid4().bytes),
+            title=f"Book {i} – Ünïcode \"quoted\"",
+            published_year=rng.randint(1800, 2024),
+            author_id=PgUUID(uuid.uuid4().bytes),
+            author_name=f"Author {i % 97}",
+            genres=rng.sample(GENRES, rng.randint(1, 3)),
+        )
+        for i in range(n)
+    ]
+
+
+async def via_models(page: BookRows) -> bytes:
+    book_page = BookPage(
+        items=[
+            BookResponse(
+                id=row.id,
+                title=row.title,
+                author_id=row.author_id,
+                published_year=row.published_year,
+                genres=row.genres,
+            )
+            for row in page.rows
+        ],
+        next_cursor=page.next_cursor,
+        facets=page.facets,
+    )
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=book_page, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def via_fast_path(page: BookRows) -> bytes:
+    return render_book_page(page)
+
+
+async def best_of(func, page: BookRows, number: int, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func(page)
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+async def main() -> None:
+    for size in SIZES:
+        page = BookRows(make_rows(size), "next-cursor", FACETS)
+        assert await via_models(page) == await via_fast_path(page), f"outputs differ at {size} rows"
+
+        number = max(1, 20000 // size)
+        models = await best_of(via_models, page, number)
+        fast = await best_of(via_fast_path, page, number)
+        print(
+            f"{size:>5} rows  models {models * 1000:8.3f} ms  fast {fast * 1000:8.3f} ms  "
+            f"speedup {models / fast:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,392 @@
+"""
+In-process load test: drives app.main:app through httpx's ASGI transport with its lifespan running.
+
+    python -m benchmarks.load                                      # read mix, in-memory backend
+    python -m benchmarks.load --mix read=48,write=8,login=4,import=1 --duration 30
+    python -m benchmarks.load --backend postgres --db-latency 0 --output load.json
+
+--mix gives the number of concurrent virtual users per scenario:
+    read    list pages (filters, sorts, facets, revalidation with If-None-Match), single gets, batch gets
+    write   authenticated create, patch and delete of the user's own books
+    login   repeated logins of one account (bcrypt bound; lower BCRYPT_ROUNDS to focus on the rest)
+    import  /import-csv?stream=true uploads of --import-rows rows
+
+The postgres backend uses DATABASE_URL and leaves the seeded rows behind; the memory backend
+(see benchmarks.memory_backend) needs no database. Requests made during --warmup are not counted.
+Pool wait is the time a session waits to check a connection out of the pool, for every session.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from asgi_lifespan import LifespanManager
+
+from app.core.config import settings
+from app.db.session import engine
+from app.main import app
+from app.schemas.enums import GenreEnum
+
+API = "/api/v1"
+GENRES = [g.value for g in GenreEnum]
+WORDS = ["river", "night", "garden", "iron", "silent", "glass", "winter", "empire", "shadow", "letters"]
+LIST_QUERIES = [
+    {},
+    {"limit": 20},
+    {"sort_by": "published_year", "sort_order": "desc"},
+    {"sort_by": "author", "limit": 50},
+    {"title": "night"},
+    {"author": "Author 1"},
+    {"genres": "Fiction"},
+    {"genres": ["Fiction", "Mystery"], "genre_match": "all"},
+    {"year_from": 1950, "year_to": 1999},
+    {"facets": "true", "limit": 10},
+]
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
+class Recorder:
+    """
+    Latencies and statuses per endpoint label, plus pool checkout waits; ignores everything until `start`.
+    """
+
+    def __init__(self) -> None:
+        self.recording = False
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.pool_waits: list[float] = []
+        self.pool_samples: list[int] = []
+
+    def start(self) -> None:
+        self.recording = True
+        self.started_at = time.perf_counter()
+
+    def stop(self) -> None:
+        self.recording = False
+        self.stopped_at = time.perf_counter()
+
+    def request(self, label: str, status: int | str, elapsed: float) -> None:
+        if self.recording:
+            self.latencies[label].append(elapsed)
+            self.statuses[label][str(status)] += 1
+
+    def pool_wait(self, waited: float) -> None:
+        if self.recording:
+            self.pool_waits.append(waited)
+
+    def report(self, pool_capacity: int) -> dict:
+        duration = self.stopped_at - self.started_at
+        endpoints = {}
+        all_latencies = []
+        total_errors = 0
+        for label in sorted(self.latencies):
+            latencies = self.latencies[label]
+            statuses = dict(self.statuses[label])
+            errors = sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 400)
+            endpoints[label] = {
+                "requests": len(latencies),
+                "throughput_rps": len(latencies) / duration,
+                "error_rate": errors / len(latencies),
+                "statuses": statuses,
+                **summarize(latencies),
+            }
+            all_latencies.extend(latencies)
+            total_errors += errors
+
+        saturated = sum(1 for n in self.pool_samples if n >= pool_capacity)
+        return {
+            "duration_seconds": duration,
+            "total": {
+                "requests": len(all_latencies),
+                "throughput_rps": len(all_latencies) / duration,
+                "error_rate": total_errors / len(all_latencies) if all_latencies else 0.0,
+                **summarize(all_latencies),
+            },
+            "endpoints": endpoints,
+            "pool": {
+                "capacity": pool_capacity,
+                "checkouts": len(self.pool_waits),
+                "wait_total_seconds": sum(self.pool_waits),
+                **{f"wait_{k}": v for k, v in summarize(self.pool_waits).items()},
+                "peak_checked_out": max(self.pool_samples, default=0),
+                "saturated_fraction": saturated / len(self.pool_samples) if self.pool_samples else 0.0,
+            },
+        }
+
+
+class LoadContext:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, args: argparse.Namespace):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.username = f"load-{uuid.uuid4().hex[:12]}"
+        self.password = "load-test-password"
+        self.headers: dict[str, str] = {}
+        self.book_ids: list[str] = []
+        self.csv_body = make_csv(args.import_rows)
+
+    async def call(self, label: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, API + url, **kwargs)
+        except Exception as e:
+            self.recorder.request(label, type(e).__name__, time.perf_counter() - start)
+            return None
+        self.recorder.request(label, response.status_code, time.perf_counter() - start)
+        return response
+
+
+def make_book(rng: random.Random) -> dict:
+    return {
+        "title": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {rng.randrange(10000)}",
+        "published_year": rng.randrange(1900, 2024),
+        "genres": rng.sample(GENRES, rng.randint(1, 3)),
+        "author": {"name": f"Author {rng.randrange(500)}"},
+    }
+
+
+def make_csv(rows: int) -> bytes:
+    rng = random.Random(7)
+    lines = ["title,published_year,author_name,genres"]
+    for _ in range(rows):
+        book = make_book(rng)
+        lines.append(f'{book["title"]},{book["published_year"]},{book["author"]["name"]},"{",".join(book["genres"])}"')
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def setup(ctx: LoadContext) -> None:
+    """
+    Register the load-test account, log in once and seed --seed books.
+    """
+    credentials = {"username": ctx.username, "password": ctx.password}
+    response = await ctx.client.post(API + "/auth/register", json=credentials)
+    response.raise_for_status()
+    response = await ctx.client.post(API + "/auth/login", json=credentials)
+    response.raise_for_status()
+    ctx.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    rng = random.Random(1)
+    remaining = ctx.args.seed
+    while remaining > 0:
+        batch = [make_book(rng) for _ in range(min(remaining, settings.BOOK_BATCH_MAX))]
+        response = await ctx.client.post(API + "/books/batch", json=batch, headers=ctx.headers)
+        response.raise_for_status()
+        ctx.book_ids.extend(item["book"]["id"] for item in response.json()["items"] if item["book"])
+        remaining -= len(batch)
+
+
+async def read_user(ctx: LoadContext, rng: random.Random, deadline: float) -> None:
+    etags: dict[int, str] = {}
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        if roll < 0.6:
+            index = rng.randrange(len(LIST_QUERIES))
+            # Half the requests revalidate a page seen before, as a client with an HTTP cache would.
+            revalidate = index in etags and rng.random() < 0.5
+            headers = {"If-None-Match": etags[index]} if revalidate else {}
+            response = await ctx.call("GET /books/", "GET", "/books/", params=LIST_QUERIES[index], headers=headers)
+            if response is not None and "etag" in response.headers:
+                etags[index] = response.headers["etag"]
+        elif roll < 0.9:
+            await ctx.call("GET /books/{id}", "GET", f"/books/{rng.choice(ctx.book_ids)}")
+        else:
+            ids = rng.sample(ctx.book_ids, min(20, len(ctx.book_ids)))
+            await ctx.call("GET /books/batch", "GET", "/books/batch", params={"ids": ids})
+
+
+async def write_user(ctx: LoadContext, rng: random.Random, deadline: float) -> None:
+    own: list[str] = []
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        if roll < 0.5 or not own:
+            response = await ctx.call("POST /books/", "POST", "/books/", json=make_book(rng), headers=ctx.headers)
+            if response is not None and response.status_code == 201:
+                own.append(response.json()["id"])
+        elif roll < 0.8:
+            book_id = rng.choice(own)
+            body = {"id": book_id, "title": make_book(rng)["title"]}
+            await ctx.call("PATCH /books/{id}", "PATCH", f"/books/{book_id}", json=body, headers=ctx.headers)
+        else:
+            book_id = own.pop(rng.randrange(len(own)))
+            await ctx.call("DELETE /books/{id}", "DELETE", f"/books/{book_id}", headers=ctx.headers)
+
+
+async def login_user(ctx: LoadContext, rng: random.Random, deadline: float) -> None:
+    credentials = {"username": ctx.username, "password": ctx.password}
+    while time.perf_counter() < deadline:
+        await ctx.call("POST /auth/login", "POST", "/auth/login", json=credentials)
+
+
+async def import_user(ctx: LoadContext, rng: random.Random, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        files = {"file": ("books.csv", ctx.csv_body, "text/csv")}
+        await ctx.call(
+            "POST /import-csv", "POST", "/import-csv", params={"stream": "true"}, files=files, headers=ctx.headers
+        )
+
+
+SCENARIOS = {"read": read_user, "write": write_user, "login": login_user, "import": import_user}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, users = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = int(users or 1)
+    return mix
+
+
+def instrument_engine_pool(recorder: Recorder):
+    """
+    Time every checkout from the engine's pool (waiting for a free connection or opening one).
+    SQLAlchemy has no event before a checkout starts, so the pool's getter is wrapped.
+    """
+    pool = engine.sync_engine.pool
+    get = pool._do_get
+
+    def timed_get():
+        start = time.perf_counter()
+        try:
+            return get()
+        finally:
+            recorder.pool_wait(time.perf_counter() - start)
+
+    pool._do_get = timed_get
+    # NullPool (TESTING) keeps no count of checked-out connections.
+    return getattr(pool, "checkedout", lambda: 0)
+
+
+async def sample_pool(recorder: Recorder, checked_out, interval: float = 0.01) -> None:
+    while True:
+        if recorder.recording:
+            recorder.pool_samples.append(checked_out())
+        await asyncio.sleep(interval)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    recorder = Recorder()
+    pool_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if args.backend == "memory":
+        from benchmarks.memory_backend import MemoryPool, install
+
+        pool = MemoryPool(pool_capacity, recorder.pool_wait)
+        install(app, pool, args.db_latency / 1000)
+        checked_out = lambda: pool.checked_out
+    else:
+        checked_out = instrument_engine_pool(recorder)
+
+    async with LifespanManager(app) as manager:
+        transport = httpx.ASGITransport(app=manager.app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=args.timeout) as client:
+            ctx = LoadContext(client, recorder, args)
+            await setup(ctx)
+
+            sampler = asyncio.create_task(sample_pool(recorder, checked_out))
+            loop_start = time.perf_counter()
+            deadline = loop_start + args.warmup + args.duration
+            users = [
+                SCENARIOS[name](ctx, random.Random(f"{name}-{i}"), deadline)
+                for name, count in args.mix.items()
+                for i in range(count)
+            ]
+
+            async def start_recording():
+                await asyncio.sleep(args.warmup)
+                recorder.start()
+
+            await asyncio.gather(start_recording(), *users)
+            recorder.stop()
+            sampler.cancel()
+
+    report = recorder.report(pool_capacity)
+    report["meta"] = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "mix": args.mix,
+        "seed_books": args.seed,
+        "db_latency_ms": args.db_latency if args.backend == "memory" else None,
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+    }
+    return report
+
+
+def print_report(report: dict, out=sys.stdout) -> None:
+    print(f"{'endpoint':<22} {'requests':>9} {'rps':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}", file=out)
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for label, stats in rows:
+        print(
+            f"{label:<22} {stats['requests']:>9} {stats['throughput_rps']:>9.1f} {stats['error_rate']:>7.1%} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}",
+            file=out,
+        )
+    pool = report["pool"]
+    print(
+        f"\npool: capacity {pool['capacity']}, peak checked out {pool['peak_checked_out']}, "
+        f"saturated {pool['saturated_fraction']:.1%} of the time",
+        file=out,
+    )
+    print(
+        f"pool wait: {pool['checkouts']} checkouts, p50 {pool['wait_p50_ms']:.2f} ms, p95 {pool['wait_p95_ms']:.2f} ms, "
+        f"p99 {pool['wait_p99_ms']:.2f} ms, max {pool['wait_max_ms']:.2f} ms, total {pool['wait_total_seconds']:.2f} s",
+        file=out,
+    )
+    for label, stats in report["endpoints"].items():
+        failed = {s: n for s, n in stats["statuses"].items() if not s.isdigit() or int(s) >= 400}
+        if failed:
+            print(f"errors {label}: {failed}", file=out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "postgres"], default="memory")
+    parser.add_argument("--mix", type=parse_mix, default="read=32", help="scenario=users[,scenario=users...]")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--seed", type=int, default=2000, help="books created before the run")
+    parser.add_argument("--import-rows", type=int, default=500, help="rows per CSV upload")
+    parser.add_argument("--db-latency", type=float, default=1.0, help="memory backend: ms added per statement")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
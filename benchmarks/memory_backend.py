@@ -0,0 +1,586 @@
+"""
+In-memory stand-in for Postgres, so the load harness runs on machines without a database.
+
+The SQL repositories are replaced by dict-backed ones behind the same interfaces and the same
+caching wrappers, and get_db() hands out MemorySession objects instead of AsyncSessions. Each
+session checks a slot out of a MemoryPool sized like the real engine pool on its first statement
+and returns it at commit or rollback, so pool saturation shows up as it would against Postgres.
+--db-latency adds a fixed delay per statement.
+
+Writes apply immediately; a rollback does not undo them. Background import jobs are not wired
+up, so the import scenario uses the synchronous /import-csv endpoint.
+"""
+import asyncio
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Callable, NamedTuple
+from uuid import UUID
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.core.pagination import encode_cursor
+from app.core.security import hash_password_async
+from app.exceptions.book_not_found import BookNotFound
+from app.registry import Registry
+from app.reposytory.author_repository import AuthorRepository, CachedAuthorRepository, build_author_list_query
+from app.reposytory.book_repository import (
+    BookRepository,
+    BookRows,
+    CachedBookRepository,
+    SORT_ROW_FIELDS,
+    build_book_filters,
+    build_book_list_query,
+)
+from app.reposytory.catalog_repository import CatalogRepository
+from app.reposytory.columnar_book_repository import ColumnarBookRepository
+from app.reposytory.user_repository import UserRepository, CachedUserRepository
+from app.schemas.author import AuthorCreate, AuthorResponse, AuthorListItem, AuthorPage
+from app.schemas.auth import UserCreate, UserResponse
+from app.schemas.book import BookCreate, BookResponse, BookUpdate, BookPage, BookFacets, GenreFacet, DecadeFacet
+from app.schemas.catalog import AuthorCount, CatalogStats
+from app.schemas.search import AuthorSearchHit, BookSearchHit
+from app.services.auth_service import AuthService, AuthServiceImpl
+from app.services.book_list_cache import BookListCache, BookListCacheImpl
+from app.services.book_service import BookService, BookServiceImpl
+
+
+class BookRow(NamedTuple):
+    id: UUID
+    title: str
+    published_year: int
+    author_id: UUID
+    author_name: str
+    genres: list[str]
+
+
+class MemoryPool:
+    """
+    Connection slots with the capacity of the engine pool; `on_wait` receives each checkout's wait in seconds.
+    """
+
+    def __init__(self, capacity: int, on_wait: Callable[[float], None] | None = None):
+        self.capacity = capacity
+        self.checked_out = 0
+        self.on_wait = on_wait
+        self._slots = asyncio.Semaphore(capacity)
+
+    async def checkout(self) -> None:
+        start = time.perf_counter()
+        await self._slots.acquire()
+        self.checked_out += 1
+        if self.on_wait is not None:
+            self.on_wait(time.perf_counter() - start)
+
+    def checkin(self) -> None:
+        self.checked_out -= 1
+        self._slots.release()
+
+
+class MemorySession:
+    """
+    The parts of AsyncSession the services use: info, commit, rollback, close, and after_commit hooks.
+    """
+
+    def __init__(self, pool: MemoryPool, latency: float):
+        self.info: dict = {}
+        self._pool = pool
+        self._latency = latency
+        self._connected = False
+
+    async def __aenter__(self) -> "MemorySession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def roundtrip(self) -> None:
+        """
+        Account for one statement: take a pool slot if the transaction has none yet, then wait out the latency.
+        """
+        if not self._connected:
+            await self._pool.checkout()
+            self._connected = True
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+    def _release(self) -> None:
+        if self._connected:
+            self._connected = False
+            self._pool.checkin()
+
+    async def commit(self) -> None:
+        self._release()
+        for callback in self.info.pop("after_commit", []):
+            callback()
+
+    async def rollback(self) -> None:
+        self._release()
+        self.info.pop("after_commit", None)
+
+    async def close(self) -> None:
+        self._release()
+        self.info.pop("after_commit", None)
+
+
+class MemoryStore:
+    def __init__(self) -> None:
+        self.authors: dict[UUID, str] = {}
+        self.author_ids: dict[str, UUID] = {}
+        self.books: dict[UUID, dict] = {}
+        self.users: dict[str, dict] = {}
+        self.user_ids: dict[str, str] = {}
+        self.refresh_tokens: dict[str, dict] = {}
+        self.version = 1
+
+    def bump(self) -> None:
+        self.version += 1
+
+    def author_id(self, name: str) -> UUID:
+        author_id = self.author_ids.get(name)
+        if author_id is None:
+            author_id = uuid.uuid4()
+            self.authors[author_id] = name
+            self.author_ids[name] = author_id
+            self.bump()
+        return author_id
+
+    def row(self, book: dict) -> BookRow:
+        return BookRow(
+            book["id"], book["title"], book["published_year"], book["author_id"],
+            self.authors[book["author_id"]], book["genres"],
+        )
+
+
+def _book_response(book: dict) -> BookResponse:
+    return BookResponse(
+        id=book["id"],
+        title=book["title"],
+        published_year=book["published_year"],
+        author_id=book["author_id"],
+        genres=book["genres"],
+    )
+
+
+def _matches(row: BookRow, title, author, genres, genre_match, year_from, year_to) -> bool:
+    if title and title.lower() not in row.title.lower():
+        return False
+    if author and author.lower() not in row.author_name.lower():
+        return False
+    if genres:
+        check = all if genre_match == "all" else any
+        if not check(g in row.genres for g in genres):
+            return False
+    if year_from and row.published_year < year_from:
+        return False
+    if year_to and row.published_year > year_to:
+        return False
+    return True
+
+
+class MemoryAuthorRepository(AuthorRepository):
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    async def get_author(self, session: MemorySession, author_id: UUID) -> AuthorResponse | None:
+        await session.roundtrip()
+        name = self._store.authors.get(author_id)
+        return AuthorResponse(id=author_id, name=name) if name is not None else None
+
+    async def create_author(self, session: MemorySession, author: AuthorCreate) -> AuthorResponse:
+        await session.roundtrip()
+        return AuthorResponse(id=self._store.author_id(author.name), name=author.name)
+
+    async def delete_author(self, session: MemorySession, author_id: UUID) -> AuthorResponse | None:
+        await session.roundtrip()
+        name = self._store.authors.pop(author_id, None)
+        if name is None:
+            return None
+        del self._store.author_ids[name]
+        self._store.bump()
+        return AuthorResponse(id=author_id, name=name)
+
+    async def get_authors(
+        self,
+        session: MemorySession,
+        limit: int = 100,
+        name_prefix: str | None = None,
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        include_book_count: bool = False,
+    ) -> AuthorPage:
+        # Validates the parameters exactly as the SQL path does.
+        _, params, sort_order = build_author_list_query(limit, name_prefix, sort_order, cursor, include_book_count)
+        await session.roundtrip()
+        keys = sorted(
+            ((name, author_id) for author_id, name in self._store.authors.items()
+             if not name_prefix or name.startswith(name_prefix)),
+            key=lambda key: (key[0], key[1].bytes),
+            reverse=sort_order == "desc",
+        )
+        if cursor:
+            position = (params["cursor_name"], params["cursor_id"].bytes)
+            if sort_order == "asc":
+                keys = [key for key in keys if (key[0], key[1].bytes) > position]
+            else:
+                keys = [key for key in keys if (key[0], key[1].bytes) < position]
+        page = keys[:limit]
+        counts: Counter = Counter()
+        if include_book_count:
+            ids = {author_id for _, author_id in page}
+            counts.update(book["author_id"] for book in self._store.books.values() if book["author_id"] in ids)
+        items = [
+            AuthorListItem(id=author_id, name=name, book_count=counts[author_id] if include_book_count else None)
+            for name, author_id in page
+        ]
+        next_cursor = None
+        if len(keys) > limit:
+            name, author_id = page[-1]
+            next_cursor = encode_cursor({"sort_order": sort_order, "name": name, "id": str(author_id)})
+        return AuthorPage(items=items, next_cursor=next_cursor)
+
+    async def get_author_by_name(self, session: MemorySession, name: str) -> AuthorResponse | None:
+        await session.roundtrip()
+        author_id = self._store.author_ids.get(name)
+        return AuthorResponse(id=author_id, name=name) if author_id is not None else None
+
+    async def resolve_author_ids(
+        self, session: MemorySession, names: list[str], refresh: bool = False
+    ) -> dict[str, UUID]:
+        await session.roundtrip()
+        return {name: self._store.author_id(name) for name in dict.fromkeys(names)}
+
+    async def get_or_create_author_id(self, session: MemorySession, name: str, refresh: bool = False) -> UUID:
+        await session.roundtrip()
+        return self._store.author_id(name)
+
+    async def search_authors(self, session: MemorySession, query: str, limit: int) -> list[AuthorSearchHit]:
+        await session.roundtrip()
+        query = query.lower()
+        hits = [
+            AuthorSearchHit(id=author_id, name=name, score=1.0)
+            for author_id, name in self._store.authors.items()
+            if query in name.lower()
+        ]
+        return hits[:limit]
+
+    async def evict_author(self, session: MemorySession, author_id: UUID, name: str) -> None:
+        pass
+
+
+class MemoryBookRepository(BookRepository):
+    def __init__(self, store: MemoryStore, author_repo: AuthorRepository):
+        self._store = store
+        self._author_repo = author_repo
+
+    async def get_book(self, session: MemorySession, book_id: UUID) -> BookResponse | None:
+        await session.roundtrip()
+        book = self._store.books.get(book_id)
+        return _book_response(book) if book is not None else None
+
+    async def create_book(self, session: MemorySession, book: BookCreate) -> BookResponse:
+        created = await self.bulk_create_books(
+            session, [book.title], [book.published_year], [book.author.name], [[g.value for g in book.genres]]
+        )
+        return created[0]
+
+    async def update_book(self, session: MemorySession, book: BookUpdate) -> BookResponse | None:
+        await session.roundtrip()
+        stored = self._store.books.get(book.id)
+        if stored is None:
+            raise BookNotFound(book_id=book.id)
+        fields = book.model_dump(mode="json", exclude_unset=True, exclude_none=True, exclude={"id", "author"})
+        stored.update(fields)
+        if book.author is not None:
+            stored["author_id"] = self._store.author_id(book.author.name)
+        if fields or book.author is not None:
+            self._store.bump()
+        return _book_response(stored)
+
+    async def delete_book(self, session: MemorySession, book_id: UUID) -> BookResponse | None:
+        await session.roundtrip()
+        book = self._store.books.pop(book_id, None)
+        if book is None:
+            raise BookNotFound(book_id)
+        self._store.bump()
+        author_id = book["author_id"]
+        if not any(b["author_id"] == author_id for b in self._store.books.values()):
+            name = self._store.authors.pop(author_id)
+            del self._store.author_ids[name]
+            await self._author_repo.evict_author(session, author_id, name)
+        return _book_response(book)
+
+    async def get_all_books(self, session: MemorySession, **params) -> BookPage:
+        page = await self.get_book_rows(session, **params)
+        return BookPage(
+            items=[
+                BookResponse(
+                    id=row.id, title=row.title, published_year=row.published_year,
+                    author_id=row.author_id, genres=row.genres,
+                )
+                for row in page.rows
+            ],
+            next_cursor=page.next_cursor,
+            facets=page.facets,
+        )
+
+    async def get_book_rows(
+        self,
+        session: MemorySession,
+        skip: int = 0,
+        limit: int = 100,
+        title: str | None = None,
+        author: str | None = None,
+        genres: list[str] | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: str | None = None,
+        genre_match: str = "any",
+        facets: bool = False,
+    ) -> BookRows:
+        # Built only for its validation, normalization and decoded cursor, so errors match the SQL path.
+        _, params, sort_by, sort_order = build_book_list_query(
+            skip, limit, title, author, genres, genre_match, year_from, year_to, sort_by, sort_order, cursor
+        )
+        await session.roundtrip()
+
+        field = SORT_ROW_FIELDS[sort_by]
+        descending = sort_order == "desc"
+        matched = [
+            row for row in map(self._store.row, self._store.books.values())
+            if _matches(row, title, author, genres, genre_match, year_from, year_to)
+        ]
+        matched.sort(key=lambda row: (getattr(row, field), row.id), reverse=descending)
+
+        if cursor:
+            position = (params["cursor_value"], params["cursor_id"])
+            if descending:
+                matched = [row for row in matched if (getattr(row, field), row.id) < position]
+            else:
+                matched = [row for row in matched if (getattr(row, field), row.id) > position]
+        else:
+            matched = matched[skip:]
+        rows = matched[:limit + 1]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({
+                "sort_by": sort_by,
+                "sort_order": sort_order,
+                "value": getattr(last, field),
+                "id": str(last.id),
+            })
+
+        book_facets = None
+        if facets:
+            book_facets = self._facets(title, author, genres, genre_match, year_from, year_to)
+        return BookRows(rows, next_cursor, book_facets)
+
+    def _facets(self, title, author, genres, genre_match, year_from, year_to) -> BookFacets:
+        genre_counts: dict[str, int] = {}
+        decade_counts: dict[int, int] = {}
+        for row in map(self._store.row, self._store.books.values()):
+            if not _matches(row, title, author, genres, genre_match, year_from, year_to):
+                continue
+            for genre in row.genres:
+                genre_counts[genre] = genre_counts.get(genre, 0) + 1
+            decade = row.published_year // 10 * 10
+            decade_counts[decade] = decade_counts.get(decade, 0) + 1
+        return BookFacets(
+            genres=[
+                GenreFacet(genre=genre, count=count)
+                for genre, count in sorted(genre_counts.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            decades=[DecadeFacet(decade=decade, count=count) for decade, count in sorted(decade_counts.items())],
+        )
+
+    async def get_books(self, session: MemorySession, book_ids: list[UUID]) -> list[BookResponse]:
+        await session.roundtrip()
+        books = self._store.books
+        return [_book_response(books[book_id]) for book_id in set(book_ids) if book_id in books]
+
+    async def get_books_by_author(self, session: MemorySession, author_id: UUID) -> list[BookResponse]:
+        await session.roundtrip()
+        return [_book_response(b) for b in self._store.books.values() if b["author_id"] == author_id]
+
+    async def stream_books(
+        self,
+        session: MemorySession,
+        title: str | None,
+        author: str | None,
+        genres: list[str] | None,
+        genre_match: str,
+        year_from: int | None,
+        year_to: int | None,
+    ) -> AsyncIterator[list]:
+        build_book_filters(title, author, genres, genre_match, year_from, year_to)
+        await session.roundtrip()
+        rows = [
+            row for row in map(self._store.row, self._store.books.values())
+            if _matches(row, title, author, genres, genre_match, year_from, year_to)
+        ]
+        rows.sort(key=lambda row: (row.title, row.id))
+        yield rows
+
+    async def bulk_create_books(
+        self,
+        session: MemorySession,
+        titles: list[str],
+        published_years: list[int],
+        author_names: list[str],
+        genres: list[list[str]],
+        book_ids: list[UUID] | None = None,
+    ) -> list[BookResponse]:
+        if book_ids is None:
+            book_ids = [uuid.uuid4() for _ in titles]
+        author_ids = await self._author_repo.resolve_author_ids(session, author_names)
+        created = []
+        for book_id, title, year, name, book_genres in zip(book_ids, titles, published_years, author_names, genres):
+            book = {
+                "id": book_id,
+                "title": title,
+                "published_year": year,
+                "author_id": author_ids[name],
+                "genres": [getattr(g, "value", g) for g in book_genres],
+            }
+            self._store.books[book_id] = book
+            created.append(_book_response(book))
+        if created:
+            self._store.bump()
+        return created
+
+    async def search_books(self, session: MemorySession, query: str, limit: int) -> list[BookSearchHit]:
+        await session.roundtrip()
+        query = query.lower()
+        hits = [
+            BookSearchHit(**_book_response(book).model_dump(), score=1.0)
+            for book in self._store.books.values()
+            if query in book["title"].lower()
+        ]
+        return hits[:limit]
+
+
+class MemoryCatalogRepository(CatalogRepository):
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    async def get_version(self, session: MemorySession) -> int:
+        await session.roundtrip()
+        return self._store.version
+
+    def on_commit(self, session: MemorySession, callback: Callable[[int, int], None]) -> None:
+        # The store bumps as it writes, so the write's versions are the ones around it.
+        before = self._store.version
+        db_session.after_commit(session, lambda: callback(before, self._store.version))
+
+    async def get_stats(self, session: MemorySession, top_authors: int) -> CatalogStats:
+        # Counted on each call rather than maintained: the load test only needs the endpoint to answer.
+        await session.roundtrip()
+        genres: Counter = Counter()
+        decades: Counter = Counter()
+        authors: Counter = Counter()
+        for book in self._store.books.values():
+            genres.update(set(book["genres"]))
+            decades[book["published_year"] // 10 * 10] += 1
+            authors[book["author_id"]] += 1
+        return CatalogStats(
+            total_books=len(self._store.books),
+            genres=[GenreFacet(genre=genre, count=count) for genre, count in genres.most_common()],
+            decades=[DecadeFacet(decade=decade, count=count) for decade, count in sorted(decades.items())],
+            top_authors=[
+                AuthorCount(author_id=author_id, name=self._store.authors[author_id], count=count)
+                for author_id, count in authors.most_common(top_authors)
+            ],
+        )
+
+    async def recompute_stats(self, session: MemorySession) -> None:
+        await session.roundtrip()
+
+
+class MemoryUserRepository(UserRepository):
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    def _response(self, user: dict) -> UserResponse:
+        return UserResponse(id=user["id"], username=user["username"], is_active=user["is_active"])
+
+    async def create_user(self, session: MemorySession, user: UserCreate) -> UserResponse:
+        password_hash = await hash_password_async(user.password)
+        await session.roundtrip()
+        if user.username in self._store.user_ids:
+            raise ValueError("username already exists")
+        user_id = str(uuid.uuid4())
+        self._store.users[user_id] = {
+            "id": user_id, "username": user.username, "password_hash": password_hash, "is_active": True,
+        }
+        self._store.user_ids[user.username] = user_id
+        return self._response(self._store.users[user_id])
+
+    async def get_by_username(self, session: MemorySession, username: str) -> dict | None:
+        await session.roundtrip()
+        user_id = self._store.user_ids.get(username)
+        return dict(self._store.users[user_id]) if user_id is not None else None
+
+    async def get_by_id(self, session: MemorySession, user_id: str) -> UserResponse | None:
+        await session.roundtrip()
+        user = self._store.users.get(user_id)
+        return self._response(user) if user is not None else None
+
+    async def add_refresh_token(self, session: MemorySession, user_id: str, token: str, expires_at: datetime):
+        await session.roundtrip()
+        self._store.refresh_tokens[token] = {"user_id": user_id, "token": token, "expires_at": expires_at}
+
+    async def revoke_refresh_token(self, session: MemorySession, token: str):
+        await session.roundtrip()
+        self._store.refresh_tokens.pop(token, None)
+
+    async def get_refresh_token(self, session: MemorySession, token: str):
+        await session.roundtrip()
+        return self._store.refresh_tokens.get(token)
+
+    async def set_active(self, session: MemorySession, user_id: str, is_active: bool) -> UserResponse | None:
+        await session.roundtrip()
+        user = self._store.users.get(user_id)
+        if user is None:
+            return None
+        user["is_active"] = is_active
+        return self._response(user)
+
+    async def update_password_hash(self, session: MemorySession, user_id: str, password_hash: str):
+        await session.roundtrip()
+        self._store.users[user_id]["password_hash"] = password_hash
+
+
+def install(app: FastAPI, pool: MemoryPool, latency: float) -> MemoryStore:
+    """
+    Point get_db() at MemorySessions and swap the app's lifespan for one that registers the
+    in-memory repositories. Call before entering the app's lifespan.
+    """
+    store = MemoryStore()
+    db_session.AsyncSessionLocal = lambda: MemorySession(pool, latency)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        author_repo = CachedAuthorRepository(MemoryAuthorRepository(store))
+        Registry.register(AuthorRepository, author_repo)
+        Registry.register(CatalogRepository, MemoryCatalogRepository(store))
+        book_repo = CachedBookRepository(MemoryBookRepository(store, author_repo))
+        if settings.COLUMNAR_CATALOG:
+            book_repo = ColumnarBookRepository(book_repo, Registry.get(CatalogRepository))
+        Registry.register(BookRepository, book_repo)
+        Registry.register(BookService, BookServiceImpl(Registry.get(BookRepository), author_repo))
+        Registry.register(BookListCache, BookListCacheImpl(Registry.get(BookService), Registry.get(CatalogRepository)))
+        Registry.register(UserRepository, CachedUserRepository(MemoryUserRepository(store)))
+        Registry.register(AuthService, AuthServiceImpl(Registry.get(UserRepository)))
+        yield
+
+    app.router.lifespan_context = lifespan
+    return store
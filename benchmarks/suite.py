@@ -0,0 +1,269 @@
+"""
+CPU microbenchmarks for the request hot paths. No database or network is needed.
+
+    python -m benchmarks.suite                                   # print results
+    python -m benchmarks.suite --output bench.json               # save them
+    python -m benchmarks.suite --baseline bench.json             # compare, exit 1 on regression
+    python -m benchmarks.suite --filter list_ --threshold 0.15
+
+Each case is timed in batches sized to take about --min-time seconds; the best of --repeat
+batches is reported as nanoseconds per operation.
+"""
+import argparse
+import asyncio
+import io
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.core.metrics import Counter, Histogram, render
+from app.core.pagination import encode_cursor
+from app.core.security import create_access_token, decode_token
+from app.middlewares.metrics import MetricsMiddleware
+from app.reposytory.book_repository import BookRows, build_book_list_query
+from app.schemas.book import BookResponse
+from app.schemas.enums import GenreEnum
+from app.services.book_import import CSV_DTYPES, validate_books_frame
+from app.services.book_render import render_book_page
+from benchmarks.list_serialization import make_rows, via_models
+
+GENRES = [g.value for g in GenreEnum]
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    """
+    Register a benchmark. The decorated function does the setup and returns the callable to time.
+    """
+    def register(setup: Callable[[], Callable[[], object]]):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("book_response.construct")
+def bench_book_response_construct():
+    row = make_rows(1)[0]
+    return lambda: BookResponse(
+        id=row.id, title=row.title, published_year=row.published_year, author_id=row.author_id, genres=row.genres
+    )
+
+
+@case("book_response.model_validate")
+def bench_book_response_validate():
+    row = make_rows(1)[0]
+    data = {
+        "id": str(row.id),
+        "title": row.title,
+        "published_year": row.published_year,
+        "author_id": str(row.author_id),
+        "genres": row.genres,
+    }
+    return lambda: BookResponse.model_validate(data)
+
+
+def _list_cases(size: int) -> None:
+    @case(f"list_models.{size}")
+    def bench_models():
+        page = BookRows(make_rows(size), "next-cursor", None)
+        loop = asyncio.new_event_loop()
+        return lambda: loop.run_until_complete(via_models(page))
+
+    @case(f"list_fast.{size}")
+    def bench_fast():
+        page = BookRows(make_rows(size), "next-cursor", None)
+        return lambda: render_book_page(page)
+
+
+for _size in (10, 100, 1000):
+    _list_cases(_size)
+
+
+@case("list_query.build")
+def bench_list_query_build():
+    return lambda: build_book_list_query(
+        0, 100, "war", "tolstoy", ["Fiction", "History"], "any", 1850, 1900, "published_year", "desc", None
+    )
+
+
+@case("list_query.build_and_compile")
+def bench_list_query_compile():
+    dialect = asyncpg_dialect()
+    cursor = encode_cursor({"sort_by": "title", "sort_order": "asc", "value": "M", "id": str(uuid.uuid4())})
+
+    def run():
+        query_text, params, _, _ = build_book_list_query(
+            0, 100, "war", None, ["Fiction"], "all", None, None, "title", "asc", cursor
+        )
+        return text(query_text).compile(dialect=dialect)
+    return run
+
+
+@case("jwt.create_access_token")
+def bench_create_token():
+    user_id = str(uuid.uuid4())
+    return lambda: create_access_token(user_id, claims={"username": "reader"})
+
+
+@case("jwt.decode_token")
+def bench_decode_token():
+    token = create_access_token(str(uuid.uuid4()), claims={"username": "reader"})
+    return lambda: decode_token(token)
+
+
+@case("csv_import.parse_validate_10k")
+def bench_csv_import():
+    rng = random.Random(0)
+    buffer = io.StringIO()
+    buffer.write("title,published_year,author_name,genres\n")
+    for i in range(10_000):
+        genres = ",".join(rng.sample(GENRES, rng.randint(1, 3)))
+        year = rng.choice([rng.randint(1800, 2024), "n/a"]) if i % 50 == 0 else rng.randint(1800, 2024)
+        buffer.write(f'"Book {i}",{year},"Author {i % 500}","{genres}"\n')
+    data = buffer.getvalue()
+
+    def run():
+        df = pd.read_csv(io.StringIO(data), dtype=CSV_DTYPES)
+        return validate_books_frame(df)
+    return run
+
+
+@case("metrics.counter_inc")
+def bench_counter_inc():
+    counter = Counter("bench_requests_total", "Benchmark counter.", ("method", "route", "status"))
+    labels = ("GET", "/api/v1/books/", "200")
+    return lambda: counter.inc(labels)
+
+
+@case("metrics.histogram_observe")
+def bench_histogram_observe():
+    histogram = Histogram("bench_duration_seconds", "Benchmark histogram.", ("method", "route"))
+    labels = ("GET", "/api/v1/books/")
+    return lambda: histogram.observe(0.0123, labels)
+
+
+@case("metrics.render_40_routes")
+def bench_metrics_render():
+    # Roughly the series of a warmed-up process: every route with a few status codes.
+    histogram = Histogram("bench_render_seconds", "Benchmark histogram.", ("method", "route"))
+    counter = Counter("bench_render_total", "Benchmark counter.", ("method", "route", "status"))
+    for i in range(40):
+        for status in ("200", "304", "404"):
+            counter.inc(("GET", f"/api/v1/route{i}", status))
+        histogram.observe(0.01 * i, ("GET", f"/api/v1/route{i}"))
+    return render
+
+
+def _request_case(name: str, instrumented: bool) -> None:
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    @case(name)
+    def bench_request():
+        app = MetricsMiddleware(endpoint) if instrumented else endpoint
+        loop = asyncio.new_event_loop()
+
+        def run():
+            scope = {"type": "http", "method": "GET", "path": "/api/v1/books/"}
+            return loop.run_until_complete(app(scope, receive, send))
+        return run
+
+
+# The difference between these two is the per-request cost of MetricsMiddleware.
+_request_case("metrics.request_bare", instrumented=False)
+_request_case("metrics.request_instrumented", instrumented=True)
+
+
+def measure(func: Callable[[], object], min_time: float, repeat: int) -> tuple[float, int]:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed < min_time / 10 else max(2, int(min_time / max(elapsed, 1e-9)) + 1)
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9, number
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'case':<34}{'baseline ns':>14}{'current ns':>14}{'change':>10}")
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<34}{'-':>14}{result['ns_per_op']:>14.0f}{'new':>10}")
+            continue
+        change = result["ns_per_op"] / base["ns_per_op"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<34}{base['ns_per_op']:>14.0f}{result['ns_per_op']:>14.0f}{change:>+10.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as regression")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per case")
+    args = parser.parse_args()
+
+    results = {}
+    for name, setup in CASES.items():
+        if args.filter not in name:
+            continue
+        ns_per_op, number = measure(setup(), args.min_time, args.repeat)
+        results[name] = {"ns_per_op": ns_per_op, "ops_per_sec": 1e9 / ns_per_op, "loops": number}
+        print(f"{name:<34}{ns_per_op / 1000:>12.2f} us/op")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "min_time": args.min_time,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
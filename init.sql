@@ -1,10 +1,19 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE authors (
     id UUID PRIMARY KEY,
-    name VARCHAR NOT NULL
+    name VARCHAR NOT NULL,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', name)) STORED
 );
 
 CREATE INDEX ix_authors_id ON authors (id);
 CREATE UNIQUE INDEX ix_authors_name ON authors (name);
+-- The book list sorts names in code point order (see SORT_COLUMNS in book_repository.py).
+CREATE INDEX ix_authors_name_c ON authors (name COLLATE "C");
+CREATE INDEX ix_authors_search_vector ON authors USING GIN (search_vector);
+CREATE INDEX ix_authors_name_trgm ON authors USING GIN (name gin_trgm_ops);
+-- Name-prefix filter of the author list (byte-wise ~>=~ / ~<~ range).
+CREATE INDEX ix_authors_name_pattern ON authors (name text_pattern_ops);
 
 CREATE TABLE users (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -37,10 +46,20 @@ CREATE TABLE books (
     title VARCHAR NOT NULL,
     published_year INT NOT NULL,
     author_id UUID REFERENCES authors (id),
-    genres genreenum[] NOT NULL
+    genres genreenum[] NOT NULL,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', title)) STORED
 );
 
 CREATE INDEX ix_books_id ON books (id);
+-- Keyset pagination: one index per sort_by, with id as the tie-breaker. Titles sort in code point
+-- order (COLLATE "C"), the same as the in-process columnar catalog.
+CREATE INDEX ix_books_title_id ON books (title COLLATE "C", id);
+CREATE INDEX ix_books_published_year_id ON books (published_year, id);
+CREATE INDEX ix_books_author_id_id ON books (author_id, id);
+-- Full-text search, plus trigram indexes that also serve the ILIKE '%...%' list filters.
+CREATE INDEX ix_books_search_vector ON books USING GIN (search_vector);
+CREATE INDEX ix_books_title_trgm ON books USING GIN (title gin_trgm_ops);
+CREATE INDEX ix_books_genres ON books USING GIN (genres);
 
 CREATE TABLE refresh_tokens (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -51,3 +70,176 @@ CREATE TABLE refresh_tokens (
 
 CREATE UNIQUE INDEX ix_refresh_tokens_token ON refresh_tokens (token);
 CREATE INDEX ix_refresh_tokens_user_id ON refresh_tokens (user_id);
+
+CREATE TABLE import_jobs (
+    id UUID PRIMARY KEY,
+    filename VARCHAR NOT NULL,
+    file_path VARCHAR NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    rows_processed INT NOT NULL DEFAULT 0,
+    imported_count INT NOT NULL DEFAULT 0,
+    failed_count INT NOT NULL DEFAULT 0,
+    failed_rows JSONB NOT NULL DEFAULT '[]',
+    error VARCHAR,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    heartbeat_at TIMESTAMP
+);
+
+CREATE INDEX ix_import_jobs_status_created_at ON import_jobs (status, created_at);
+
+-- Single-row counter behind the ETags of catalog reads, bumped once by every transaction that
+-- writes books or authors. Its row lock is the one point where catalog writers serialize, so it
+-- is only taken at commit: the deferred triggers below (or the application, just before it
+-- commits; see CatalogRepositoryImpl.on_commit) call apply_catalog_changes(), which bumps the
+-- version and folds in the transaction's catalog_stats deltas. Until then a writer holds no lock
+-- another writer needs, and at commit it waits on nothing but this row, so writers cannot deadlock
+-- through it however many rows they write.
+CREATE TABLE catalog_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL
+);
+
+INSERT INTO catalog_version (id, version) VALUES (TRUE, 1);
+
+-- Book counts per genre, decade and author plus the total. The statement-level triggers below
+-- only record deltas in a per-session temporary table; apply_catalog_changes() adds them up and
+-- applies them under the catalog_version lock at commit, so the counters stay in step with the
+-- committed books without writers contending for the hot rows (total, popular genres) meanwhile.
+CREATE TABLE catalog_stats (
+    dimension VARCHAR(8) NOT NULL,  -- total, genre, decade or author
+    key VARCHAR NOT NULL,           -- '' for total
+    book_count BIGINT NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+
+CREATE INDEX ix_catalog_stats_dimension_book_count ON catalog_stats (dimension, book_count DESC, key);
+
+INSERT INTO catalog_stats (dimension, key, book_count) VALUES ('total', '', 0);
+
+-- The counters one book contributes to; decades match the list facets (published_year / 10 * 10).
+CREATE OR REPLACE FUNCTION book_stats_keys(published_year INT, author_id UUID, genres genreenum[])
+RETURNS TABLE (dimension text, key text) AS $$
+    SELECT 'total', ''
+    UNION ALL SELECT 'decade', CAST(published_year / 10 * 10 AS text)
+    UNION ALL SELECT 'author', CAST(author_id AS text) WHERE author_id IS NOT NULL
+    UNION ALL SELECT DISTINCT 'genre', CAST(g AS text) FROM unnest(genres) AS g
+$$ LANGUAGE sql STABLE;
+
+-- Bumps the version and applies the transaction's pending counter deltas, in key order; returns
+-- the new version. Runs at most once per transaction (the flag is transaction-local).
+CREATE OR REPLACE FUNCTION apply_catalog_changes() RETURNS BIGINT AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE catalog_version SET version = version + 1 RETURNING version INTO new_version;
+    IF to_regclass('pg_temp.catalog_stats_delta') IS NOT NULL THEN
+        INSERT INTO catalog_stats (dimension, key, book_count)
+        SELECT dimension, key, sum(delta)
+        FROM pg_temp.catalog_stats_delta
+        GROUP BY dimension, key
+        HAVING sum(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key) DO UPDATE SET book_count = catalog_stats.book_count + EXCLUDED.book_count;
+        DELETE FROM pg_temp.catalog_stats_delta;
+    END IF;
+    PERFORM set_config('catalog.changes_applied', 'on', true);
+    RETURN new_version;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_catalog_changes_at_commit() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('catalog.changes_applied', true) IS DISTINCT FROM 'on' THEN
+        PERFORM apply_catalog_changes();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Constraint triggers are row-level only; all but the first call of a transaction return at the flag check.
+CREATE CONSTRAINT TRIGGER trg_books_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE ON books
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION apply_catalog_changes_at_commit();
+
+CREATE CONSTRAINT TRIGGER trg_authors_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE ON authors
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION apply_catalog_changes_at_commit();
+
+-- TRUNCATE already locks the whole table, so it bumps the version straight away.
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE catalog_version SET version = version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_books_catalog_version_truncate
+    AFTER TRUNCATE ON books
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+
+CREATE TRIGGER trg_authors_catalog_version_truncate
+    AFTER TRUNCATE ON authors
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+
+-- Each trigger only has the transition tables of its own event, so each event gets its own query.
+CREATE OR REPLACE FUNCTION update_catalog_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM catalog_stats;
+        INSERT INTO catalog_stats (dimension, key, book_count) VALUES ('total', '', 0);
+        IF to_regclass('pg_temp.catalog_stats_delta') IS NOT NULL THEN
+            DELETE FROM pg_temp.catalog_stats_delta;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF to_regclass('pg_temp.catalog_stats_delta') IS NULL THEN
+        CREATE TEMPORARY TABLE catalog_stats_delta (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            delta BIGINT NOT NULL
+        ) ON COMMIT DELETE ROWS;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO pg_temp.catalog_stats_delta (dimension, key, delta)
+        SELECT k.dimension, k.key, count(*)
+        FROM new_rows AS b, book_stats_keys(b.published_year, b.author_id, b.genres) AS k
+        GROUP BY k.dimension, k.key;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO pg_temp.catalog_stats_delta (dimension, key, delta)
+        SELECT k.dimension, k.key, -count(*)
+        FROM old_rows AS b, book_stats_keys(b.published_year, b.author_id, b.genres) AS k
+        GROUP BY k.dimension, k.key;
+    ELSE
+        INSERT INTO pg_temp.catalog_stats_delta (dimension, key, delta)
+        SELECT k.dimension, k.key, 1
+        FROM new_rows AS b, book_stats_keys(b.published_year, b.author_id, b.genres) AS k
+        UNION ALL
+        SELECT k.dimension, k.key, -1
+        FROM old_rows AS b, book_stats_keys(b.published_year, b.author_id, b.genres) AS k;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_books_stats_insert
+    AFTER INSERT ON books REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_catalog_stats();
+
+CREATE TRIGGER trg_books_stats_update
+    AFTER UPDATE ON books REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_catalog_stats();
+
+CREATE TRIGGER trg_books_stats_delete
+    AFTER DELETE ON books REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_catalog_stats();
+
+CREATE TRIGGER trg_books_stats_truncate
+    AFTER TRUNCATE ON books
+    FOR EACH STATEMENT EXECUTE FUNCTION update_catalog_stats();
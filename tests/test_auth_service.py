@@ -0,0 +1,39 @@
+import asyncio
+from datetime import timedelta
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.schemas.auth import UserResponse
+from app.services.auth_service import AuthServiceImpl
+
+
+class _UserRepository:
+    """
+    Only what authenticate and deactivate touch; every user is stored as inactive.
+    """
+
+    async def get_by_id(self, session, user_id):
+        return UserResponse(id=user_id, username=f"user-{user_id}", is_active=False)
+
+    async def set_active(self, session, user_id, is_active):
+        return UserResponse(id=user_id, username=f"user-{user_id}", is_active=is_active)
+
+
+def test_deactivated_users_stay_untrusted_past_the_user_cache_size(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    monkeypatch.setattr(settings, "USER_CACHE_SIZE", 2)
+
+    async def main():
+        service = AuthServiceImpl(_UserRepository())
+        user_ids = [str(i) for i in range(5)]
+        tokens = {
+            user_id: create_access_token(user_id, timedelta(minutes=5), claims={"username": f"user-{user_id}"})
+            for user_id in user_ids
+        }
+        for user_id in user_ids:
+            await service.deactivate(None, user_id)
+        for user_id in user_ids:
+            user = await service.authenticate(None, tokens[user_id])
+            assert not user.is_active
+
+    asyncio.run(main())
@@ -0,0 +1,11 @@
+from app.services.book_list_cache import book_list_key
+
+
+def _key(sort_by: str, sort_order: str):
+    return book_list_key(0, 20, None, None, None, None, None, sort_by, sort_order, None, "any", False)
+
+
+def test_sort_parameters_are_normalized():
+    assert _key("title", "asc") == _key("no_such_column", "ASC") == _key("title", "sideways")
+    assert _key("author", "DESC") == _key("author", "desc")
+    assert _key("author", "desc") != _key("title", "desc")
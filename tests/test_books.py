@@ -0,0 +1,27 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_catalog_version, get_current_user, get_session
+from app.main import app
+
+
+async def _no_session():
+    yield None
+
+
+@pytest.fixture
+def client():
+    # Parameter validation fails before any endpoint code runs, so no database is needed.
+    app.dependency_overrides[get_session] = _no_session
+    app.dependency_overrides[get_catalog_version] = lambda: 1
+    app.dependency_overrides[get_current_user] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", ["/api/v1/books/", "/api/v1/books/export"])
+def test_invalid_genre_match_is_rejected(client, path):
+    response = client.get(path, params={"genre": "Fiction", "genre_match": "xx"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "genre_match"]
@@ -0,0 +1,32 @@
+import asyncio
+import threading
+
+from app.core.password_executor import PasswordExecutor
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_hash_finishes():
+    async def main():
+        executor = PasswordExecutor(workers=1, max_pending=1)
+        started, release = threading.Event(), threading.Event()
+
+        def job():
+            started.set()
+            release.wait(5)
+
+        task = asyncio.create_task(executor.run(job))
+        try:
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert executor.pending == 1
+        finally:
+            release.set()
+
+        for _ in range(100):
+            if executor.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.pending == 0
+        assert executor.completed == 1
+
+    asyncio.run(main())